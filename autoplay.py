@@ -0,0 +1,179 @@
+import random
+
+from simulation import (
+    BALL_LIMIT_X,
+    BALL_LIMIT_Y,
+    MOVE_LEFT,
+    MOVE_NONE,
+    MOVE_RIGHT,
+    PADDLE_LIMIT_X,
+    PADDLE_REACH_X,
+    PADDLE_REACH_Y,
+    Simulation,
+)
+
+
+def fold(x, limit):
+    """
+    Folds a coordinate of unbounded movement back between two walls at -limit and limit.
+
+    A ball bouncing between the walls is at the same place as a ball moving in a
+    straight line through mirror images of the field, so reflecting its straight-line
+    position back into the field gives its real position after any number of bounces.
+
+    Parameters:
+        x (float): The coordinate if there were no walls.
+        limit (float): The distance from the center to each wall.
+
+    Returns:
+        float: The coordinate between the walls.
+    """
+    period = 4 * limit
+    offset = (x + limit) % period
+    if offset > 2 * limit:
+        offset = period - offset
+    return offset - limit
+
+
+def predict_landing(x, y, dx, dy, target_y):
+    """
+    Predicts where the ball will next come down to `target_y`.
+
+    The prediction is worked out in one go rather than by stepping the ball: the
+    vertical distance left to travel, including the bounce off the top wall if the
+    ball is going up, gives the number of ticks until it gets there, and the side
+    wall bounces are accounted for by `fold()`. Bricks in the way are not, so the
+    prediction is meant to be made again every tick.
+
+    Parameters:
+        x (float): The x-coordinate of the ball.
+        y (float): The y-coordinate of the ball.
+        dx (float): The horizontal movement of the ball per tick.
+        dy (float): The vertical movement of the ball per tick.
+        target_y (float): The height to predict the crossing of.
+
+    Returns:
+        float: The x-coordinate where the ball will be at `target_y`, or its current
+            x-coordinate if it is already below it or not moving vertically.
+    """
+    if dy < 0:
+        if y <= target_y:
+            return x
+        distance = y - target_y
+    elif dy > 0:
+        top = BALL_LIMIT_Y if y < BALL_LIMIT_Y else y
+        distance = 2 * top - y - target_y
+    else:
+        return x
+    return fold(x + dx * distance / abs(dy), BALL_LIMIT_X)
+
+
+class AutoplayAgent:
+    """
+    Plays the game: steers the paddle to where the ball is predicted to come down.
+
+    The agent gives the paddle input for every tick, the same way the keyboard does,
+    so a game it plays can be recorded and replayed like any other.
+
+    Attributes:
+        simulation (Simulation): The simulation whose paddle is steered.
+        aim (float): Where to catch the ball, relative to the paddle's center.
+        jitter (float): How far the aim may be moved at random after every catch.
+        rng (random.Random): The source of the aim's jitter.
+        target (float): The x-coordinate the paddle was last steered toward.
+        predictions (int): The number of predictions made.
+        rising (bool): Whether the ball was moving up on the last tick.
+
+    Methods:
+        predict(): Predicts where the ball will reach the paddle.
+        act(): Returns the paddle input for the next tick.
+    """
+
+    def __init__(self, simulation, aim=0.0, jitter=0.0, seed=None):
+        """
+        Initializes an AutoplayAgent.
+
+        Parameters:
+            simulation (Simulation): The simulation whose paddle is steered.
+            aim (float): Where to catch the ball, relative to the paddle's center.
+                Catching it off center changes the angle it bounces back at.
+            jitter (float): How far the aim may be moved at random after every catch,
+                so that the ball doesn't settle into the same path.
+            seed (int, optional): The seed of the jitter.
+        """
+        self.simulation = simulation
+        self.aim = aim
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.target = 0.0
+        self.predictions = 0
+        self.rising = False
+
+    def predict(self):
+        """
+        Predicts where the ball will reach the top of the paddle, see `predict_landing()`.
+
+        Returns:
+            float: The x-coordinate of the predicted landing point.
+        """
+        ball = self.simulation.ball
+        self.predictions += 1
+        return predict_landing(ball.x, ball.y, ball.dx, ball.dy, self.simulation.paddle.y + PADDLE_REACH_Y)
+
+    def act(self):
+        """
+        Returns the paddle input for the next tick.
+
+        The paddle is steered toward the predicted landing point, offset by the aim,
+        and stops once a further tick of steering would take it past that point.
+
+        Returns:
+            int: MOVE_LEFT, MOVE_RIGHT or MOVE_NONE.
+        """
+        ball = self.simulation.ball
+        paddle = self.simulation.paddle
+        rising = ball.dy > 0
+        if rising and not self.rising and self.jitter:
+            self.aim = self.rng.uniform(-self.jitter, self.jitter)
+        self.rising = rising
+
+        target = self.predict() - self.aim
+        if target < -PADDLE_LIMIT_X:
+            target = -PADDLE_LIMIT_X
+        elif target > PADDLE_LIMIT_X:
+            target = PADDLE_LIMIT_X
+        self.target = target
+
+        difference = target - paddle.x
+        step = min(abs(paddle.vx) + paddle.acceleration, paddle.speed)
+        if abs(difference) <= step / 2:
+            return MOVE_NONE
+        return MOVE_RIGHT if difference > 0 else MOVE_LEFT
+
+
+# Let the agent play a headless game and report how it did and how fast it predicts
+if __name__ == "__main__":
+    import time
+
+    simulation = Simulation(seed=0)
+    agent = AutoplayAgent(simulation, jitter=PADDLE_REACH_X / 2, seed=0)
+    frames = 100000
+    lives_lost = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        if simulation.game_over:
+            break
+        events = simulation.step(agent.act())
+        lives_lost += sum(name == "ball_lost" for name, _ in events)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{simulation.frame} frames in {elapsed:.2f}s, level {simulation.level}, "
+        f"score {simulation.score}, lives lost {lives_lost}"
+    )
+
+    ball = simulation.ball
+    count = 200000
+    start = time.perf_counter()
+    for _ in range(count):
+        predict_landing(ball.x, ball.y, ball.dx, ball.dy, -260.0)
+    print(f"{count / (time.perf_counter() - start):.0f} predictions/s")
@@ -1,19 +1,21 @@
 import turtle
 
-BALL_SPEED = 2.0
+from simulation import BallBody
 
 
 class Ball:
     """
     A class representing a ball in a breakout game.
 
+    The ball's position and velocity live on a `simulation.BallBody`; the turtle
+    only mirrors the body for display.
+
     Attributes:
+        body (BallBody): The physics state of the ball.
         ball (turtle.Turtle): The turtle object representing the ball.
-        dx (int): The horizontal movement speed of the ball.
-        dy (int): The vertical movement speed of the ball.
 
     Methods:
-        __init__(): Initializes the Ball object.
+        __init__(body=None): Initializes the Ball object.
         move(): Moves the ball based on its current speed.
         invert_dx(): Inverts the horizontal movement direction of the ball.
         invert_dy(): Inverts the vertical movement direction of the ball.
@@ -22,28 +24,25 @@ class Ball:
         reset(): Resets the ball to its initial position and speed.
         increase_speed(speed): Increases the speed of the ball by the given amount.
         adjust_dx(difference): Adjusts the horizontal movement speed of the ball based on the paddle collision.
+        sync(): Moves the turtle to the body's position.
     """
 
-    def __init__(self):
+    def __init__(self, body=None):
         """
         Initializes a new instance of the Ball class.
 
         The Ball class represents the game ball in the Breakout game.
 
-        Attributes:
-        - ball: A turtle object representing the ball.
-        - dx: The horizontal movement speed of the ball.
-        - dy: The vertical movement speed of the ball.
+        Parameters:
+        - body (BallBody, optional): The physics state to display. A new one is created if omitted.
         """
+        self.body = body if body is not None else BallBody()
         self.ball = turtle.Turtle()
         self.ball.speed(0)
         self.ball.shape("square")
         self.ball.color("white")
         self.ball.penup()
-        self.ball.goto(0, 0)
-        # Ball movement speed
-        self.ball.dx = BALL_SPEED
-        self.ball.dy = -BALL_SPEED
+        self.sync()
 
     def move(self):
         """
@@ -56,33 +55,20 @@ class Ball:
         Returns:
             None
         """
-        self.ball.setx(self.ball.xcor() + self.ball.dx)
-        self.ball.sety(self.ball.ycor() + self.ball.dy)
-
-        # Border checking
-        if self.ball.ycor() > 290:
-            self.ball.sety(290)
-            self.ball.dy *= -1
-
-        if self.ball.xcor() > 390:
-            self.ball.setx(390)
-            self.ball.dx *= -1
-
-        if self.ball.xcor() < -390:
-            self.ball.setx(-390)
-            self.ball.dx *= -1
+        self.body.move()
+        self.sync()
 
     def invert_dx(self):
         """
         Inverts the horizontal velocity of the ball.
         """
-        self.ball.dx *= -1
+        self.body.invert_dx()
 
     def invert_dy(self):
         """
         Inverts the dy (vertical) velocity of the ball.
         """
-        self.ball.dy *= -1
+        self.body.invert_dy()
 
     def get_x(self):
         """
@@ -91,7 +77,7 @@ class Ball:
         Returns:
             float: The x-coordinate of the ball's current position.
         """
-        return self.ball.xcor()
+        return self.body.x
 
     def get_y(self):
         """
@@ -100,18 +86,17 @@ class Ball:
         Returns:
             float: The y-coordinate of the ball.
         """
-        return self.ball.ycor()
+        return self.body.y
 
     def reset(self):
         """
         Resets the ball's position and velocity.
 
         This method moves the ball to the center of the screen and sets its
-        horizontal velocity to `BALL_SPEED` and vertical velocity to `-BALL_SPEED`.
+        horizontal velocity to the body's speed and vertical velocity to minus that speed.
         """
-        self.ball.goto(0, 0)
-        self.ball.dx = BALL_SPEED
-        self.ball.dy = -BALL_SPEED
+        self.body.reset()
+        self.sync()
 
     def increase_speed(self, speed):
         """
@@ -121,15 +106,7 @@ class Ball:
             speed (float): The amount by which to increase the speed.
 
         """
-        if self.ball.dx > 0:
-            self.ball.dx += speed
-        else:
-            self.ball.dx -= speed
-
-        if self.ball.dy > 0:
-            self.ball.dy += speed
-        else:
-            self.ball.dy -= speed
+        self.body.increase_speed(speed)
 
     def adjust_dx(self, difference):
         """
@@ -141,13 +118,10 @@ class Ball:
         Returns:
             None
         """
-        # 'difference' can be positive or negative based on where the ball hits the paddle
-        # This adjustment factor controls how much the ball's direction changes
-        adjustment_factor = 0.1
-        self.ball.dx += difference * adjustment_factor
-        # Limit the dx to prevent the ball from moving too horizontally
-        max_dx = BALL_SPEED * 2
-        if self.ball.dx > max_dx:
-            self.ball.dx = max_dx
-        elif self.ball.dx < -max_dx:
-            self.ball.dx = -max_dx
+        self.body.adjust_dx(difference)
+
+    def sync(self):
+        """
+        Moves the turtle to the position of the ball's body.
+        """
+        self.ball.goto(self.body.x, self.body.y)
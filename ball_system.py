@@ -0,0 +1,260 @@
+import numpy as np
+
+from brick_grid import BRICK_LEFT, BRICK_TOP, BRICK_SPACING_X, BRICK_SPACING_Y
+from simulation import (
+    BALL_SPEED,
+    BALL_LIMIT_X,
+    BALL_LIMIT_Y,
+    BALL_LOST_Y,
+    BRICK_REACH_X,
+    BRICK_REACH_Y,
+    PADDLE_REACH_X,
+    PADDLE_REACH_Y,
+)
+
+# Candidate cells around a ball, relative to the cell at or above-left of its center.
+# With the brick reach and spacing, a ball can only touch bricks in these four cells.
+CELL_OFFSETS = ((0, 0), (0, 1), (1, 0), (1, 1))
+
+
+def find_brick_hits(x, y, wall, active=None):
+    """
+    Finds the bricks that balls overlap, with the rules of `Simulation.check_brick_collision`.
+
+    Only the four cells in CELL_OFFSETS around each ball are tested. A hit is vertical,
+    inverting the ball's dy, if the ball's center is within 25 units of the brick's
+    center horizontally, and horizontal, inverting its dx, otherwise.
+
+    Parameters:
+    - x (numpy.ndarray): The x-coordinates of the balls.
+    - y (numpy.ndarray): The y-coordinates of the balls.
+    - wall (numpy.ndarray): The alive flags of the bricks: a rows x columns grid shared
+      by every ball, or a balls x rows x columns stack with one grid per ball.
+    - active (numpy.ndarray, optional): Which balls are in play. All of them if omitted.
+
+    Returns:
+        tuple: (hits, flip_x, flip_y). `hits` lists, for every candidate cell with a hit,
+        the (hit, row_index, column_index) arrays: which balls hit a brick there and the
+        cell they tested. `flip_x` and `flip_y` tell which balls must have their dx and dy
+        inverted: every hit inverts the ball once, so only the parity of the hits matters.
+    """
+    rows, columns = wall.shape[-2:]
+    per_ball = wall.ndim == 3
+    balls = np.arange(len(x)) if per_ball else None
+    first_column = np.floor((x - BRICK_LEFT) / BRICK_SPACING_X).astype(np.int64)
+    first_row = np.floor((BRICK_TOP - y) / BRICK_SPACING_Y).astype(np.int64)
+    flips_x = np.zeros(len(x), dtype=np.int64)
+    flips_y = np.zeros(len(x), dtype=np.int64)
+    hits = []
+    for row_offset, column_offset in CELL_OFFSETS:
+        row = first_row + row_offset
+        column = first_column + column_offset
+        inside = (row >= 0) & (row < rows) & (column >= 0) & (column < columns)
+        if active is not None:
+            inside &= active
+        row_index = np.where(inside, row, 0)
+        column_index = np.where(inside, column, 0)
+        offset_x = np.abs(x - (BRICK_LEFT + column * BRICK_SPACING_X))
+        offset_y = np.abs(y - (BRICK_TOP - row * BRICK_SPACING_Y))
+        alive = wall[balls, row_index, column_index] if per_ball else wall[row_index, column_index]
+        hit = inside & alive & (offset_y < BRICK_REACH_Y) & (offset_x < BRICK_REACH_X)
+        if hit.any():
+            vertical = offset_x < 25
+            flips_y += hit & vertical
+            flips_x += hit & ~vertical
+            hits.append((hit, row_index, column_index))
+    return hits, flips_x % 2 == 1, flips_y % 2 == 1
+
+
+class BallSystem:
+    """
+    Many balls stored in NumPy arrays and moved together in one vectorized pass per frame.
+
+    The balls follow the same rules as `BallBody.move` and the overlap tests of
+    `Simulation.check_paddle_collision` and `Simulation.check_brick_collision`,
+    against the paddle and bricks of a Simulation.
+
+    Simultaneous hits are resolved deterministically: a ball that overlaps several
+    bricks bounces once per brick, exactly as a single ball does, and a brick hit by
+    several balls bounces all of them but is destroyed and scored once. Bricks are
+    destroyed in wall order (row by row, left to right).
+
+    Attributes:
+        x (numpy.ndarray): The x-coordinates of the balls.
+        y (numpy.ndarray): The y-coordinates of the balls.
+        dx (numpy.ndarray): The horizontal speeds of the balls.
+        dy (numpy.ndarray): The vertical speeds of the balls.
+        active (numpy.ndarray): Whether each slot holds a ball in play.
+        wall (numpy.ndarray): A rows x columns mask of the bricks in the simulation's grid.
+        wall_version (int): The grid version the mask was built from.
+
+    Methods:
+        spawn(x, y, dx, dy): Adds a ball and returns its slot.
+        remove(index): Takes a ball out of play.
+        count(): Returns the number of balls in play.
+        load_wall(bricks): Rebuilds the brick mask from a BrickGrid.
+        step(simulation): Moves every ball by one frame and resolves its collisions.
+    """
+
+    def __init__(self, capacity=64):
+        """
+        Initializes an empty BallSystem.
+
+        Parameters:
+        - capacity (int): The number of ball slots to preallocate. The arrays grow when they are full.
+        """
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.dx = np.zeros(capacity)
+        self.dy = np.zeros(capacity)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.wall = np.zeros((0, 0), dtype=bool)
+        self.wall_version = None
+
+    def spawn(self, x=0.0, y=0.0, dx=BALL_SPEED, dy=-BALL_SPEED):
+        """
+        Adds a ball in the first free slot, growing the arrays if needed.
+
+        Parameters:
+        - x (float): The x-coordinate of the ball.
+        - y (float): The y-coordinate of the ball.
+        - dx (float): The horizontal speed of the ball.
+        - dy (float): The vertical speed of the ball.
+
+        Returns:
+            int: The slot of the new ball.
+        """
+        free = np.flatnonzero(~self.active)
+        if len(free) == 0:
+            index = len(self.active)
+            capacity = max(2 * index, 1)
+            for name in ("x", "y", "dx", "dy", "active"):
+                array = getattr(self, name)
+                grown = np.zeros(capacity, dtype=array.dtype)
+                grown[:index] = array
+                setattr(self, name, grown)
+        else:
+            index = int(free[0])
+        self.x[index] = x
+        self.y[index] = y
+        self.dx[index] = dx
+        self.dy[index] = dy
+        self.active[index] = True
+        return index
+
+    def remove(self, index):
+        """
+        Takes a ball out of play and frees its slot.
+
+        Parameters:
+        - index (int): The slot of the ball.
+        """
+        self.active[index] = False
+
+    def count(self):
+        """
+        Returns the number of balls in play.
+        """
+        return int(np.count_nonzero(self.active))
+
+    def load_wall(self, bricks):
+        """
+        Rebuilds the brick mask from a BrickGrid's alive flags.
+
+        Parameters:
+        - bricks (BrickGrid): The grid to copy.
+        """
+        self.wall = np.frombuffer(bricks.alive, dtype=np.uint8).astype(bool).reshape(bricks.rows, bricks.columns)
+        self.wall_version = bricks.version
+
+    def step(self, simulation):
+        """
+        Moves every ball by one frame and resolves its collisions with the walls, the
+        paddle and the bricks of a Simulation.
+
+        Bricks that are hit are destroyed through `Simulation.destroy_brick`, so the
+        simulation's score and grid stay up to date. Balls that fall below the paddle
+        are taken out of play; what that costs the player is left to the caller.
+
+        Parameters:
+        - simulation (Simulation): The simulation that owns the paddle and bricks.
+
+        Returns:
+            list: The events produced during the frame. A ("ball_lost", index) event
+            is reported for every ball that fell below the paddle.
+        """
+        events = []
+        active = self.active
+        x, y, dx, dy = self.x, self.y, self.dx, self.dy
+
+        # Move and bounce off the walls
+        x += dx * active
+        y += dy * active
+        hit = active & (y > BALL_LIMIT_Y)
+        y[hit] = BALL_LIMIT_Y
+        dy[hit] *= -1
+        hit = active & (x > BALL_LIMIT_X)
+        x[hit] = BALL_LIMIT_X
+        dx[hit] *= -1
+        hit = active & (x < -BALL_LIMIT_X)
+        x[hit] = -BALL_LIMIT_X
+        dx[hit] *= -1
+
+        # Paddle
+        paddle = simulation.paddle
+        diff = x - paddle.x
+        hit = active & (np.abs(y - paddle.y) <= PADDLE_REACH_Y) & (np.abs(diff) < PADDLE_REACH_X)
+        if hit.any():
+            dy[hit] *= -1
+            max_dx = simulation.ball.speed * 2
+            dx[hit] = np.clip(dx[hit] + diff[hit] * 0.1, -max_dx, max_dx)
+            events.extend(("paddle", None) for _ in range(int(np.count_nonzero(hit))))
+
+        # Bricks
+        bricks = simulation.bricks
+        if self.wall_version != bricks.version:
+            self.load_wall(bricks)
+        rows, columns = self.wall.shape
+        if rows and columns:
+            hits, flip_x, flip_y = find_brick_hits(x, y, self.wall, active)
+            if hits:
+                dy[flip_y] *= -1
+                dx[flip_x] *= -1
+                hit_cells = [row_index[hit] * columns + column_index[hit] for hit, row_index, column_index in hits]
+                for cell in np.unique(np.concatenate(hit_cells)):
+                    row, column = divmod(int(cell), columns)
+                    self.wall[row, column] = False
+                    events.append(simulation.destroy_brick(int(cell)))
+                self.wall_version = bricks.version
+
+        # Balls that fell below the paddle
+        lost = active & (y < BALL_LOST_Y)
+        for index in np.flatnonzero(lost):
+            active[index] = False
+            events.append(("ball_lost", int(index)))
+        return events
+
+
+# Run a headless multi-ball game and report the frame rate
+if __name__ == "__main__":
+    import time
+
+    from simulation import Simulation
+
+    simulation = Simulation(seed=0)
+    balls = BallSystem(256)
+    rng = np.random.default_rng(0)
+    for _ in range(256):
+        balls.spawn(rng.uniform(-300, 300), rng.uniform(-200, 0), rng.uniform(-4, 4), BALL_SPEED)
+    frames = 10000
+    start = time.perf_counter()
+    for _ in range(frames):
+        simulation.paddle.x = float(np.clip(np.mean(balls.x[balls.active]) if balls.count() else 0.0, -320, 320))
+        balls.step(simulation)
+        if len(simulation.bricks) == 0:
+            simulation.reset_bricks()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{frames} frames with up to 256 balls in {elapsed:.2f}s ({frames / elapsed:.0f} frames/s), "
+        f"{balls.count()} balls left, score {simulation.score}"
+    )
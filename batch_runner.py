@@ -0,0 +1,164 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from simulation import (
+    BALL_SPEED,
+    SPEED_INCREASE,
+    START_COLUMNS,
+    START_FLOORS,
+    START_LIVES,
+    MOVE_NONE,
+    Simulation,
+    track_ball,
+)
+
+MAX_FRAMES = 200000
+SKILL = 0.9
+AIM_SPREAD = 40  # How far off the paddle's center the scripted player may catch the ball
+
+# The settings of one headless game
+GameSettings = namedtuple(
+    "GameSettings",
+    ["seed", "floors", "columns", "ball_speed", "speed_increase", "skill", "aim_spread", "max_frames"],
+)
+# The outcome of one headless game
+GameResult = namedtuple(
+    "GameResult",
+    ["seed", "floors", "columns", "ball_speed", "speed_increase", "level", "score", "bricks", "frames", "lives_lost"],
+)
+
+
+def play_game(settings):
+    """
+    Plays one seeded headless game with a scripted paddle until it is over or runs out of frames.
+
+    The paddle follows the ball, but on each frame it reacts only with probability
+    `skill`, and after every paddle hit it picks a new spot within `aim_spread` of
+    its center to catch the ball with. Both are drawn from a generator seeded with
+    the game's seed, so every seed plays a different but reproducible game.
+
+    Parameters:
+        settings (GameSettings): The settings of the game.
+
+    Returns:
+        GameResult: The outcome of the game.
+    """
+    simulation = Simulation(
+        seed=settings.seed,
+        floors=settings.floors,
+        columns=settings.columns,
+        ball_speed=settings.ball_speed,
+        speed_increase=settings.speed_increase,
+    )
+    rng = random.Random(settings.seed)
+    aim = 0.0
+    bricks = 0
+    while not simulation.game_over and simulation.frame < settings.max_frames:
+        inputs = track_ball(simulation, aim) if rng.random() < settings.skill else MOVE_NONE
+        for name, _ in simulation.step(inputs):
+            if name == "brick":
+                bricks += 1
+            elif name == "paddle":
+                aim = rng.uniform(-settings.aim_spread, settings.aim_spread)
+    return GameResult(
+        settings.seed,
+        settings.floors,
+        settings.columns,
+        settings.ball_speed,
+        settings.speed_increase,
+        simulation.level,
+        simulation.score,
+        bricks,
+        simulation.frame,
+        START_LIVES - simulation.lives,
+    )
+
+
+def run_batch(settings, workers=None, chunksize=8):
+    """
+    Plays games on a pool of worker processes and streams back their results in the order the games were given.
+
+    Parameters:
+        settings (iterable): The GameSettings of each game.
+        workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        chunksize (int): The number of games sent to a worker at a time.
+
+    Yields:
+        GameResult: The outcome of each game.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(play_game, settings, chunksize=chunksize)
+
+
+def parse_values(text, kind):
+    """
+    Parses a comma-separated list of values.
+
+    Parameters:
+        text (str): The values, e.g. "5,6,7".
+        kind (type): The type of each value.
+
+    Returns:
+        list: The parsed values.
+    """
+    return [kind(value) for value in text.split(",")]
+
+
+def main(argv=None):
+    """
+    Plays every combination of the given settings for a range of seeds and prints one
+    JSON line per game, followed by a summary on stderr.
+
+    Parameters:
+        argv (list, optional): The command line arguments. Defaults to sys.argv.
+    """
+    parser = argparse.ArgumentParser(description="Play many seeded headless Breakout games in parallel.")
+    parser.add_argument("--games", type=int, default=100, help="number of seeds per combination of settings")
+    parser.add_argument("--first-seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--floors", default=str(START_FLOORS), help="comma-separated starting floors")
+    parser.add_argument("--columns", default=str(START_COLUMNS), help="comma-separated columns")
+    parser.add_argument("--ball-speed", default=str(BALL_SPEED), help="comma-separated ball speeds")
+    parser.add_argument("--speed-increase", default=str(SPEED_INCREASE), help="comma-separated speed increases")
+    parser.add_argument("--skill", type=float, default=SKILL, help="chance the paddle reacts on a frame")
+    parser.add_argument("--aim-spread", type=float, default=AIM_SPREAD, help="how far off center the paddle catches the ball")
+    parser.add_argument("--max-frames", type=int, default=MAX_FRAMES, help="frame limit per game")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    args = parser.parse_args(argv)
+
+    combinations = itertools.product(
+        parse_values(args.floors, int),
+        parse_values(args.columns, int),
+        parse_values(args.ball_speed, float),
+        parse_values(args.speed_increase, float),
+        range(args.first_seed, args.first_seed + args.games),
+    )
+    settings = (
+        GameSettings(
+            seed, floors, columns, ball_speed, speed_increase, args.skill, args.aim_spread, args.max_frames
+        )
+        for floors, columns, ball_speed, speed_increase, seed in combinations
+    )
+
+    start = time.perf_counter()
+    games = 0
+    frames = 0
+    for result in run_batch(settings, args.workers):
+        print(json.dumps(result._asdict()), flush=True)
+        games += 1
+        frames += result.frames
+    elapsed = time.perf_counter() - start
+    print(
+        f"{games} games, {frames} frames in {elapsed:.2f}s ({frames / elapsed:.0f} frames/s) on {args.workers} workers",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
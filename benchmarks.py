@@ -0,0 +1,309 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import time
+import timeit
+
+import numpy as np
+
+from simulation import Simulation, track_ball
+from autoplay import AutoplayAgent, predict_landing
+from environment import BreakoutEnv, VectorBreakoutEnv
+
+CURRENT_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
+BASELINE_PATH = os.path.join(CURRENT_DIRECTORY, "benchmark_baseline.json")
+RESULTS_PATH = os.path.join(CURRENT_DIRECTORY, "benchmark_results.json")
+THRESHOLD = 0.10  # Slowdowns larger than this fraction of the baseline are flagged
+REPEAT = 7
+
+VECTOR_GAMES = 1024  # Games stepped together by the vectorized environment benchmark
+
+# Wall sizes used to show how brick collision cost scales
+WALL_SIZES = ((5, 16), (10, 16), (20, 32), (40, 64))
+
+
+def best_time(function, number, repeat=REPEAT):
+    """
+    Times a function and returns the best time per call.
+
+    Parameters:
+        function (callable): The function to time.
+        number (int): The number of calls per measurement.
+        repeat (int): The number of measurements.
+
+    Returns:
+        float: The fastest time per call, in seconds.
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def result(value, unit, higher_is_better=False):
+    """
+    Returns one benchmark result as a JSON-ready dict.
+
+    Parameters:
+        value (float): The measured value.
+        unit (str): The unit of the value.
+        higher_is_better (bool): Whether a larger value is an improvement.
+
+    Returns:
+        dict: The result.
+    """
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def bench_headless(results):
+    """
+    Measures the frame rate of the simulation with the scripted paddle and no display.
+    """
+    simulation = Simulation(seed=0)
+
+    def frame():
+        if simulation.game_over:
+            simulation.reset()
+        simulation.step(track_ball(simulation))
+
+    results["headless_frames_per_second"] = result(1 / best_time(frame, 20000), "frames/s", True)
+
+
+def bench_autoplay(results):
+    """
+    Measures the autoplay agent: ball landing predictions, and the simulation's frame rate when the agent plays.
+
+    The predictions start from random ball positions and velocities, going up and down.
+    """
+    rng = random.Random(0)
+    balls = [
+        (rng.uniform(-390, 390), rng.uniform(-260, 290), rng.uniform(-4, 4), rng.choice((-1, 1)) * rng.uniform(2, 5))
+        for _ in range(1000)
+    ]
+
+    def predict():
+        for x, y, dx, dy in balls:
+            predict_landing(x, y, dx, dy, -260.0)
+
+    results["autoplay_predictions_per_second"] = result(len(balls) / best_time(predict, 20), "predictions/s", True)
+
+    simulation = Simulation(seed=0)
+    agent = AutoplayAgent(simulation, jitter=25, seed=0)
+
+    def frame():
+        if simulation.game_over:
+            simulation.reset()
+        simulation.step(agent.act())
+
+    results["autoplay_frames_per_second"] = result(1 / best_time(frame, 20000), "frames/s", True)
+
+
+def bench_environment(results):
+    """
+    Measures the training environments with random actions: steps per second of one
+    BreakoutEnv, and of VECTOR_GAMES games in a VectorBreakoutEnv.
+    """
+    rng = random.Random(0)
+    env = BreakoutEnv(max_steps=10000)
+    env.reset(seed=0)
+
+    def step():
+        if env.step(rng.randrange(env.action_count))[2]:
+            env.reset()
+
+    results["env_steps_per_second"] = result(1 / best_time(step, 20000), "steps/s", True)
+
+    vector_env = VectorBreakoutEnv(VECTOR_GAMES, max_steps=10000)
+    vector_env.reset()
+    actions = itertools.cycle(np.random.default_rng(0).integers(0, vector_env.action_count, (16, VECTOR_GAMES)))
+    results["vector_env_steps_per_second"] = result(
+        VECTOR_GAMES / best_time(lambda: vector_env.step(next(actions)), 100), "steps/s", True
+    )
+
+
+def bench_brick_collision(results):
+    """
+    Measures `Simulation.check_brick_collision` and the swept `Simulation.move_ball` as the wall grows.
+
+    The ball is placed at the same random positions for every wall size. Bricks that
+    are hit are destroyed, as in a real game, so every measurement starts from a new wall.
+    """
+    rng = random.Random(0)
+    positions = [(rng.uniform(-390, 390), rng.uniform(-290, 290)) for _ in range(1000)]
+    for floors, columns in WALL_SIZES:
+        simulation = Simulation(seed=0, floors=floors, columns=columns)
+        ball = simulation.ball
+
+        def check():
+            simulation.reset_bricks()
+            for x, y in positions:
+                ball.x = x
+                ball.y = y
+                simulation.check_brick_collision()
+
+        def move():
+            simulation.reset_bricks()
+            for x, y in positions:
+                ball.x = x
+                ball.y = y
+                ball.dx = 6.0
+                ball.dy = 6.0
+                simulation.move_ball()
+
+        reset = best_time(simulation.reset_bricks, 5)
+        results[f"check_brick_collision_{floors}x{columns}"] = result(
+            (best_time(check, 5) - reset) / len(positions), "s"
+        )
+        results[f"move_ball_{floors}x{columns}"] = result((best_time(move, 5) - reset) / len(positions), "s")
+
+
+def bench_level_transition(results):
+    """
+    Measures `Simulation.reset_bricks`, the rebuild of the wall on a level-up, without a display.
+    """
+    simulation = Simulation(seed=0)
+    results["simulation_reset_bricks"] = result(best_time(simulation.reset_bricks, 200), "s")
+
+
+def bench_rendering(results):
+    """
+    Measures the rendered game: the main loop frame rate, dashboard redraws and `Game.reset_bricks`.
+
+    Needs a display; the caller skips these benchmarks if none is available.
+    """
+    from game import Game
+
+    game = Game(seed=0)
+
+    def frame():
+        if game.simulation.game_over:
+            game.setup_game()
+        game.controls.release_all()
+        direction = track_ball(game.simulation)
+        if direction:
+            game.controls.press(direction)
+        game.run_frame(1)
+        game.screen.update()
+
+    results["rendered_frames_per_second"] = result(1 / best_time(frame, 500), "frames/s", True)
+
+    dashboard = game.dashboard
+    seconds = iter(range(10**9))
+    results["dashboard_update_time_unchanged"] = result(best_time(lambda: dashboard.update_time(1.5), 1000), "s")
+    results["dashboard_update_time_new_second"] = result(
+        best_time(lambda: dashboard.update_time(next(seconds)), 200), "s"
+    )
+
+    def redraw():
+        dashboard.mark_dirty("score")
+        dashboard.update_dashboard()
+
+    results["dashboard_update_dashboard"] = result(best_time(redraw, 200), "s")
+    results["game_reset_bricks"] = result(best_time(game.reset_bricks, 20), "s")
+    game.screen.bye()
+
+
+def run_benchmarks(render=True):
+    """
+    Runs every benchmark.
+
+    Parameters:
+        render (bool): Whether to run the benchmarks that need a display.
+
+    Returns:
+        dict: The results, with details about the machine they were measured on.
+    """
+    results = {}
+    bench_headless(results)
+    bench_autoplay(results)
+    bench_environment(results)
+    bench_brick_collision(results)
+    bench_level_transition(results)
+    if render:
+        try:
+            bench_rendering(results)
+        except Exception as error:  # turtle raises Tk errors of several kinds without a display
+            print(f"Skipping rendered benchmarks: {error}", file=sys.stderr)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "benchmarks": results,
+    }
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    Compares results with a baseline.
+
+    Parameters:
+        results (dict): The results of `run_benchmarks()`.
+        baseline (dict): Earlier results of `run_benchmarks()`.
+        threshold (float): The fraction by which a benchmark may get slower before it is flagged.
+
+    Returns:
+        list: The names of the benchmarks that got slower than the threshold allows.
+    """
+    slower = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline["benchmarks"].get(name)
+        if previous is None or not previous["value"]:
+            print(f"{name:40} {current['value']:.6g} {current['unit']} (no baseline)")
+            continue
+        # The relative change in time taken: above 0 is slower
+        if current["higher_is_better"]:
+            change = previous["value"] / current["value"] - 1
+        else:
+            change = current["value"] / previous["value"] - 1
+        flag = "SLOWER" if change > threshold else ""
+        if flag:
+            slower.append(name)
+        print(f"{name:40} {current['value']:.6g} {current['unit']} ({change:+.1%} time) {flag}")
+    return slower
+
+
+def main(argv=None):
+    """
+    Runs the benchmarks, saves the results as JSON and optionally compares them with the baseline.
+
+    Parameters:
+        argv (list, optional): The command line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: 1 if the comparison found a slowdown, 2 if there is no baseline to compare with, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Breakout game.")
+    parser.add_argument("--output", default=RESULTS_PATH, help="where to save the results")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="the baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="compare the results with the baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown, e.g. 0.1 for 10%%")
+    parser.add_argument("--headless", action="store_true", help="skip the benchmarks that need a display")
+    args = parser.parse_args(argv)
+    if args.compare and not args.save_baseline and not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first.", file=sys.stderr)
+        return 2
+
+    results = run_benchmarks(render=not args.headless)
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        slower = compare(results, baseline, args.threshold)
+        if slower:
+            print(f"{len(slower)} benchmark(s) slower than the baseline: {', '.join(slower)}")
+            return 1
+    else:
+        for name, current in results["benchmarks"].items():
+            print(f"{name:40} {current['value']:.6g} {current['unit']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,6 +28,25 @@ class Brick:
         self.brick.penup()
         self.brick.goto(x, y)
 
+    def stamp(self, color, x, y):
+        """
+        Draws a copy of the brick with the given color at the given position.
+
+        The copy is a plain canvas item that is not redrawn on screen updates, so
+        any number of them cost nothing per frame.
+
+        Parameters:
+        - color (str): The color of the copy.
+        - x (int): The x-coordinate of the copy.
+        - y (int): The y-coordinate of the copy.
+
+        Returns:
+            int: The stamp id, used to erase the copy with `clearstamp`.
+        """
+        self.brick.color(color)
+        self.brick.goto(x, y)
+        return self.brick.stamp()
+
     def destroy(self):
         """
         Destroys the brick by moving it off the game screen and hiding it.
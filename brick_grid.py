@@ -0,0 +1,228 @@
+import math
+from array import array
+
+# Layout of the brick wall: the center of the brick in row `r`, column `c` is at
+# (BRICK_LEFT + c * BRICK_SPACING_X, BRICK_TOP - r * BRICK_SPACING_Y)
+BRICK_LEFT = -380
+BRICK_TOP = 250
+BRICK_SPACING_X = 50
+BRICK_SPACING_Y = 30
+
+# Maps a cell's brick type to its alive flag: 0 for an empty cell, 1 otherwise
+ALIVE = bytes([0] + [1] * 255)
+
+
+class BrickGrid:
+    """
+    The bricks of the wall, stored as flat arrays with one entry per cell.
+
+    A brick is identified by its cell index, `row * columns + column`. The arrays
+    hold the center of every cell, the brick type in it, whose color and score are
+    looked up in `types`, and whether its brick is still alive. Loading a wall is an
+    array copy of its types, and the bricks near a point are found by computing which
+    cells it covers instead of scanning every brick.
+
+    Attributes:
+        rows (int): The number of rows in the grid.
+        columns (int): The number of columns in the grid.
+        x (array.array): The x-coordinate of the center of every cell.
+        y (array.array): The y-coordinate of the center of every cell.
+        kinds (bytearray): The brick type of every cell: 0 for none, or the 1-based index into `types`.
+        alive (bytearray): 1 for every cell holding a brick still in play, 0 otherwise.
+        types (list): The (color, points) of each brick type.
+        count (int): The number of bricks alive.
+        version (int): A counter that changes whenever a brick is added or removed.
+
+    Methods:
+        reset(rows, columns): Empties the grid and resizes it.
+        load(rows, columns, kinds, types): Fills the grid with a wall.
+        position(row, column): Returns the center of a cell.
+        color(index): Returns the color of a brick.
+        points(index): Returns the score of a brick.
+        remove(index): Removes a brick.
+        candidates(x, y, reach_x, reach_y): Returns the bricks whose centers are near a point.
+        candidates_along(x, y, dx, dy, reach_x, reach_y): Returns the bricks whose centers are near a movement.
+    """
+
+    def __init__(self, rows=0, columns=0):
+        """
+        Initializes an empty BrickGrid.
+
+        Parameters:
+        - rows (int): The number of rows in the grid.
+        - columns (int): The number of columns in the grid.
+        """
+        self.rows = 0
+        self.columns = 0
+        self.x = array("d")
+        self.y = array("d")
+        self.kinds = bytearray()
+        self.alive = bytearray()
+        self.types = []
+        self.count = 0
+        self.version = 0
+        self.reset(rows, columns)
+
+    def reset(self, rows, columns):
+        """
+        Empties the grid and resizes it to `rows` x `columns` cells.
+
+        The cell coordinates are only computed again when the size changes.
+
+        Parameters:
+        - rows (int): The number of rows in the grid.
+        - columns (int): The number of columns in the grid.
+        """
+        if rows != self.rows or columns != self.columns:
+            self.rows = rows
+            self.columns = columns
+            self.x = array("d", [BRICK_LEFT + column * BRICK_SPACING_X for column in range(columns)] * rows)
+            self.y = array("d", [BRICK_TOP - row * BRICK_SPACING_Y for row in range(rows) for _ in range(columns)])
+        self.kinds = bytearray(rows * columns)
+        self.alive = bytearray(rows * columns)
+        self.count = 0
+        self.version += 1
+
+    def load(self, rows, columns, kinds, types):
+        """
+        Fills the grid with a wall.
+
+        Parameters:
+        - rows (int): The number of rows in the wall.
+        - columns (int): The number of columns in the wall.
+        - kinds (bytes-like): The brick type of every cell, row by row: 0 for none, or the 1-based index into `types`.
+        - types (list): The (color, points) of each brick type.
+        """
+        self.reset(rows, columns)
+        self.kinds[:] = kinds
+        self.alive[:] = self.kinds.translate(ALIVE)
+        self.types = types
+        self.count = len(self.kinds) - self.kinds.count(0)
+
+    def position(self, row, column):
+        """
+        Returns the center of the given cell.
+
+        Parameters:
+        - row (int): The row of the cell.
+        - column (int): The column of the cell.
+
+        Returns:
+            tuple: The (x, y) coordinates of the cell's center.
+        """
+        return BRICK_LEFT + column * BRICK_SPACING_X, BRICK_TOP - row * BRICK_SPACING_Y
+
+    def color(self, index):
+        """
+        Returns the color of the brick in a cell.
+
+        Parameters:
+        - index (int): The index of the cell.
+
+        Returns:
+            str: The color of the brick.
+        """
+        return self.types[self.kinds[index] - 1][0]
+
+    def points(self, index):
+        """
+        Returns the score for destroying the brick in a cell.
+
+        Parameters:
+        - index (int): The index of the cell.
+
+        Returns:
+            int: The score of the brick.
+        """
+        return self.types[self.kinds[index] - 1][1]
+
+    def remove(self, index):
+        """
+        Removes the brick in a cell.
+
+        Parameters:
+        - index (int): The index of the cell.
+        """
+        if self.alive[index]:
+            self.alive[index] = 0
+            self.count -= 1
+            self.version += 1
+
+    def candidates(self, x, y, reach_x, reach_y):
+        """
+        Returns the bricks whose centers are strictly within `reach_x` and `reach_y` of a point.
+
+        Only the cells that can contain such a brick are visited, so the cost does
+        not depend on the size of the wall. Bricks are returned row by row, left to
+        right, matching the order in which the wall is built.
+
+        Parameters:
+        - x (float): The x-coordinate of the point.
+        - y (float): The y-coordinate of the point.
+        - reach_x (float): The horizontal distance to search.
+        - reach_y (float): The vertical distance to search.
+
+        Returns:
+            list: The cell indices of the bricks found.
+        """
+        first_column = max(0, math.ceil((x - reach_x - BRICK_LEFT) / BRICK_SPACING_X))
+        last_column = min(self.columns - 1, math.floor((x + reach_x - BRICK_LEFT) / BRICK_SPACING_X))
+        first_row = max(0, math.ceil((BRICK_TOP - y - reach_y) / BRICK_SPACING_Y))
+        last_row = min(self.rows - 1, math.floor((BRICK_TOP - y + reach_y) / BRICK_SPACING_Y))
+        alive = self.alive
+        xs = self.x
+        ys = self.y
+        found = []
+        for row in range(first_row, last_row + 1):
+            start = row * self.columns
+            for index in range(start + first_column, start + last_column + 1):
+                if alive[index] and abs(y - ys[index]) < reach_y and abs(x - xs[index]) < reach_x:
+                    found.append(index)
+        return found
+
+    def candidates_along(self, x, y, dx, dy, reach_x, reach_y):
+        """
+        Returns the bricks that a point moving from (x, y) by (dx, dy) may come within reach of.
+
+        Every brick whose center is within `reach_x` and `reach_y` of the bounding
+        box of the movement is returned, row by row, left to right. The caller does
+        the exact test, e.g. with `collision.sweep_box`.
+
+        Parameters:
+        - x (float): The x-coordinate of the start of the movement.
+        - y (float): The y-coordinate of the start of the movement.
+        - dx (float): The horizontal movement.
+        - dy (float): The vertical movement.
+        - reach_x (float): The horizontal distance to search.
+        - reach_y (float): The vertical distance to search.
+
+        Returns:
+            list: The cell indices of the bricks found.
+        """
+        min_x, max_x = (x, x + dx) if dx > 0 else (x + dx, x)
+        min_y, max_y = (y, y + dy) if dy > 0 else (y + dy, y)
+        first_column = max(0, math.ceil((min_x - reach_x - BRICK_LEFT) / BRICK_SPACING_X))
+        last_column = min(self.columns - 1, math.floor((max_x + reach_x - BRICK_LEFT) / BRICK_SPACING_X))
+        first_row = max(0, math.ceil((BRICK_TOP - max_y - reach_y) / BRICK_SPACING_Y))
+        last_row = min(self.rows - 1, math.floor((BRICK_TOP - min_y + reach_y) / BRICK_SPACING_Y))
+        alive = self.alive
+        found = []
+        for row in range(first_row, last_row + 1):
+            start = row * self.columns
+            for index in range(start + first_column, start + last_column + 1):
+                if alive[index]:
+                    found.append(index)
+        return found
+
+    def __len__(self):
+        """
+        Returns the number of bricks alive.
+        """
+        return self.count
+
+    def __iter__(self):
+        """
+        Iterates over the cell indices of the bricks alive, row by row, left to right.
+        """
+        alive = self.alive
+        return (index for index in range(len(alive)) if alive[index])
@@ -0,0 +1,62 @@
+from brick import Brick
+
+
+class BrickWall:
+    """
+    Draws the whole wall of bricks as stamps of a single hidden Brick.
+
+    Stamps are plain canvas items that turtle never redraws, so unlike one turtle
+    per brick, the cost of a screen update does not depend on the number of
+    bricks. Destroying a brick only deletes its own stamp.
+
+    Attributes:
+        stamper (Brick): The hidden brick used to stamp the wall.
+        stamps (dict): A dict mapping the cell index of each drawn brick to its stamp id.
+
+    Methods:
+        draw(bricks, index): Draws a brick of a BrickGrid.
+        erase(index): Erases a brick.
+        clear(): Erases the whole wall.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty BrickWall.
+        """
+        self.stamper = Brick("black", 0, 0)
+        self.stamper.destroy()
+        self.stamps = {}
+
+    def draw(self, bricks, index):
+        """
+        Draws a brick of a BrickGrid with its color at its position.
+
+        Parameters:
+        - bricks (BrickGrid): The grid that stores the brick.
+        - index (int): The cell index of the brick.
+        """
+        self.stamps[index] = self.stamper.stamp(bricks.color(index), bricks.x[index], bricks.y[index])
+
+    def erase(self, index):
+        """
+        Erases a brick from the game screen.
+
+        Parameters:
+        - index (int): The cell index of the brick.
+        """
+        stamp = self.stamps.pop(index, None)
+        if stamp is not None:
+            self.stamper.brick.clearstamp(stamp)
+
+    def clear(self):
+        """
+        Erases every brick of the wall.
+        """
+        self.stamper.brick.clearstamps()
+        self.stamps.clear()
+
+    def __len__(self):
+        """
+        Returns the number of bricks drawn.
+        """
+        return len(self.stamps)
@@ -0,0 +1,81 @@
+import math
+
+
+def sweep_box(x, y, dx, dy, left, bottom, right, top):
+    """
+    Finds when a point moving from (x, y) by (dx, dy) first enters a box.
+
+    The ball's own size is accounted for by growing the box by the ball's reach
+    (a Minkowski sum), so the ball can be swept as a point. A point that starts
+    inside the box hits it at time 0; a point that only touches its edge, or that
+    starts on its edge moving away, does not hit it.
+
+    Parameters:
+    - x (float): The x-coordinate of the start of the movement.
+    - y (float): The y-coordinate of the start of the movement.
+    - dx (float): The horizontal movement.
+    - dy (float): The vertical movement.
+    - left (float): The left edge of the box.
+    - bottom (float): The bottom edge of the box.
+    - right (float): The right edge of the box.
+    - top (float): The top edge of the box.
+
+    Returns:
+        tuple: (t, axis) where t in [0, 1] is the fraction of the movement done at
+        impact and axis is "x" or "y", the axis of the face that was hit.
+        None if the box isn't hit during the movement.
+    """
+    if dx:
+        t1 = (left - x) / dx
+        t2 = (right - x) / dx
+        near_x, far_x = (t1, t2) if t1 < t2 else (t2, t1)
+    elif left < x < right:
+        near_x, far_x = -math.inf, math.inf
+    else:
+        return None
+
+    if dy:
+        t1 = (bottom - y) / dy
+        t2 = (top - y) / dy
+        near_y, far_y = (t1, t2) if t1 < t2 else (t2, t1)
+    elif bottom < y < top:
+        near_y, far_y = -math.inf, math.inf
+    else:
+        return None
+
+    enter = max(near_x, near_y)
+    leave = min(far_x, far_y)
+    if enter >= leave or leave <= 0 or enter > 1:
+        return None
+    return max(enter, 0.0), "x" if near_x > near_y else "y"
+
+
+def sweep_walls(x, y, dx, dy, limit_x, limit_y):
+    """
+    Finds when a point moving from (x, y) by (dx, dy) first reaches the left, right or top wall.
+
+    The walls are at x = -limit_x, x = limit_x and y = limit_y. There is no bottom wall.
+
+    Parameters:
+    - x (float): The x-coordinate of the start of the movement.
+    - y (float): The y-coordinate of the start of the movement.
+    - dx (float): The horizontal movement.
+    - dy (float): The vertical movement.
+    - limit_x (float): The distance from the center to the side walls.
+    - limit_y (float): The distance from the center to the top wall.
+
+    Returns:
+        tuple: (t, axis) where t in [0, 1] is the fraction of the movement done at
+        impact and axis is "x" for a side wall or "y" for the top wall.
+        None if no wall is reached during the movement.
+    """
+    hit = None
+    if dx > 0 and x + dx > limit_x:
+        hit = (max((limit_x - x) / dx, 0.0), "x")
+    elif dx < 0 and x + dx < -limit_x:
+        hit = (max((-limit_x - x) / dx, 0.0), "x")
+    if dy > 0 and y + dy > limit_y:
+        t = max((limit_y - y) / dy, 0.0)
+        if hit is None or t < hit[0]:
+            hit = (t, "y")
+    return hit
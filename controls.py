@@ -0,0 +1,104 @@
+import time
+from functools import partial
+
+from simulation import MOVE_LEFT, MOVE_NONE, MOVE_RIGHT
+
+# The keys that steer the paddle
+KEY_DIRECTIONS = {"Left": MOVE_LEFT, "Right": MOVE_RIGHT}
+# How long a released key still counts as held. On X11, a held key repeats as release
+# and press pairs, so a release only counts once no press follows it within this time.
+RELEASE_GRACE = 0.03
+
+
+class PaddleControls:
+    """
+    Tracks which steering keys are held down, so that the paddle can be moved once per physics tick.
+
+    Key presses and releases only update the state; the game reads it with `direction()`
+    on every tick. The paddle therefore moves smoothly for as long as a key is held,
+    whatever the operating system's key repeat delay and rate are.
+
+    Attributes:
+        release_grace (float): How long a released key still counts as held, in seconds.
+        held (dict): The held directions, mapped to the order in which they were pressed.
+        released (dict): The held directions whose key was released, mapped to when.
+        presses (int): The number of key presses so far, used to order them.
+
+    Methods:
+        bind(screen): Binds the steering keys of a turtle screen.
+        press(direction): Records that a steering key was pressed.
+        release(direction): Records that a steering key was released.
+        release_all(): Releases every steering key.
+        direction(): Returns the direction the paddle should be steered in.
+    """
+
+    def __init__(self, release_grace=RELEASE_GRACE):
+        """
+        Initializes PaddleControls with no key held.
+
+        Parameters:
+        - release_grace (float): How long a released key still counts as held, in seconds.
+        """
+        self.release_grace = release_grace
+        self.held = {}
+        self.released = {}
+        self.presses = 0
+
+    def bind(self, screen):
+        """
+        Binds the key press and release events of the steering keys.
+
+        Parameters:
+        - screen (turtle.Screen): The screen to bind the keys of.
+        """
+        for key, direction in KEY_DIRECTIONS.items():
+            screen.onkeypress(partial(self.press, direction), key)
+            screen.onkeyrelease(partial(self.release, direction), key)
+
+    def press(self, direction):
+        """
+        Records that a steering key was pressed. Repeats of a key that is already held are ignored.
+
+        Parameters:
+        - direction (int): MOVE_LEFT or MOVE_RIGHT.
+        """
+        self.released.pop(direction, None)
+        if direction not in self.held:
+            self.presses += 1
+            self.held[direction] = self.presses
+
+    def release(self, direction):
+        """
+        Records that a steering key was released. It stops counting as held after `release_grace`.
+
+        Parameters:
+        - direction (int): MOVE_LEFT or MOVE_RIGHT.
+        """
+        if direction in self.held:
+            self.released[direction] = time.monotonic()
+
+    def release_all(self):
+        """
+        Releases every steering key straight away.
+        """
+        self.held.clear()
+        self.released.clear()
+
+    def direction(self):
+        """
+        Returns the direction the paddle should be steered in on this tick.
+
+        When both keys are held, the one pressed last wins.
+
+        Returns:
+            int: MOVE_LEFT, MOVE_RIGHT or MOVE_NONE.
+        """
+        if self.released:
+            now = time.monotonic()
+            for direction, released_at in list(self.released.items()):
+                if now - released_at >= self.release_grace:
+                    del self.released[direction]
+                    del self.held[direction]
+        if not self.held:
+            return MOVE_NONE
+        return max(self.held, key=self.held.get)
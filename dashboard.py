@@ -1,4 +1,9 @@
 import turtle
+from leaderboard import Leaderboard
+
+FONT = ("Courier", 14, "normal")
+# The fields shown on the dashboard, in display order
+FIELDS = ("score", "high_score", "lives", "level", "time")
 
 
 class Dashboard:
@@ -11,24 +16,34 @@ class Dashboard:
         max_lives (int): The maximum number of lives the player can have.
         level (int): The current level of the game.
         high_score (int): The highest score achieved.
+        leaderboard (Leaderboard): The stored top scores.
+        score_submitted (bool): Whether the current game's score was submitted to the leaderboard.
         display (turtle.Turtle): The turtle object used to display the dashboard.
+        displayed_seconds (int): The whole number of seconds shown on the dashboard, or None.
+        dirty_fields (set): The fields that changed since the dashboard was last drawn.
+        field_text (dict): The cached display text of each field.
 
     Methods:
-        __init__(): Initializes the Dashboard object.
-        update_dashboard(): Updates the dashboard display.
-        update_score(points): Updates the score and updates the dashboard display.
-        lose_life(): Decreases the number of lives by 1 and updates the dashboard display.
-        next_level(): Increases the level by 1 and updates the dashboard display.
+        __init__(leaderboard=None): Initializes the Dashboard object.
+        mark_dirty(*fields): Marks fields as changed so that the next redraw updates them.
+        format_field(field): Returns the display text of a field.
+        update_dashboard(): Redraws the dashboard display if any field changed.
+        update_score(points): Updates the score and marks it for redraw.
+        set_score(score): Sets the score and marks it for redraw if it changed.
+        set_lives(lives): Sets the number of lives and marks them for redraw if they changed.
+        set_level(level): Sets the level and marks it for redraw if it changed.
+        lose_life(): Decreases the number of lives by 1 and marks them for redraw.
+        next_level(): Increases the level by 1 and marks it for redraw.
         reset(): Resets the score, lives, and level to their initial values and updates the dashboard display.
-        load_high_score(): Loads the high score from a file.
-        update_high_score(): Updates the high score if the current score is higher and saves it to a file.
-        update_time(elapsed_time): Updates the dashboard display with the current time.
+        load_high_score(): Returns the best score on the leaderboard.
+        update_high_score(): Submits the score to the leaderboard and updates the high score if it is higher.
+        update_time(elapsed_time): Updates the time and redraws the dashboard if anything visible changed.
         get_lives(): Returns the number of lives.
         get_lives_formatted(): Returns a formatted string representing the lives using heart emojis.
         get_level(): Returns the current level.
     """
 
-    def __init__(self):
+    def __init__(self, leaderboard=None):
         """
         Initializes the Dashboard object.
 
@@ -36,7 +51,7 @@ class Dashboard:
         It also initializes a turtle object for displaying the dashboard on the screen.
 
         Parameters:
-            None
+            leaderboard (Leaderboard, optional): The stored top scores. The default leaderboard file is used if omitted.
 
         Returns:
             None
@@ -45,7 +60,12 @@ class Dashboard:
         self.lives = 3
         self.max_lives = 3
         self.level = 1
+        self.leaderboard = leaderboard if leaderboard is not None else Leaderboard()
         self.high_score = self.load_high_score()
+        self.score_submitted = False
+        self.displayed_seconds = None
+        self.dirty_fields = set(FIELDS)
+        self.field_text = {}
         self.display = turtle.Turtle()
         self.display.speed(0)
         self.display.color("white")
@@ -54,22 +74,68 @@ class Dashboard:
         self.display.goto(-380, 260)
         self.update_dashboard()
 
+    def mark_dirty(self, *fields):
+        """
+        Marks fields as changed so that the next redraw updates their text.
+
+        Args:
+            *fields (str): The names of the changed fields, from FIELDS.
+
+        Returns:
+            None
+        """
+        self.dirty_fields.update(fields)
+
+    def format_field(self, field):
+        """
+        Returns the display text of a field.
+
+        Args:
+            field (str): The name of the field, from FIELDS.
+
+        Returns:
+            str: The text shown for the field, or an empty string if it isn't shown.
+        """
+        if field == "score":
+            return f"Score: {self.score}"
+        if field == "high_score":
+            return f"High Score: {self.high_score}"
+        if field == "lives":
+            return f"Lives: {self.get_lives_formatted()}"
+        if field == "level":
+            return f"Level: {self.level}"
+        if self.displayed_seconds is None:
+            return ""
+        # Convert seconds to minutes:seconds format
+        minutes, seconds = divmod(self.displayed_seconds, 60)
+        return f"Time: {minutes:02d}:{seconds:02d}"
+
     def update_dashboard(self):
         """
-        Updates the dashboard display with the current score, high score, lives, and level.
+        Redraws the dashboard display with the current score, high score, lives, level and time.
+
+        Nothing is drawn if no field changed since the last redraw, and only the text of
+        the changed fields is formatted again.
         """
+        if not self.dirty_fields:
+            return
+        for field in self.dirty_fields:
+            self.field_text[field] = self.format_field(field)
+        self.dirty_fields.clear()
         self.display.clear()
-        hearts = self.get_lives_formatted()
         self.display.write(
-            f"Score: {self.score}  High Score: {self.high_score}  Lives: {hearts}  Level: {self.level}",
+            "  ".join(self.field_text[field] for field in FIELDS if self.field_text[field]),
             align="left",
-            font=("Courier", 14, "normal"),
+            font=FONT,
         )
 
     def update_score(self, points):
         """
         Updates the score by adding the given points.
 
+        The new score is drawn on the next redraw, so several hits in one frame
+        only cost one redraw.
+
         Args:
             points (int): The number of points to add to the score.
 
@@ -77,27 +143,70 @@ class Dashboard:
             None
         """
         self.score += points
-        self.update_dashboard()
+        self.mark_dirty("score")
+
+    def set_score(self, score):
+        """
+        Sets the score, for example to mirror the simulation's score.
+
+        Like `update_score()`, the new score is drawn on the next redraw.
+
+        Args:
+            score (int): The new score.
+
+        Returns:
+            None
+        """
+        if score != self.score:
+            self.score = score
+            self.mark_dirty("score")
+
+    def set_lives(self, lives):
+        """
+        Sets the number of lives, for example when the game is rewound.
+
+        Args:
+            lives (int): The new number of lives.
+
+        Returns:
+            None
+        """
+        if lives != self.lives:
+            self.lives = lives
+            self.mark_dirty("lives")
+
+    def set_level(self, level):
+        """
+        Sets the level, for example when the game is rewound.
+
+        Args:
+            level (int): The new level.
+
+        Returns:
+            None
+        """
+        if level != self.level:
+            self.level = level
+            self.mark_dirty("level")
 
     def lose_life(self):
         """
-        Decreases the number of lives by 1 and updates the dashboard.
+        Decreases the number of lives by 1 and marks them for redraw.
 
         If the number of lives is greater than 0, it subtracts 1 from the current
-        number of lives and calls the `update_dashboard` method to update the
-        dashboard display.
+        number of lives. The dashboard shows the change on the next redraw.
 
         """
         if self.lives > 0:
             self.lives -= 1
-            self.update_dashboard()
+            self.mark_dirty("lives")
 
     def next_level(self):
         """
-        Increases the level by 1 and updates the dashboard.
+        Increases the level by 1 and marks it for redraw.
         """
         self.level += 1
-        self.update_dashboard()
+        self.mark_dirty("level")
 
     def reset(self):
         """
@@ -109,51 +218,50 @@ class Dashboard:
         self.score = 0
         self.lives = 3
         self.level = 1
+        self.displayed_seconds = None
+        self.score_submitted = False
+        self.mark_dirty("score", "lives", "level", "time")
         self.update_dashboard()
 
     def load_high_score(self):
         """
-        Load the high score from the 'highscore.txt' file.
+        Returns the best score on the leaderboard.
 
         Returns:
-            int: The high score loaded from the file. If the file doesn't exist, returns 0.
+            int: The best score, read from the leaderboard's memory. If there are no scores, returns 0.
         """
-        try:
-            with open("highscore.txt", "r") as file:
-                return int(file.read())
-        except FileNotFoundError:
-            return 0
+        return self.leaderboard.best_score()
 
     def update_high_score(self):
         """
-        Updates the high score if the current score is higher.
-        Writes the updated high score to a file named 'highscore.txt'.
+        Submits the current score to the leaderboard, once per game, and updates the high score if the current
+        score is higher. The leaderboard is saved in the background, so this never waits for the disk.
         """
+        if not self.score_submitted and self.score > 0:
+            self.leaderboard.submit(self.score, self.level, self.displayed_seconds or 0)
+            self.score_submitted = True
         if self.score > self.high_score:
             self.high_score = self.score
-            with open("highscore.txt", "w") as file:
-                file.write(str(self.high_score))
+            self.mark_dirty("high_score")
 
     def update_time(self, elapsed_time):
         """
         Updates the time displayed on the dashboard.
 
+        This is called every frame, but the dashboard is only redrawn when the displayed
+        second or another field changed.
+
         Args:
             elapsed_time (float): The elapsed time in seconds.
 
         Returns:
             None
         """
-        # Convert seconds to minutes:seconds format
-        minutes = int(elapsed_time // 60)
-        seconds = int(elapsed_time % 60)
-        hearts = self.get_lives_formatted()
-        self.display.clear()
-        self.display.write(
-            f"Score: {self.score}  High Score: {self.high_score}  Lives: {hearts}  Level: {self.level}  Time: {minutes:02d}:{seconds:02d}",
-            align="left",
-            font=("Courier", 14, "normal"),
-        )
+        seconds = int(elapsed_time)
+        if seconds != self.displayed_seconds:
+            self.displayed_seconds = seconds
+            self.mark_dirty("time")
+        self.update_dashboard()
 
     def get_lives(self):
         """
@@ -0,0 +1,475 @@
+import numpy as np
+
+from ball_system import find_brick_hits
+from simulation import (
+    BALL_LIMIT_X,
+    BALL_LIMIT_Y,
+    BALL_LOST_Y,
+    BALL_SPEED,
+    BRICK_SCORE,
+    MOVE_LEFT,
+    MOVE_NONE,
+    MOVE_RIGHT,
+    PADDLE_ACCELERATION,
+    PADDLE_LIMIT_X,
+    PADDLE_REACH_X,
+    PADDLE_REACH_Y,
+    PADDLE_SPEED,
+    SCREEN_HEIGHT,
+    SPEED_INCREASE,
+    START_COLUMNS,
+    START_FLOORS,
+    START_LIVES,
+    Simulation,
+)
+
+# Action i steers the paddle in direction ACTIONS[i]
+ACTIONS = (MOVE_NONE, MOVE_LEFT, MOVE_RIGHT)
+# The ball, paddle and lives at the start of every observation, followed by the brick mask
+FEATURES = ("ball_x", "ball_y", "ball_dx", "ball_dy", "paddle_x", "paddle_vx", "lives")
+OBSERVED_ROWS = 16  # Rows of bricks in an observation; walls never grow past this in the vectorized games
+PADDLE_Y = -SCREEN_HEIGHT / 2 + 20
+
+
+class BreakoutEnv:
+    """
+    One headless game of Breakout behind a Gym-style `reset()` / `step()` interface.
+
+    The game is a Simulation with generated walls. By default it runs the overlap
+    rules of `BallBody.move()` and `Simulation.check_collisions()`, which are also
+    the rules of VectorBreakoutEnv, so both give the same games for the same actions.
+
+    An observation is a float32 array: the features in FEATURES, scaled to about
+    [-1, 1], then the alive flags of the top OBSERVED_ROWS x `columns` cells of the
+    wall, row by row. The reward is the score gained in the step, minus `life_penalty`
+    for every life lost. An episode is done when the game is over, or after `max_steps` steps.
+
+    Attributes:
+        simulation (Simulation): The game.
+        columns (int): The number of columns of bricks, and of the observed brick mask.
+        max_steps (int): The number of steps an episode is cut off after, or None.
+        life_penalty (float): The reward taken away for every life lost.
+        observation_size (int): The length of an observation.
+
+    Methods:
+        reset(seed): Starts a new game and returns its first observation.
+        step(action): Plays one tick and returns the observation, reward, done flag and info.
+        observe(): Returns the observation of the current state.
+    """
+
+    action_count = len(ACTIONS)
+
+    def __init__(
+        self,
+        floors=START_FLOORS,
+        columns=START_COLUMNS,
+        ball_speed=BALL_SPEED,
+        speed_increase=SPEED_INCREASE,
+        continuous=False,
+        max_steps=None,
+        life_penalty=0.0,
+    ):
+        """
+        Initializes a BreakoutEnv. Call `reset()` before the first step.
+
+        Parameters:
+            floors (int): The number of rows of bricks at level 1.
+            columns (int): The number of columns of bricks.
+            ball_speed (float): The starting speed of the ball along each axis.
+            speed_increase (float): The ball speed added on every level up.
+            continuous (bool): Whether to use the swept collisions of `Simulation.move_ball()`
+                instead of the overlap rules. The vectorized games only have the overlap rules.
+            max_steps (int, optional): The number of steps an episode is cut off after.
+            life_penalty (float): The reward taken away for every life lost.
+        """
+        self.simulation = Simulation(
+            floors=floors,
+            columns=columns,
+            ball_speed=ball_speed,
+            speed_increase=speed_increase,
+            continuous=continuous,
+        )
+        self.columns = columns
+        self.max_steps = max_steps
+        self.life_penalty = life_penalty
+        self.observation_size = len(FEATURES) + OBSERVED_ROWS * columns
+
+    def reset(self, seed=None):
+        """
+        Starts a new game from level 1.
+
+        Parameters:
+            seed (int, optional): Reseeds the brick colors. The rules themselves have no randomness.
+
+        Returns:
+            numpy.ndarray: The first observation.
+        """
+        self.simulation.reset(seed)
+        return self.observe()
+
+    def step(self, action):
+        """
+        Plays one tick of the game.
+
+        Parameters:
+            action (int): The index of the paddle input in ACTIONS.
+
+        Returns:
+            tuple: The observation, the reward, whether the episode is done, and an info
+                dict with the score, lives and level.
+        """
+        simulation = self.simulation
+        score = simulation.score
+        lives = simulation.lives
+        simulation.step(ACTIONS[action])
+        reward = simulation.score - score - self.life_penalty * (lives - simulation.lives)
+        done = simulation.game_over or (self.max_steps is not None and simulation.frame >= self.max_steps)
+        info = {"score": simulation.score, "lives": simulation.lives, "level": simulation.level}
+        return self.observe(), reward, done, info
+
+    def observe(self):
+        """
+        Returns the observation of the current state, see the class description.
+
+        Returns:
+            numpy.ndarray: The observation.
+        """
+        simulation = self.simulation
+        ball = simulation.ball
+        paddle = simulation.paddle
+        observation = np.zeros(self.observation_size, dtype=np.float32)
+        observation[: len(FEATURES)] = (
+            ball.x / BALL_LIMIT_X,
+            ball.y / BALL_LIMIT_Y,
+            ball.dx / ball.speed,
+            ball.dy / ball.speed,
+            paddle.x / PADDLE_LIMIT_X,
+            paddle.vx / paddle.speed,
+            simulation.lives / START_LIVES,
+        )
+        bricks = simulation.bricks
+        rows = min(bricks.rows, OBSERVED_ROWS)
+        columns = min(bricks.columns, self.columns)
+        alive = np.frombuffer(bricks.alive, dtype=np.uint8).reshape(bricks.rows, bricks.columns)
+        mask = observation[len(FEATURES) :].reshape(OBSERVED_ROWS, self.columns)
+        mask[:rows, :columns] = alive[:rows, :columns]
+        return observation
+
+
+class VectorBreakoutEnv:
+    """
+    Many headless games of Breakout stepped together over NumPy arrays.
+
+    Every game follows the rules of BreakoutEnv with the overlap collisions: the ball
+    moves as in `BallBody.move()`, the paddle as in `PaddleBody.steer()`, and the
+    paddle and brick collisions, lost balls and level ups are those of Simulation,
+    with the same brick tests as BallSystem. Each step is a fixed number of array
+    operations whatever the number of games.
+
+    Games that are done are started again within the same step, so the observation
+    returned for them is the first of their next episode; the info arrays hold the
+    score, lives and level they ended with. Walls are capped at OBSERVED_ROWS rows,
+    which a generated wall reaches at level 23.
+
+    Attributes:
+        count (int): The number of games.
+        floors (numpy.ndarray): The number of rows of bricks of each game.
+        columns (int): The number of columns of bricks.
+        ball_speed (float): The starting speed of the ball along each axis.
+        speed_increase (float): The ball speed added on every level up.
+        paddle_speed (float): The top speed of the paddle.
+        paddle_acceleration (float): The speed the paddle gains every tick it is steered.
+        max_steps (int): The number of steps an episode is cut off after, or None.
+        life_penalty (float): The reward taken away for every life lost.
+        ball_x, ball_y, ball_dx, ball_dy (numpy.ndarray): The ball of each game.
+        speed (numpy.ndarray): The speed of the ball of each game when it is reset, as `BallBody.speed`.
+        paddle_x, paddle_vx (numpy.ndarray): The paddle of each game.
+        walls (numpy.ndarray): The count x OBSERVED_ROWS x columns alive flags of the bricks.
+        bricks_left (numpy.ndarray): The number of bricks alive in each game.
+        score, lives, level, frame (numpy.ndarray): The progress of each game.
+        observation_size (int): The length of an observation.
+
+    Methods:
+        reset(seed): Starts every game again and returns their observations.
+        reset_games(games): Starts the selected games again.
+        step(actions): Plays one tick of every game.
+        observe(): Returns the observations of every game.
+    """
+
+    action_count = len(ACTIONS)
+
+    def __init__(
+        self,
+        count,
+        floors=START_FLOORS,
+        columns=START_COLUMNS,
+        ball_speed=BALL_SPEED,
+        speed_increase=SPEED_INCREASE,
+        paddle_speed=PADDLE_SPEED,
+        paddle_acceleration=PADDLE_ACCELERATION,
+        max_steps=None,
+        life_penalty=0.0,
+    ):
+        """
+        Initializes a VectorBreakoutEnv. Call `reset()` before the first step.
+
+        Parameters:
+            count (int): The number of games.
+            floors (int): The number of rows of bricks at level 1.
+            columns (int): The number of columns of bricks.
+            ball_speed (float): The starting speed of the ball along each axis.
+            speed_increase (float): The ball speed added on every level up.
+            paddle_speed (float): The top speed of the paddle.
+            paddle_acceleration (float): The speed the paddle gains every tick it is steered.
+            max_steps (int, optional): The number of steps an episode is cut off after.
+            life_penalty (float): The reward taken away for every life lost.
+        """
+        self.count = count
+        self.start_floors = min(floors, OBSERVED_ROWS)
+        self.columns = columns
+        self.ball_speed = ball_speed
+        self.speed_increase = speed_increase
+        self.paddle_speed = paddle_speed
+        self.paddle_acceleration = paddle_acceleration
+        self.max_steps = max_steps
+        self.life_penalty = life_penalty
+        self.observation_size = len(FEATURES) + OBSERVED_ROWS * columns
+        self.directions = np.array(ACTIONS, dtype=np.float64)
+        self.games = np.arange(count)
+
+        self.ball_x = np.zeros(count)
+        self.ball_y = np.zeros(count)
+        self.ball_dx = np.zeros(count)
+        self.ball_dy = np.zeros(count)
+        self.speed = np.zeros(count)
+        self.paddle_x = np.zeros(count)
+        self.paddle_vx = np.zeros(count)
+        self.walls = np.zeros((count, OBSERVED_ROWS, columns), dtype=bool)
+        self.bricks_left = np.zeros(count, dtype=np.int64)
+        self.floors = np.zeros(count, dtype=np.int64)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.lives = np.zeros(count, dtype=np.int64)
+        self.level = np.zeros(count, dtype=np.int64)
+        self.frame = np.zeros(count, dtype=np.int64)
+        self.reset_games(np.ones(count, dtype=bool))
+
+    def reset(self, seed=None):
+        """
+        Starts every game again from level 1.
+
+        Parameters:
+            seed (int, optional): Accepted for compatibility with BreakoutEnv. The rules
+                have no randomness, and brick colors are not part of the observation.
+
+        Returns:
+            numpy.ndarray: The count x observation_size first observations.
+        """
+        self.reset_games(np.ones(self.count, dtype=bool))
+        return self.observe()
+
+    def reset_games(self, games):
+        """
+        Starts the selected games again from level 1.
+
+        Parameters:
+            games (numpy.ndarray): A boolean mask of the games to start again.
+        """
+        self.floors[games] = self.start_floors
+        self.score[games] = 0
+        self.lives[games] = START_LIVES
+        self.level[games] = 1
+        self.frame[games] = 0
+        self.speed[games] = self.ball_speed
+        self.reset_ball(games)
+        self.reset_paddle(games)
+        self.build_walls(games)
+
+    def reset_ball(self, games):
+        """
+        Moves the ball of the selected games back to the center, as `BallBody.reset()`.
+
+        Parameters:
+            games (numpy.ndarray): A boolean mask of the games.
+        """
+        self.ball_x[games] = 0.0
+        self.ball_y[games] = 0.0
+        self.ball_dx[games] = self.speed[games]
+        self.ball_dy[games] = -self.speed[games]
+
+    def reset_paddle(self, games):
+        """
+        Moves the paddle of the selected games back to the center, as `PaddleBody.reset()`.
+
+        Parameters:
+            games (numpy.ndarray): A boolean mask of the games.
+        """
+        self.paddle_x[games] = 0.0
+        self.paddle_vx[games] = 0.0
+
+    def build_walls(self, games):
+        """
+        Fills the wall of the selected games with `floors` full rows of bricks.
+
+        Parameters:
+            games (numpy.ndarray): A boolean mask of the games.
+        """
+        rows = np.arange(OBSERVED_ROWS)
+        floors = np.minimum(self.floors[games], OBSERVED_ROWS)
+        self.walls[games] = (rows[None, :] < floors[:, None])[:, :, None]
+        self.bricks_left[games] = floors * self.columns
+
+    def step(self, actions):
+        """
+        Plays one tick of every game.
+
+        Parameters:
+            actions (numpy.ndarray): The index in ACTIONS of each game's paddle input.
+
+        Returns:
+            tuple: The count x observation_size observations, the rewards, the done flags,
+                and an info dict of the score, lives and level arrays before any restart.
+        """
+        self.frame += 1
+        self.steer_paddles(self.directions[actions])
+        self.move_balls()
+        rewards = self.check_paddle_collisions() + self.check_brick_collisions()
+
+        # Simulation.check_ball_lost: the game is over on the tick after the last life is lost
+        over = self.lives == 0
+        lost = (self.ball_y < BALL_LOST_Y) & ~over
+        if lost.any():
+            self.lives -= lost
+            self.reset_ball(lost)
+            self.reset_paddle(lost)
+            rewards = rewards - self.life_penalty * lost
+
+        # Simulation.check_level_cleared and level_up
+        cleared = ~over & (self.bricks_left == 0)
+        if cleared.any():
+            self.level += cleared
+            self.speed[cleared] += self.speed_increase
+            self.floors += cleared & (self.level % 2 == 0)
+            self.reset_ball(cleared)
+            self.build_walls(cleared)
+
+        done = over if self.max_steps is None else over | (self.frame >= self.max_steps)
+        info = {"score": self.score.copy(), "lives": self.lives.copy(), "level": self.level.copy()}
+        if done.any():
+            self.reset_games(done)
+        return self.observe(), rewards, done, info
+
+    def steer_paddles(self, direction):
+        """
+        Moves every paddle by one tick of steering, as `PaddleBody.steer()`.
+
+        Parameters:
+            direction (numpy.ndarray): MOVE_LEFT, MOVE_RIGHT or MOVE_NONE for each game.
+        """
+        vx = np.where(self.paddle_vx * direction > 0, self.paddle_vx, 0.0) + direction * self.paddle_acceleration
+        np.clip(vx, -self.paddle_speed, self.paddle_speed, out=vx)
+        x = self.paddle_x + vx
+        blocked = (x < -PADDLE_LIMIT_X) | (x > PADDLE_LIMIT_X)
+        np.clip(x, -PADDLE_LIMIT_X, PADDLE_LIMIT_X, out=x)
+        vx[blocked] = 0.0
+        steering = direction != 0
+        self.paddle_x = np.where(steering, x, self.paddle_x)
+        self.paddle_vx = np.where(steering, vx, 0.0)
+
+    def move_balls(self):
+        """
+        Moves every ball by one tick and bounces it off the walls, as `BallBody.move()`.
+        """
+        x, y, dx, dy = self.ball_x, self.ball_y, self.ball_dx, self.ball_dy
+        x += dx
+        y += dy
+        hit = y > BALL_LIMIT_Y
+        y[hit] = BALL_LIMIT_Y
+        dy[hit] *= -1
+        hit = x > BALL_LIMIT_X
+        x[hit] = BALL_LIMIT_X
+        dx[hit] *= -1
+        hit = x < -BALL_LIMIT_X
+        x[hit] = -BALL_LIMIT_X
+        dx[hit] *= -1
+
+    def check_paddle_collisions(self):
+        """
+        Bounces every ball that overlaps its paddle, as `Simulation.check_paddle_collision()`.
+
+        Returns:
+            numpy.ndarray: The rewards so far, all 0.
+        """
+        diff = self.ball_x - self.paddle_x
+        hit = (np.abs(self.ball_y - PADDLE_Y) <= PADDLE_REACH_Y) & (np.abs(diff) < PADDLE_REACH_X)
+        if hit.any():
+            self.ball_dy[hit] *= -1
+            max_dx = self.speed[hit] * 2
+            self.ball_dx[hit] = np.clip(self.ball_dx[hit] + diff[hit] * 0.1, -max_dx, max_dx)
+        return np.zeros(self.count)
+
+    def check_brick_collisions(self):
+        """
+        Bounces every ball off the bricks it overlaps and destroys them, as
+        `Simulation.check_brick_collision()`, with the test of `ball_system.find_brick_hits()`.
+
+        Returns:
+            numpy.ndarray: The score gained in each game.
+        """
+        cells, flip_x, flip_y = find_brick_hits(self.ball_x, self.ball_y, self.walls)
+        hits = np.zeros(self.count, dtype=np.int64)
+        for hit, row_index, column_index in cells:
+            self.walls[self.games[hit], row_index[hit], column_index[hit]] = False
+            hits += hit
+        self.ball_dy[flip_y] *= -1
+        self.ball_dx[flip_x] *= -1
+        self.bricks_left -= hits
+        self.score += hits * BRICK_SCORE
+        return (hits * BRICK_SCORE).astype(np.float64)
+
+    def observe(self):
+        """
+        Returns the observations of every game, laid out as in BreakoutEnv.
+
+        Returns:
+            numpy.ndarray: The count x observation_size observations.
+        """
+        observations = np.empty((self.count, self.observation_size), dtype=np.float32)
+        observations[:, 0] = self.ball_x / BALL_LIMIT_X
+        observations[:, 1] = self.ball_y / BALL_LIMIT_Y
+        observations[:, 2] = self.ball_dx / self.speed
+        observations[:, 3] = self.ball_dy / self.speed
+        observations[:, 4] = self.paddle_x / PADDLE_LIMIT_X
+        observations[:, 5] = self.paddle_vx / self.paddle_speed
+        observations[:, 6] = self.lives / START_LIVES
+        observations[:, len(FEATURES) :] = self.walls.reshape(self.count, -1)
+        return observations
+
+
+# Step both environments with random actions and report the throughput
+if __name__ == "__main__":
+    import time
+
+    rng = np.random.default_rng(0)
+    env = BreakoutEnv(max_steps=10000)
+    env.reset(seed=0)
+    steps = 50000
+    actions = rng.integers(0, len(ACTIONS), steps)
+    start = time.perf_counter()
+    for action in actions:
+        _, _, done, _ = env.step(action)
+        if done:
+            env.reset()
+    elapsed = time.perf_counter() - start
+    print(f"BreakoutEnv: {steps / elapsed:,.0f} steps/s ({steps * 60 / elapsed / 1e6:.1f}M steps/min)")
+
+    for count in (64, 1024, 8192):
+        env = VectorBreakoutEnv(count, max_steps=10000)
+        env.reset()
+        ticks = 200
+        actions = rng.integers(0, len(ACTIONS), (ticks, count))
+        start = time.perf_counter()
+        for tick in range(ticks):
+            env.step(actions[tick])
+        elapsed = time.perf_counter() - start
+        rate = count * ticks / elapsed
+        print(f"VectorBreakoutEnv({count}): {rate:,.0f} steps/s ({rate * 60 / 1e6:.1f}M steps/min)")
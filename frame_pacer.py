@@ -0,0 +1,86 @@
+import time
+
+TICK_RATE = 120  # Physics steps per second
+FRAME_RATE = 60  # Maximum screen updates per second
+MAX_TICKS_PER_FRAME = 8  # Drop time instead of spiralling when the host falls behind
+
+
+class FramePacer:
+    """
+    Paces a fixed-timestep game loop.
+
+    Physics runs in fixed ticks of `1 / tick_rate` seconds, no matter how fast the
+    host can draw. Real time is collected in an accumulator and paid out in whole
+    ticks once per frame, and the time left over until the next frame is slept
+    away instead of spinning.
+
+    Attributes:
+        tick_rate (int): The number of physics ticks per second.
+        frame_rate (int): The maximum number of frames drawn per second.
+        max_ticks_per_frame (int): The most ticks run in a single frame.
+        tick_time (float): The duration of a tick in seconds.
+        frame_time (float): The minimum duration of a frame in seconds.
+        accumulator (float): Real time not yet simulated, in seconds.
+
+    Methods:
+        reset(): Forgets accumulated time, e.g. after a pause.
+        ticks(): Returns the number of ticks to run for the current frame.
+        wait(): Sleeps until the next frame is due.
+    """
+
+    def __init__(self, tick_rate=TICK_RATE, frame_rate=FRAME_RATE, max_ticks_per_frame=MAX_TICKS_PER_FRAME):
+        """
+        Initializes a FramePacer.
+
+        Parameters:
+        - tick_rate (int): The number of physics ticks per second.
+        - frame_rate (int): The maximum number of frames drawn per second.
+        - max_ticks_per_frame (int): The most ticks run in a single frame.
+        """
+        self.tick_rate = tick_rate
+        self.frame_rate = frame_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.tick_time = 1.0 / tick_rate
+        self.frame_time = 1.0 / frame_rate
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+        self.next_frame = self.last_time
+
+    def reset(self):
+        """
+        Forgets accumulated time so that the game does not catch up on time spent paused or in a dialog.
+        """
+        self.accumulator = 0.0
+        self.last_time = time.perf_counter()
+        self.next_frame = self.last_time
+
+    def ticks(self):
+        """
+        Adds the real time elapsed since the last call to the accumulator and pays it out in whole ticks.
+
+        Returns:
+            int: The number of physics ticks to run this frame.
+        """
+        now = time.perf_counter()
+        self.accumulator += now - self.last_time
+        self.last_time = now
+        ticks = int(self.accumulator / self.tick_time)
+        if ticks > self.max_ticks_per_frame:
+            # The host cannot keep up: slow the game down rather than stall it
+            ticks = self.max_ticks_per_frame
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.tick_time
+        return ticks
+
+    def wait(self):
+        """
+        Sleeps until the next frame is due, giving the idle time back to the OS.
+        """
+        self.next_frame += self.frame_time
+        delay = self.next_frame - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            # Running late: start counting from now instead of rushing to catch up
+            self.next_frame = time.perf_counter()
@@ -1,12 +1,30 @@
+import time
+
+STARTED = time.perf_counter()  # Taken before the other imports, for the startup timing
+
 import os
-import turtle
 import random
+
+# Only what the first frame needs is imported here: pygame is imported by the sound thread, and
+# modules used later, like the autoplay agent or the server, when they are first used
+import tkinter
+import turtle
 from paddle import Paddle
 from ball import Ball
-from brick import Brick
+from brick_wall import BrickWall
 from dashboard import Dashboard
-from timer_manager import Timer
-from sound_manager import SoundManager
+from leaderboard import Leaderboard
+from timer_manager import FrameClock
+from snapshot_buffer import SnapshotBuffer, REWIND_SECONDS
+from sound_manager import SoundManager, NullBackend
+from simulation import Simulation, MOVE_NONE
+from controls import PaddleControls
+from replay import ReplayRecorder
+from level_pack import LevelPack
+from frame_pacer import FramePacer, TICK_RATE, FRAME_RATE
+from profiler import FrameProfiler, ProfilerOverlay
+
+IMPORTED = time.perf_counter()
 
 CURRENT_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
 BALL_LOST_SOUND = os.path.join(CURRENT_DIRECTORY, "assets", "sounds", "ball_lost.wav")
@@ -14,6 +32,11 @@ BRICK_SOUND = os.path.join(CURRENT_DIRECTORY, "assets", "sounds", "brick.wav")
 GAME_OVER_SOUND = os.path.join(CURRENT_DIRECTORY, "assets", "sounds", "game_over.wav")
 LEVEL_UP_SOUND = os.path.join(CURRENT_DIRECTORY, "assets", "sounds", "levelup.wav")
 PADDLE_SOUND = os.path.join(CURRENT_DIRECTORY, "assets", "sounds", "paddle.wav")
+REPLAY_DIRECTORY = os.path.join(CURRENT_DIRECTORY, "replays")
+PROFILE_DIRECTORY = os.path.join(CURRENT_DIRECTORY, "profiles")
+BANNER_FONT = ("Courier", 24, "bold")
+BANNER_SECONDS = 1.5
+AUTOPLAY_JITTER = 25  # How far off center the autoplay agent may catch the ball
 
 
 class Game:
@@ -23,73 +46,210 @@ class Game:
     Attributes:
     - screen: The turtle screen object.
     - sound_manager: The sound manager object.
+    - simulation: The headless simulation that owns the game rules and state.
     - paddle: The paddle object.
     - ball: The ball object.
+    - leaderboard: The stored top scores, saved in the background.
     - dashboard: The dashboard object.
-    - timer: The timer object.
-    - floors: The number of floors in the game.
-    - columns: The number of columns in the game.
-    - bricks: A list of brick objects.
+    - clock: The game clock, which times the game, measures frames and runs scheduled events.
+    - pacer: The frame pacer that runs the fixed-timestep game loop.
+    - snapshots: The state of the last ticks, kept for rewinding.
+    - rewind_ticks: The number of ticks one press of the rewind or forward key moves the game by.
+    - wall: The brick wall that draws the simulation's bricks.
+    - seed: The seed of the current game.
+    - replay: The replay being played back, or None when the keyboard controls the paddle.
+    - replay_inputs: An iterator over the inputs of the replay being played back.
+    - recorder: The recorder of the current game, or None while playing back a replay.
+    - controls: The state of the steering keys, read once per tick.
+    - autoplay: The agent steering the paddle instead of the keyboard, or None.
+    - server: The server streaming the game to spectators and a remote player, or None.
+    - profiler: The frame profiler, which only times frames while profiling is on.
+    - overlay: The on-screen view of the profiler, created the first time it is shown.
+    - banner: The turtle that writes the level intro in the middle of the screen.
+    - banner_event: The scheduled event that clears the banner, or None.
     - is_running: A boolean indicating if the game is running.
     - paused: A boolean indicating if the game is paused.
+    - minimized: A boolean indicating if the game was paused because its window was minimized.
+    - root: The Tk window of the screen.
+    - wake: A Tk variable written whenever the paused loop should check its state again.
+    - startup_times: How long each startup phase took, in seconds.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        tick_rate=TICK_RATE,
+        frame_rate=FRAME_RATE,
+        seed=None,
+        replay=None,
+        profile=False,
+        audio=True,
+        startup_timing=False,
+        levels=None,
+        autoplay=False,
+        serve=None,
+    ):
         """
         Initializes the Breakout Game.
 
         This method sets up the game window, initializes the game objects,
         loads the sound manager, sets up the bricks, and sets the initial game state.
 
+        The first frame is drawn before the audio starts loading: pygame is only imported,
+        and the mixer only opened, on the sound manager's thread once the window is up.
+
         Parameters:
-            None
+            tick_rate (int): The number of physics ticks per second.
+            frame_rate (int): The maximum number of screen updates per second.
+            seed (int, optional): The seed of the first game. A random seed is used if omitted.
+            replay (ReplayPlayer, optional): A replay to play back instead of reading the keyboard.
+            profile (bool): Whether to start with profiling on. It can also be toggled with the "i" key.
+            audio (bool): Whether to play sounds. Sounds are loaded in the background either way.
+            startup_timing (bool): Whether to print how long each startup phase took.
+            levels (str, optional): The file of a level pack to play. Walls are generated if omitted.
+            autoplay (bool): Whether the game plays itself. It can also be toggled with the "a" key.
+            serve (int, optional): The port to stream the game on, see `game_server.ServerThread`.
+                The game is not streamed if omitted.
 
         Returns:
             None
         """
+        self.startup_times = {"import": IMPORTED - STARTED}
+        phase_start = time.perf_counter()
+
         self.screen = turtle.Screen()
         self.screen.title("Breakout Game")
         self.screen.bgcolor("black")
         self.screen.setup(width=800, height=600)
         self.screen.tracer(0)  # Turn off automatic screen updates
+        self.root = self.screen.getcanvas().winfo_toplevel()
+        self.wake = tkinter.BooleanVar(master=self.root)
+        self.root.bind("<Unmap>", self.on_unmap, add="+")
+        self.root.bind("<Map>", self.on_map, add="+")
+        phase_start = self.record_startup("screen", phase_start)
+
+        # Sounds load on a background thread, started after the first frame, so the window doesn't wait
+        self.sound_manager = SoundManager(None if audio else NullBackend(), start=False)
+
+        self.sound_manager.register_sound("ball_lost", BALL_LOST_SOUND)
+        self.sound_manager.register_sound("brick", BRICK_SOUND)
+        self.sound_manager.register_sound("game_over", GAME_OVER_SOUND)
+        self.sound_manager.register_sound("level_up", LEVEL_UP_SOUND)
+        self.sound_manager.register_sound("paddle", PADDLE_SOUND)
+
+        self.replay = replay
+        self.replay_inputs = None
+        self.recorder = None
+        self.controls = PaddleControls()
+        if replay is not None:
+            self.seed = replay.seed
+            self.simulation = replay.create_simulation()
+            self.replay_inputs = replay.inputs()
+        else:
+            self.seed = seed if seed is not None else random.randrange(2**31)
+            self.simulation = Simulation(
+                seed=self.seed,
+                screen_height=self.screen.window_height(),
+                levels=LevelPack.load(levels) if levels else None,
+            )
+            self.recorder = ReplayRecorder.for_simulation(self.seed, self.simulation)
+
+        self.autoplay = None
+        if autoplay and replay is None:
+            self.toggle_autoplay()
+
+        self.server = None
+        if serve is not None:
+            from game_server import ServerThread
+
+            self.server = ServerThread(self.simulation)
+            print(f"Streaming the game on port {self.server.start(port=serve)}")
+
+        self.paddle = Paddle(self.screen.window_height(), self.simulation.paddle)
+        self.ball = Ball(self.simulation.ball)
+        self.leaderboard = Leaderboard()
+        self.dashboard = Dashboard(self.leaderboard)
+        self.clock = FrameClock()
+        self.pacer = FramePacer(tick_rate, frame_rate)
+        self.snapshots = SnapshotBuffer(self.simulation, REWIND_SECONDS * tick_rate, self.clock)
+        self.rewind_ticks = tick_rate
+        self.profiler = FrameProfiler(1000 / frame_rate)
+        self.overlay = None
+        self.banner = turtle.Turtle()
+        self.banner.speed(0)
+        self.banner.color("white")
+        self.banner.penup()
+        self.banner.hideturtle()
+        self.banner.goto(0, -80)
+        self.banner_event = None
+        phase_start = self.record_startup("assets", phase_start)
+
+        self.wall = BrickWall()
+        self.setup_bricks()
+        phase_start = self.record_startup("bricks", phase_start)
 
-        self.sound_manager = SoundManager()
+        self.is_running = True
+        self.paused = False
+        self.minimized = False
 
-        self.sound_manager.load_sound("ball_lost", BALL_LOST_SOUND)
-        self.sound_manager.load_sound("brick", BRICK_SOUND)
-        self.sound_manager.load_sound("game_over", GAME_OVER_SOUND)
-        self.sound_manager.load_sound("level_up", LEVEL_UP_SOUND)
-        self.sound_manager.load_sound("paddle", PADDLE_SOUND)
+        self.clock.start()
+        self.show_banner(f"Level {self.dashboard.get_level()}")
 
-        self.paddle = Paddle(self.screen.window_height())
-        self.ball = Ball()
-        self.dashboard = Dashboard()
-        self.timer = Timer(self.dashboard.update_time)
+        if profile:
+            self.toggle_profiling()
 
-        self.floors = 5
-        self.columns = 16
+        self.bind_keys()
 
-        self.bricks = []
-        self.setup_bricks()
+        self.screen.update()  # Show the first frame
+        self.record_startup("first frame", phase_start)
+        self.sound_manager.start()
+        if startup_timing:
+            self.print_startup_times()
 
-        self.is_running = True
-        self.paused = False
+    def record_startup(self, phase, phase_start):
+        """
+        Records how long a startup phase took.
+
+        Parameters:
+            phase (str): The name of the phase.
+            phase_start (float): When the phase started, from time.perf_counter().
 
-        self.timer.start()
+        Returns:
+            float: When the phase ended, which is when the next phase starts.
+        """
+        now = time.perf_counter()
+        self.startup_times[phase] = now - phase_start
+        return now
+
+    def print_startup_times(self):
+        """
+        Prints how long each startup phase took, from the first import to the first frame.
+        """
+        for phase, seconds in self.startup_times.items():
+            print(f"{phase:12} {seconds * 1000:8.1f} ms")
+        print(f"{'total':12} {sum(self.startup_times.values()) * 1000:8.1f} ms")
 
+    def bind_keys(self):
+        """
+        Binds the keys for controlling the paddle, the game and the profiler.
+        """
         self.screen.listen()
-        self.screen.onkeypress(self.paddle.move_left, "Left")
-        self.screen.onkeypress(self.paddle.move_right, "Right")
+        self.controls.bind(self.screen)
         self.screen.onkeypress(self.pause_game, "p")
         self.screen.onkeypress(self.restart_game, "r")
         self.screen.onkeypress(self.exit_game, "q")
+        self.screen.onkeypress(self.toggle_profiling, "i")
+        self.screen.onkeypress(self.toggle_overlay, "o")
+        self.screen.onkeypress(self.dump_profile, "d")
+        self.screen.onkeypress(self.toggle_autoplay, "a")
+        self.screen.onkeypress(self.rewind, "b")
+        self.screen.onkeypress(self.forward, "f")
 
     def setup_bricks(self):
         """
         Set up the bricks for the Breakout game.
 
-        This method generates a list of random colors and creates Brick objects
-        with the corresponding colors at specific positions on the screen.
+        This method draws every brick in the simulation's brick grid on the brick wall,
+        with the brick's color and position.
 
         Parameters:
         - self: The Game object.
@@ -97,15 +257,9 @@ class Game:
         Returns:
         - None
         """
-        # Generate a list of random colors
-        colors = [
-            "#" + "".join([random.choice("0123456789ABCDEF") for j in range(6)])
-            for _ in range(self.floors)
-        ]
-        for y in range(self.floors):
-            for x in range(self.columns):
-                brick = Brick(colors[y], -380 + (x * 50), 250 - (y * 30))
-                self.bricks.append(brick)
+        bricks = self.simulation.bricks
+        for index in bricks:
+            self.wall.draw(bricks, index)
 
     def setup_game(self):
         """
@@ -113,202 +267,370 @@ class Game:
         Also rebinds the keys for controlling the paddle and game actions.
         """
         # Reset paddle and ball positions without clearing the screen
+        if self.replay is not None:
+            # Play the replay again from the start
+            self.replay_inputs = self.replay.inputs()
+        else:
+            self.save_replay()
+            self.seed = random.randrange(2**31)
+            self.recorder = ReplayRecorder.for_simulation(self.seed, self.simulation)
+        self.controls.release_all()
+        self.simulation.reset(self.seed)
+        self.snapshots.clear()
         self.reset_bricks()
-        self.paddle.reset()
-        self.ball.reset()
+        self.paddle.sync()
+        self.ball.sync()
         self.dashboard.reset()
         # Rebind keys in case they were cleared
-        self.screen.listen()
-        self.screen.onkeypress(self.paddle.move_left, "Left")
-        self.screen.onkeypress(self.paddle.move_right, "Right")
-        self.screen.onkeypress(self.pause_game, "p")
-        self.screen.onkeypress(self.restart_game, "r")
-        self.screen.onkeypress(self.exit_game, "q")
+        self.bind_keys()
 
     def reset_bricks(self):
         """
-        Resets the bricks in the game by destroying all existing bricks and setting up new ones.
+        Resets the bricks in the game by erasing all existing bricks and drawing the simulation's
+        current wall.
         """
-        for brick in self.bricks:
-            brick.destroy()
-        self.bricks.clear()
+        self.wall.clear()
         self.setup_bricks()
 
     def play(self):
         """
         Starts the game and runs the game loop until the game is over or the player chooses to exit.
-        The game loop updates the screen, moves the ball, checks for collisions, updates the timer display,
+        The game loop updates the screen, moves the ball, checks for collisions, updates the time display,
         checks if the game is over, and checks if the game is won. It also handles pausing the game and
         restarting the game after it's over.
 
+        The simulation advances in fixed ticks paid out by the frame pacer, so the ball moves at the same
+        speed on every host, and the loop sleeps between frames instead of spinning. While the game is
+        paused or minimized the loop blocks on Tk events instead, see `wait_while_paused()`, and the
+        game-over prompt is a modal dialog that blocks the same way.
+
         Parameters:
             None
 
         Returns:
             None
         """
+        self.pacer.reset()
         while self.is_running:
-            if not self.paused:
-                self.screen.update()
-                self.ball.move()
-                self.check_collisions()
-                self.timer.update_display()
-                if self.is_game_over():
+            if self.paused:
+                self.wait_while_paused()
+                continue
+            self.profiler.begin_frame()
+            if not self.run_frame(self.pacer.ticks()):
+                if self.replay is not None:
+                    print("Replay finished.")
+                    self.exit_game()
+                else:
                     self.dashboard.update_high_score()
                     self.prompt_restart_game()
-                    break
-                self.is_game_won()
+                break
 
+            if self.overlay is not None:
+                self.overlay.update()
             self.screen.update()
+            self.profiler.end_frame()
 
             # This condition helps exit the loop cleanly if the game is no longer running
             if not self.is_running:
                 break
 
-    def check_collisions(self):
+            self.pacer.wait()
+
+    def wait_while_paused(self):
         """
-        Checks for collisions between the ball and other game objects.
+        Blocks until the game is resumed or quit, handling Tk events in the meantime.
 
-        This method checks for collision between the ball and the paddle, as well as
-        collision between the ball and the bricks. It calls the respective collision
-        checking methods to handle the collisions.
+        Tk's event loop runs inside `wait_variable` until an event handler writes to `wake`,
+        so no CPU is used and nothing is redrawn while the game sits paused. The screen is
+        only updated when the game is paused and after each wake-up.
+        """
+        while self.paused and self.is_running:
+            self.screen.update()
+            self.root.wait_variable(self.wake)
+
+    def wake_up(self):
+        """
+        Makes `wait_while_paused()` check whether the game is still paused.
+        """
+        self.wake.set(not self.wake.get())
+
+    def on_unmap(self, event):
+        """
+        Pauses the game when its window is minimized.
 
         Parameters:
-            None
+            event (tkinter.Event): The Unmap event.
+        """
+        if event.widget is self.root and not self.paused:
+            self.minimized = True
+            self.pause_game()
 
-        Returns:
-            None
+    def on_map(self, event):
         """
-        # Check collision with paddle
-        self.check_paddle_collision()
+        Resumes the game when its window is restored, if it was paused by being minimized.
 
-        # Check collision with bricks
-        self.check_brick_collision()
+        Parameters:
+            event (tkinter.Event): The Map event.
+        """
+        if event.widget is self.root and self.minimized:
+            self.minimized = False
+            self.pause_game()
 
-    def check_paddle_collision(self):
+    def run_frame(self, ticks):
         """
-        Check if the ball collides with the paddle and perform necessary actions.
+        Runs one frame of the game: advances the simulation by the given number of ticks,
+        then moves the ball and paddle turtles, ticks the clock, which fires the scheduled
+        events that are due, updates the time display and plays the sounds queued during the frame.
+        When the game is streamed, its state is published to the clients once per frame.
 
-        This method checks if the ball's y-coordinate is within a certain range of the paddle's y-coordinate,
-        and if the absolute difference between the ball's x-coordinate and the paddle's x-coordinate is less than 50.
-        If the conditions are met, the ball's vertical direction is inverted, and its x direction is adjusted based on
-        the difference in x position between the ball and the paddle. Additionally, a sound effect is played.
+        The screen itself is not updated.
 
         Parameters:
-            None
+            ticks (int): The number of physics ticks to run.
 
         Returns:
-            None
+            bool: False if the game is over or the replay being played back has ended, True otherwise.
+        """
+        running = True
+        for _ in range(ticks):
+            inputs = self.next_input()
+            if inputs is None:
+                running = False
+                break
+            self.handle_events(self.simulation.step(inputs))
+            self.snapshots.save()
+            if self.simulation.game_over:
+                running = False
+                break
+        self.ball.sync()
+        self.paddle.sync()
+        if self.server is not None:
+            self.server.publish()
+        self.clock.tick()
+        self.dashboard.update_time(self.clock.time)
+        self.sound_manager.flush()
+        return running
+
+    def next_input(self):
         """
-        paddle_center_x = self.paddle.get_x()  # Get the paddle"s center x-coordinate
-        ball_center_x = self.ball.get_x()  # Get the ball"s center x-coordinate
+        Returns the paddle input for the next tick.
 
-        if (
-            abs(self.ball.get_y() - self.paddle.get_y()) <= 20
-            and abs(ball_center_x - paddle_center_x) < 50
-        ):
-            self.ball.invert_dy()  # Invert ball"s vertical direction
-            # Calculate the difference in x position between ball and paddle
-            diff = ball_center_x - paddle_center_x
-            # Adjust the ball"s x direction based on the difference
-            self.ball.adjust_dx(diff)
-            self.sound_manager.play_sound("paddle")
+        While playing back a replay the input comes from the replay. Otherwise it is the
+        autoplay agent's input, or the arrow key held down. When the game is streamed, a
+        remote player steers alongside: their input is used whenever the local one is
+        MOVE_NONE. The input is also recorded, so that the game can be replayed tick for tick;
+        after a rewind, the inputs recorded past the point the game carries on from are dropped first.
+
+        Returns:
+            int: MOVE_NONE, MOVE_LEFT or MOVE_RIGHT, or None when the replay has ended.
+        """
+        if self.replay is not None:
+            return next(self.replay_inputs, None)
+        inputs = self.autoplay.act() if self.autoplay is not None else self.controls.direction()
+        if inputs == MOVE_NONE and self.server is not None:
+            inputs = self.server.remote_input()
+        if self.recorder.frames > self.simulation.frame:
+            self.recorder.truncate(self.simulation.frame)
+        self.recorder.record(inputs)
+        return inputs
+
+    def rewind(self):
+        """
+        Takes the game back by `rewind_ticks` ticks, or as far back as the snapshots go.
+
+        The whole game state, and the game clock, are restored from the snapshot buffer.
+        The later snapshots and recorded inputs are kept, so `forward()` can go back to
+        them, until the game carries on from the rewound point. Nothing happens while
+        playing back a replay.
+        """
+        if self.replay is None and self.snapshots.rewind(self.rewind_ticks):
+            self.show_seek()
 
-    def check_brick_collision(self):
+    def forward(self):
         """
-        Checks for collision between the ball and the bricks.
-        If a collision is detected, it determines whether it's a horizontal or vertical collision
-        and updates the ball's direction accordingly. It also removes the collided brick,
-        plays a sound, and updates the score.
+        Undoes a rewind by `rewind_ticks` ticks, or up to the newest snapshot.
+
+        Nothing happens unless the game was rewound and hasn't carried on since.
+        """
+        if self.replay is None and self.snapshots.forward(self.rewind_ticks):
+            self.show_seek()
+
+    def show_seek(self):
+        """
+        Brings the display in line with the game after it was rewound or forwarded.
+        """
+        simulation = self.simulation
+        self.reset_bricks()
+        self.ball.sync()
+        self.paddle.sync()
+        self.dashboard.set_score(simulation.score)
+        self.dashboard.set_lives(simulation.lives)
+        self.dashboard.set_level(simulation.level)
+        self.dashboard.update_time(self.clock.time)
+        if self.server is not None:
+            self.server.publish()
+        self.pacer.reset()  # Don't catch up on the time spent seeking
+        self.wake_up()  # Show the rewound game if it is paused
+
+    def save_replay(self):
+        """
+        Saves the current game to a replay file in the replays directory, named after its date and seed.
+
+        The replay ends where the game is, so the inputs kept after a rewind for going forward again are left out.
+        Nothing is saved while playing back a replay, or if no tick was played.
+        """
+        if self.recorder is None:
+            return
+        self.recorder.truncate(self.simulation.frame)
+        if self.recorder.frames == 0:
+            return
+        os.makedirs(REPLAY_DIRECTORY, exist_ok=True)
+        name = f"replay-{time.strftime('%Y%m%d-%H%M%S')}-{self.seed}.brk"
+        self.recorder.save(os.path.join(REPLAY_DIRECTORY, name))
+
+    def handle_events(self, events):
+        """
+        Updates the display, dashboard and sounds for the events reported by the simulation.
 
         Parameters:
-            None
+            events (list): The `(name, payload)` events returned by the simulation.
 
         Returns:
             None
         """
-        for brick in self.bricks:
-            if (
-                abs(self.ball.get_y() - brick.ycor()) < 20
-                and abs(self.ball.get_x() - brick.xcor()) < 50
-            ):
-                # Determine if the collision is more likely horizontal or vertical
-                # This simplification assumes that if the ball"s center is vertically aligned within the brick"s bounds,
-                # the collision is vertical; otherwise, it"s horizontal.
-                if abs(self.ball.get_x() - brick.xcor()) < 25:
-                    self.ball.invert_dy()  # Vertical collision
-                else:
-                    self.ball.invert_dx()  # Horizontal collision
+        for name, payload in events:
+            if name == "paddle":
+                self.sound_manager.queue_sound("paddle")
+            elif name == "brick":
+                self.wall.erase(payload)  # Remove the brick
+                self.sound_manager.queue_sound("brick")
+                self.dashboard.set_score(self.simulation.score)  # Update the score
+            elif name == "ball_lost":
+                self.dashboard.lose_life()
+                self.sound_manager.queue_sound("ball_lost")
+                self.ball.sync()
+                self.paddle.sync()
+            elif name == "game_over":
+                self.sound_manager.queue_sound("game_over")
+                print("Game Over!")
+            elif name == "level_up":
+                print(f"You beat level {self.dashboard.get_level()}!")
+                self.dashboard.next_level()  # Increase the level
+                self.sound_manager.queue_sound("level_up")
+                self.ball.sync()
+                self.reset_bricks()
+                self.show_banner(f"Level {self.dashboard.get_level()}")
+
+    def show_banner(self, text, seconds=BANNER_SECONDS):
+        """
+        Writes a message in the middle of the screen and schedules it to be cleared.
 
-                brick.destroy()  # Remove the brick
-                self.bricks.remove(brick)
-                self.sound_manager.play_sound("brick")
-                self.dashboard.update_score(10)  # Update the score
+        The banner is cleared on the game clock, so it stays up while the game is paused.
 
-    def is_game_over(self):
+        Parameters:
+            text (str): The message to show.
+            seconds (float): How long to show it, in seconds of game time.
         """
-        Checks if the game is over.
+        if self.banner_event is not None:
+            self.clock.cancel(self.banner_event)
+        self.banner.clear()
+        self.banner.write(text, align="center", font=BANNER_FONT)
+        self.banner_event = self.clock.schedule(seconds, self.clear_banner)
 
-        Returns:
-            bool: True if the game is over, False otherwise.
-        """
-        if self.ball.get_y() < -290 and self.dashboard.get_lives() > 0:
-            self.dashboard.lose_life()
-            self.sound_manager.play_sound("ball_lost")
-            self.ball.reset()
-            self.paddle.reset()
-        elif self.dashboard.get_lives() == 0:
-            self.sound_manager.play_sound("game_over")
-            print("Game Over!")
-            return True
-        return False
-
-    def is_game_won(self):
-        """
-        Checks if the game is won by determining if there are no more bricks left.
-        If the game is won, it prints the level that was beaten, levels up the game,
-        plays a sound effect, resets the ball, and resets the bricks.
-        """
-        if len(self.bricks) == 0:
-            print(f"You beat level {self.dashboard.get_level()}!")
-            self.level_up()
-            self.sound_manager.play_sound("level_up")
-            self.ball.reset()
-            self.reset_bricks()
-
-    def level_up(self):
-        """
-        Increases the level, ball speed, and number of floors (every 2 levels).
-        """
-        self.dashboard.next_level()  # Increase the level
-        speed_increase = 0.5
-        self.ball.increase_speed(speed_increase)  # Increase the ball speed
-        # every 2 levels, increase the number of floors by 1
-        if self.dashboard.get_level() % 2 == 0:
-            self.floors += 1
+    def clear_banner(self):
+        """
+        Clears the banner written by `show_banner()`.
+        """
+        self.banner.clear()
+        self.banner_event = None
+
+    def toggle_autoplay(self):
+        """
+        Hands the paddle over to the autoplay agent, or back to the keyboard.
+
+        Nothing changes while playing back a replay.
+        """
+        if self.replay is not None:
+            return
+        if self.autoplay is None:
+            from autoplay import AutoplayAgent
+
+            self.autoplay = AutoplayAgent(self.simulation, jitter=AUTOPLAY_JITTER)
+        else:
+            self.autoplay = None
+        self.controls.release_all()
+
+    def toggle_profiling(self):
+        """
+        Turns the frame profiler on or off.
+
+        While it is on, the simulation step, event handling, sound calls, turtle syncs,
+        clock, dashboard and screen updates are timed every frame.
+        """
+        if self.profiler.enabled:
+            self.profiler.uninstrument()
+        else:
+            self.profiler.instrument(
+                [
+                    ("simulation", self.simulation, "step"),
+                    ("snapshots", self.snapshots, "save"),
+                    ("events", self, "handle_events"),
+                    ("sound", self.sound_manager, "flush"),
+                    ("sync", self.ball, "sync"),
+                    ("sync", self.paddle, "sync"),
+                    ("clock", self.clock, "tick"),
+                    ("dashboard", self.dashboard, "update_time"),
+                    ("screen", self.screen, "update"),
+                ]
+            )
+
+    def toggle_overlay(self):
+        """
+        Shows or hides the profiler overlay.
+        """
+        if self.overlay is None:
+            self.overlay = ProfilerOverlay(self.profiler, self.clock)
+        self.overlay.toggle()
+
+    def dump_profile(self):
+        """
+        Writes the profiler's percentiles and samples to a JSON file in the profiles directory.
+        """
+        os.makedirs(PROFILE_DIRECTORY, exist_ok=True)
+        path = os.path.join(PROFILE_DIRECTORY, f"profile-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        self.profiler.dump(path)
+        print(f"Profile saved to {path}")
 
     def pause_game(self):
         """
         Pauses or resumes the game.
 
-        If the game is currently paused, this method resumes the game by starting the timer.
-        If the game is currently running, this method pauses the game by pausing the timer.
+        If the game is currently paused, this method resumes the game by starting the clock.
+        If the game is currently running, this method pauses the game by pausing the clock,
+        which also holds back the events scheduled on it.
 
         """
         self.paused = not self.paused
         if self.paused:
-            self.timer.pause()  # Pause the timer
+            self.clock.pause()  # Pause the clock and its scheduled events
         else:
-            self.timer.start()  # Resume the timer
+            self.minimized = False
+            self.clock.start()  # Resume the clock
+            self.pacer.reset()  # Don't catch up on the time spent paused
+        self.wake_up()
 
     def restart_game(self):
         """
-        Restarts the game by resetting the timer, re-setting up game elements without clearing the screen,
+        Restarts the game by resetting the clock, re-setting up game elements without clearing the screen,
         and restarting the game loop.
         """
-        self.timer.reset()  # Reset the timer
+        self.clock.reset()  # Reset the clock and cancel the scheduled events
         self.setup_game()  # Re-setup game elements without clearing the screen
-        self.timer.start()
+        self.paused = False
+        self.minimized = False
+        self.clock.start()
+        self.show_banner(f"Level {self.dashboard.get_level()}")
+        self.wake_up()
         self.play()  # Restart the game loop
 
     def prompt_restart_game(self):
@@ -320,9 +642,8 @@ class Game:
         If the user chooses to exit the game, the `exit_game` method is called.
         """
         # Prompt the user
-        restart = self.screen.textinput(
-            "Game Over", "Start a new game? (yes/no)"
-        ).lower()
+        # The dialog is modal: Tk blocks on its events until it is answered
+        restart = (self.screen.textinput("Game Over", "Start a new game? (yes/no)") or "").lower()
         if restart == "yes":
             self.restart_game()
         else:
@@ -330,13 +651,50 @@ class Game:
 
     def exit_game(self):
         """
-        Exits the game by updating the high score and setting the `is_running` flag to False.
+        Exits the game by updating the high score, saving the replay and setting the `is_running` flag to False.
+        Waits for the leaderboard to finish saving, so that no score is lost when the program ends, and
+        disconnects the clients of the stream, if any.
         """
-        self.dashboard.update_high_score()
+        if self.replay is None:
+            self.dashboard.update_high_score()
+            self.save_replay()
+            self.recorder = None  # Don't save the same game twice
+        self.leaderboard.flush()
+        if self.server is not None:
+            self.server.close()
+            self.server = None
         self.is_running = False
+        self.wake_up()  # Stop waiting if the game was paused
 
 
 # Initialize and run the game
 if __name__ == "__main__":
-    game = Game()
+    import argparse
+
+    from game_server import PORT
+    from level_pack import CLASSIC_PACK
+
+    parser = argparse.ArgumentParser(description="Play Breakout.")
+    parser.add_argument("--startup-timing", action="store_true", help="print how long each startup phase took")
+    parser.add_argument("--no-audio", action="store_true", help="play without sound")
+    parser.add_argument(
+        "--levels", nargs="?", const=CLASSIC_PACK, help="play a compiled level pack (the classic pack if no file is given)"
+    )
+    parser.add_argument("--autoplay", action="store_true", help="let the game play itself (toggle with the 'a' key)")
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        type=int,
+        const=PORT,
+        help=f"stream the game to spectators and a remote player (on port {PORT} if no port is given)",
+    )
+    args = parser.parse_args()
+
+    game = Game(
+        audio=not args.no_audio,
+        startup_timing=args.startup_timing,
+        levels=args.levels,
+        autoplay=args.autoplay,
+        serve=args.serve,
+    )
     game.play()
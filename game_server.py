@@ -0,0 +1,877 @@
+import argparse
+import asyncio
+import struct
+import threading
+from collections import namedtuple
+
+from autoplay import AutoplayAgent
+from brick_grid import BrickGrid
+from simulation import MOVE_LEFT, MOVE_NONE, MOVE_RIGHT, BallBody, PaddleBody, Simulation
+
+HOST = "127.0.0.1"
+PORT = 47800
+TICK_RATE = 120
+
+# Every message is its length followed by its bytes, which start with the message type
+LENGTH = struct.Struct("<H")
+HELLO = 1  # client -> server: the role the client asks for
+WELCOME = 2  # server -> client: the role the client was given
+KEYFRAME = 3  # server -> client: the whole game state
+DELTA = 4  # server -> client: what changed since the previous snapshot
+INPUT = 5  # client -> server: the direction the remote player steers the paddle in
+
+SPECTATOR = 0
+PLAYER = 1
+
+# type, role
+ROLE_MESSAGE = struct.Struct("<BB")
+# type, direction
+INPUT_MESSAGE = struct.Struct("<Bb")
+# type, tick, ball x, y, dx, dy, paddle x, score, lives, level, rows, columns, then the bit-packed alive mask
+KEYFRAME_HEADER = struct.Struct("<BIfffffIBHHH")
+# type, tick, changed fields, then the changed fields in the order below
+DELTA_HEADER = struct.Struct("<BIB")
+BALL_POSITION = 1  # ball x, y
+BALL_VELOCITY = 2  # ball dx, dy
+PADDLE = 4  # paddle x
+SCORE = 8  # score
+LIVES = 16  # lives
+LEVEL = 32  # level
+BRICKS = 64  # number of cells flipped, then their indices
+TWO_FLOATS = struct.Struct("<ff")
+FLOAT = struct.Struct("<f")
+UINT = struct.Struct("<I")
+UBYTE = struct.Struct("<B")
+USHORT = struct.Struct("<H")
+
+# A wall with more flipped cells than this is sent as a keyframe
+MAX_DELTA_CELLS = 32
+# A client with more unsent bytes than this stops getting deltas until it catches up with a keyframe
+MAX_BUFFERED = 64 * 1024
+
+# Bit-packing of the alive flags, one ASCII digit per cell on the way
+TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+# The state sent to clients, taken once per tick
+Snapshot = namedtuple(
+    "Snapshot",
+    "tick ball_x ball_y ball_dx ball_dy paddle_x score lives level rows columns alive version",
+)
+
+
+def take_snapshot(simulation, tick):
+    """
+    Takes the state of a simulation that clients are sent.
+
+    The positions and velocities are rounded to the float32 they are sent as, so that
+    a change is only reported when a client would see it.
+
+    Parameters:
+        simulation (Simulation): The simulation.
+        tick (int): The number of ticks the server has run.
+
+    Returns:
+        Snapshot: The state.
+    """
+    ball = simulation.ball
+    bricks = simulation.bricks
+    ball_x, ball_y = TWO_FLOATS.unpack(TWO_FLOATS.pack(ball.x, ball.y))
+    ball_dx, ball_dy = TWO_FLOATS.unpack(TWO_FLOATS.pack(ball.dx, ball.dy))
+    (paddle_x,) = FLOAT.unpack(FLOAT.pack(simulation.paddle.x))
+    return Snapshot(
+        tick,
+        ball_x,
+        ball_y,
+        ball_dx,
+        ball_dy,
+        paddle_x,
+        simulation.score,
+        simulation.lives,
+        simulation.level,
+        bricks.rows,
+        bricks.columns,
+        bytes(bricks.alive),
+        bricks.version,
+    )
+
+
+def frame_message(payload):
+    """
+    Prefixes a message with its length.
+
+    Parameters:
+        payload (bytes): The message.
+
+    Returns:
+        bytes: The framed message.
+    """
+    return LENGTH.pack(len(payload)) + payload
+
+
+def pack_mask(alive):
+    """
+    Packs alive flags, one byte per cell, into one bit per cell.
+
+    Parameters:
+        alive (bytes): The flags, 0 or 1.
+
+    Returns:
+        bytes: The packed flags, first cell in the highest bit.
+    """
+    if not alive:
+        return b""
+    return int(alive.translate(TO_DIGITS), 2).to_bytes((len(alive) + 7) // 8, "big")
+
+
+def unpack_mask(data, cells):
+    """
+    Unpacks alive flags packed by `pack_mask()`.
+
+    Parameters:
+        data (bytes): The packed flags.
+        cells (int): The number of cells.
+
+    Returns:
+        bytes: The flags, one byte per cell.
+    """
+    if not cells:
+        return b""
+    return format(int.from_bytes(data, "big"), f"0{cells}b").encode("ascii").translate(FROM_DIGITS)
+
+
+def encode_keyframe(snapshot):
+    """
+    Encodes a whole game state.
+
+    Parameters:
+        snapshot (Snapshot): The state.
+
+    Returns:
+        bytes: The framed KEYFRAME message.
+    """
+    header = KEYFRAME_HEADER.pack(
+        KEYFRAME,
+        snapshot.tick,
+        snapshot.ball_x,
+        snapshot.ball_y,
+        snapshot.ball_dx,
+        snapshot.ball_dy,
+        snapshot.paddle_x,
+        snapshot.score,
+        snapshot.lives,
+        snapshot.level,
+        snapshot.rows,
+        snapshot.columns,
+    )
+    return frame_message(header + pack_mask(snapshot.alive))
+
+
+def encode_delta(previous, snapshot):
+    """
+    Encodes what changed from one game state to the next.
+
+    Only the fields that changed are sent, and the bricks as the indices of the cells
+    whose flag flipped, so a typical tick of a moving ball takes 16 bytes.
+
+    Parameters:
+        previous (Snapshot): The state the client has.
+        snapshot (Snapshot): The new state.
+
+    Returns:
+        bytes: The framed DELTA message, or None if the wall changed too much and a
+            keyframe should be sent instead.
+    """
+    fields = 0
+    body = []
+    if snapshot.ball_x != previous.ball_x or snapshot.ball_y != previous.ball_y:
+        fields |= BALL_POSITION
+        body.append(TWO_FLOATS.pack(snapshot.ball_x, snapshot.ball_y))
+    if snapshot.ball_dx != previous.ball_dx or snapshot.ball_dy != previous.ball_dy:
+        fields |= BALL_VELOCITY
+        body.append(TWO_FLOATS.pack(snapshot.ball_dx, snapshot.ball_dy))
+    if snapshot.paddle_x != previous.paddle_x:
+        fields |= PADDLE
+        body.append(FLOAT.pack(snapshot.paddle_x))
+    if snapshot.score != previous.score:
+        fields |= SCORE
+        body.append(UINT.pack(snapshot.score))
+    if snapshot.lives != previous.lives:
+        fields |= LIVES
+        body.append(UBYTE.pack(snapshot.lives))
+    if snapshot.level != previous.level:
+        fields |= LEVEL
+        body.append(USHORT.pack(snapshot.level))
+    if snapshot.version != previous.version:
+        if snapshot.rows != previous.rows or snapshot.columns != previous.columns:
+            return None
+        old = previous.alive
+        new = snapshot.alive
+        flipped = [index for index in range(len(new)) if new[index] != old[index]]
+        if len(flipped) > MAX_DELTA_CELLS:
+            return None
+        if flipped:
+            fields |= BRICKS
+            body.append(struct.pack(f"<H{len(flipped)}H", len(flipped), *flipped))
+    return frame_message(DELTA_HEADER.pack(DELTA, snapshot.tick, fields) + b"".join(body))
+
+
+class SnapshotDecoder:
+    """
+    The game state on the client side, rebuilt from the server's messages.
+
+    The ball, paddle and bricks are kept in the same bodies as a Simulation's, so
+    anything that reads a simulation, such as the turtle views or the autoplay agent,
+    can read a decoder instead.
+
+    Attributes:
+        role (int): SPECTATOR or PLAYER, as given by the server.
+        tick (int): The server tick of the state, or None before the first keyframe.
+        ball (BallBody): The ball.
+        paddle (PaddleBody): The paddle.
+        bricks (BrickGrid): The bricks; only the alive flags are known, not their colors.
+        score (int): The score.
+        lives (int): The number of lives left.
+        level (int): The level.
+        keyframes (int): The number of keyframes received.
+        deltas (int): The number of deltas received.
+
+    Methods:
+        apply(message): Updates the state from a message.
+    """
+
+    def __init__(self):
+        """
+        Initializes a SnapshotDecoder that has received nothing yet.
+        """
+        self.role = None
+        self.tick = None
+        self.ball = BallBody()
+        self.paddle = PaddleBody()
+        self.bricks = BrickGrid()
+        self.score = 0
+        self.lives = 0
+        self.level = 0
+        self.keyframes = 0
+        self.deltas = 0
+
+    def apply(self, message):
+        """
+        Updates the state from a server message.
+
+        Parameters:
+            message (bytes): The message, without its length.
+
+        Raises:
+            ValueError: If the message is of an unknown type, or a delta arrives before a keyframe.
+        """
+        kind = message[0]
+        if kind == WELCOME:
+            self.role = ROLE_MESSAGE.unpack(message)[1]
+        elif kind == KEYFRAME:
+            self.apply_keyframe(message)
+        elif kind == DELTA:
+            if self.tick is None:
+                raise ValueError("Delta received before the first keyframe.")
+            self.apply_delta(message)
+        else:
+            raise ValueError(f"Unknown message type {kind}.")
+
+    def apply_keyframe(self, message):
+        """
+        Replaces the whole state with a KEYFRAME message's.
+
+        Parameters:
+            message (bytes): The message.
+        """
+        (
+            _,
+            self.tick,
+            self.ball.x,
+            self.ball.y,
+            self.ball.dx,
+            self.ball.dy,
+            self.paddle.x,
+            self.score,
+            self.lives,
+            self.level,
+            rows,
+            columns,
+        ) = KEYFRAME_HEADER.unpack_from(message)
+        bricks = self.bricks
+        bricks.reset(rows, columns)
+        bricks.alive[:] = unpack_mask(message[KEYFRAME_HEADER.size :], rows * columns)
+        bricks.count = bricks.alive.count(1)
+        self.keyframes += 1
+
+    def apply_delta(self, message):
+        """
+        Applies the changes in a DELTA message.
+
+        Parameters:
+            message (bytes): The message.
+        """
+        _, self.tick, fields = DELTA_HEADER.unpack_from(message)
+        offset = DELTA_HEADER.size
+        if fields & BALL_POSITION:
+            self.ball.x, self.ball.y = TWO_FLOATS.unpack_from(message, offset)
+            offset += TWO_FLOATS.size
+        if fields & BALL_VELOCITY:
+            self.ball.dx, self.ball.dy = TWO_FLOATS.unpack_from(message, offset)
+            offset += TWO_FLOATS.size
+        if fields & PADDLE:
+            (self.paddle.x,) = FLOAT.unpack_from(message, offset)
+            offset += FLOAT.size
+        if fields & SCORE:
+            (self.score,) = UINT.unpack_from(message, offset)
+            offset += UINT.size
+        if fields & LIVES:
+            (self.lives,) = UBYTE.unpack_from(message, offset)
+            offset += UBYTE.size
+        if fields & LEVEL:
+            (self.level,) = USHORT.unpack_from(message, offset)
+            offset += USHORT.size
+        if fields & BRICKS:
+            (count,) = USHORT.unpack_from(message, offset)
+            alive = self.bricks.alive
+            for index in struct.unpack_from(f"<{count}H", message, offset + USHORT.size):
+                alive[index] ^= 1
+                self.bricks.count += 1 if alive[index] else -1
+            self.bricks.version += 1
+        self.deltas += 1
+
+
+class Connection:
+    """
+    A client connected to the GameServer.
+
+    Attributes:
+        writer (asyncio.StreamWriter): The stream to the client.
+        role (int): SPECTATOR or PLAYER.
+        needs_keyframe (bool): Whether the client must get a keyframe before the next delta.
+    """
+
+    def __init__(self, writer, role):
+        """
+        Initializes a Connection.
+
+        Parameters:
+            writer (asyncio.StreamWriter): The stream to the client.
+            role (int): SPECTATOR or PLAYER.
+        """
+        self.writer = writer
+        self.role = role
+        self.needs_keyframe = True
+
+
+class GameServer:
+    """
+    Runs a headless game and streams it to clients over TCP.
+
+    The server owns the game and advances it at a fixed tick rate on the asyncio event
+    loop. After every tick it takes a snapshot of the state and encodes it once, as a
+    delta from the previous snapshot, for all clients: a client first gets a keyframe
+    with the whole state, then one delta per tick. Writes never wait for a client; one
+    that falls behind by more than MAX_BUFFERED bytes is skipped, then sent a keyframe
+    once it has caught up, so a slow spectator can't hold back the game or the others.
+
+    One client at a time can join as the player and steer the paddle. While nobody
+    does, the autoplay agent plays, if there is one. A game run elsewhere, such as the
+    one in the game window, is streamed with ServerThread instead, which only uses the
+    server to send the states it publishes and to read the remote player's direction.
+
+    Attributes:
+        simulation (Simulation): The game.
+        tick_rate (int): The number of ticks per second.
+        autoplay (AutoplayAgent): The agent that plays while no player is connected, or None.
+        clients (set): The connected clients' Connections.
+        player (Connection): The client steering the paddle, or None.
+        direction (int): The direction the player last steered in.
+        tick (int): The number of ticks run.
+        snapshot (Snapshot): The state after the last tick.
+        server (asyncio.Server): The listening server, once started.
+        tasks (set): The tasks serving the connected clients.
+        bytes_sent (int): The number of bytes written to clients.
+
+    Methods:
+        start(host, port): Starts listening for clients.
+        run(ticks=None): Runs the game loop.
+        step(): Advances the game by one tick and sends the new state to every client.
+        publish(snapshot): Sends a new state to every client.
+        remote_input(): Returns the direction the remote player steers in.
+        close(): Disconnects every client and stops listening.
+    """
+
+    def __init__(self, simulation=None, tick_rate=TICK_RATE, autoplay=True):
+        """
+        Initializes a GameServer.
+
+        Parameters:
+            simulation (Simulation, optional): The game to run. A new game is created if omitted.
+            tick_rate (int): The number of ticks per second.
+            autoplay (bool): Whether the autoplay agent plays while no player is connected.
+        """
+        self.simulation = simulation if simulation is not None else Simulation()
+        self.tick_rate = tick_rate
+        self.autoplay = AutoplayAgent(self.simulation, jitter=25) if autoplay else None
+        self.clients = set()
+        self.player = None
+        self.direction = MOVE_NONE
+        self.tick = 0
+        self.snapshot = take_snapshot(self.simulation, self.tick)
+        self.server = None
+        self.tasks = set()
+        self.bytes_sent = 0
+
+    async def start(self, host=HOST, port=PORT):
+        """
+        Starts listening for clients.
+
+        Parameters:
+            host (str): The address to listen on.
+            port (int): The port to listen on, or 0 for any free port.
+
+        Returns:
+            int: The port listened on.
+        """
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def run(self, ticks=None):
+        """
+        Runs the game loop at the tick rate.
+
+        The loop sleeps until each tick is due. If it falls more than a few ticks
+        behind, it drops them rather than running them in a burst.
+
+        Parameters:
+            ticks (int, optional): The number of ticks to run. Runs until cancelled if omitted.
+        """
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        due = loop.time()
+        remaining = ticks
+        while remaining is None or remaining > 0:
+            self.step()
+            if remaining is not None:
+                remaining -= 1
+            due += interval
+            delay = due - loop.time()
+            if delay < -5 * interval:
+                due = loop.time()
+                delay = 0
+            await asyncio.sleep(max(delay, 0))
+
+    def step(self):
+        """
+        Advances the game by one tick and sends the new state to every client.
+
+        A game that is over starts again straight away.
+        """
+        simulation = self.simulation
+        if simulation.game_over:
+            simulation.reset()
+        if self.player is not None:
+            inputs = self.direction
+        elif self.autoplay is not None:
+            inputs = self.autoplay.act()
+        else:
+            inputs = MOVE_NONE
+        simulation.step(inputs)
+        self.publish(take_snapshot(simulation, self.tick + 1))
+
+    def publish(self, snapshot):
+        """
+        Sends a new state to every client, as a delta from the previous one, or as a
+        keyframe when the wall changed too much for a delta.
+
+        Parameters:
+            snapshot (Snapshot): The new state, see `take_snapshot()`.
+        """
+        previous = self.snapshot
+        self.tick = snapshot.tick
+        self.snapshot = snapshot
+        delta = encode_delta(previous, snapshot)
+        if delta is None:
+            for client in self.clients:
+                client.needs_keyframe = True
+        self.broadcast(delta)
+
+    def remote_input(self):
+        """
+        Returns the direction the remote player steers the paddle in.
+
+        Returns:
+            int: MOVE_LEFT, MOVE_RIGHT, or MOVE_NONE if nobody is playing.
+        """
+        return self.direction if self.player is not None else MOVE_NONE
+
+    def broadcast(self, delta):
+        """
+        Sends the current state to every client: the delta to those up to date, and a
+        keyframe to those that need one and aren't behind.
+
+        Parameters:
+            delta (bytes): The framed delta from the previous state, or None.
+        """
+        keyframe = None
+        for client in self.clients:
+            transport = client.writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > MAX_BUFFERED:
+                client.needs_keyframe = True
+                continue
+            if client.needs_keyframe:
+                if keyframe is None:
+                    keyframe = encode_keyframe(self.snapshot)
+                message = keyframe
+                client.needs_keyframe = False
+            else:
+                message = delta
+            client.writer.write(message)
+            self.bytes_sent += len(message)
+
+    async def handle_client(self, reader, writer):
+        """
+        Serves one client: gives it a role, then reads its paddle inputs until it disconnects.
+
+        The client gets its first keyframe with the next tick.
+
+        Parameters:
+            reader (asyncio.StreamReader): The stream from the client.
+            writer (asyncio.StreamWriter): The stream to the client.
+        """
+        client = None
+        task = asyncio.current_task()
+        self.tasks.add(task)
+        try:
+            message = await read_message(reader)
+            if message is None or message[0] != HELLO:
+                return
+            role = PLAYER if ROLE_MESSAGE.unpack(message)[1] == PLAYER and self.player is None else SPECTATOR
+            client = Connection(writer, role)
+            if role == PLAYER:
+                self.player = client
+                self.direction = MOVE_NONE
+            writer.write(frame_message(ROLE_MESSAGE.pack(WELCOME, role)))
+            self.clients.add(client)
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                if message[0] == INPUT and client is self.player:
+                    direction = INPUT_MESSAGE.unpack(message)[1]
+                    self.direction = max(MOVE_LEFT, min(MOVE_RIGHT, direction))
+        except (ConnectionError, struct.error):
+            pass
+        except asyncio.CancelledError:
+            pass  # Cancelled by close(); end normally, or asyncio logs the cancellation as an error
+        finally:
+            self.tasks.discard(task)
+            if client is not None:
+                self.clients.discard(client)
+                if client is self.player:
+                    self.player = None
+                    self.direction = MOVE_NONE
+            writer.close()
+
+    async def close(self):
+        """
+        Disconnects every client and stops listening.
+
+        The tasks serving the clients are cancelled and waited for before the server
+        is, so none of them is left to fail on a closed connection afterwards.
+        """
+        if self.server is not None:
+            self.server.close()
+        tasks = list(self.tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+
+
+class ServerThread:
+    """
+    Streams a game run by someone else, such as the game window, from a GameServer
+    on a background thread.
+
+    The game stays on its own thread and calls `publish()` after running its ticks:
+    the state is taken there, so it is never read halfway through a tick, and handed
+    to the server's event loop, which encodes and sends it. The remote player's
+    direction is read back with `remote_input()`, for the game to merge with its own
+    player's input.
+
+    Attributes:
+        server (GameServer): The server, which runs no game of its own.
+        loop (asyncio.AbstractEventLoop): The server's event loop.
+        thread (threading.Thread): The thread running the loop.
+        tick (int): The number of states published.
+
+    Methods:
+        start(host, port): Starts the thread and listens for clients.
+        publish(): Sends the game's current state to every client.
+        remote_input(): Returns the direction the remote player steers in.
+        close(): Disconnects every client and stops the thread.
+    """
+
+    def __init__(self, simulation):
+        """
+        Initializes a ServerThread. Call `start()` to start serving.
+
+        Parameters:
+            simulation (Simulation): The game to stream.
+        """
+        self.server = GameServer(simulation, autoplay=False)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="game-server", daemon=True)
+        self.tick = 0
+
+    def start(self, host=HOST, port=PORT):
+        """
+        Starts the thread and listens for clients.
+
+        Parameters:
+            host (str): The address to listen on.
+            port (int): The port to listen on, or 0 for any free port.
+
+        Returns:
+            int: The port listened on.
+
+        Raises:
+            OSError: If the port can't be listened on.
+        """
+        self.thread.start()
+        return asyncio.run_coroutine_threadsafe(self.server.start(host, port), self.loop).result()
+
+    def publish(self):
+        """
+        Takes the game's current state and sends it to every client.
+        """
+        self.tick += 1
+        self.loop.call_soon_threadsafe(self.server.publish, take_snapshot(self.server.simulation, self.tick))
+
+    def remote_input(self):
+        """
+        Returns the direction the remote player steers the paddle in.
+
+        Returns:
+            int: MOVE_LEFT, MOVE_RIGHT, or MOVE_NONE if nobody is playing.
+        """
+        return self.server.remote_input()
+
+    def close(self, timeout=5):
+        """
+        Disconnects every client and stops the thread.
+
+        Parameters:
+            timeout (float): How long to wait for the server to close, in seconds.
+        """
+        if not self.thread.is_alive():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result(timeout)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout)
+            if not self.thread.is_alive():
+                self.loop.close()
+
+
+async def read_message(reader):
+    """
+    Reads one framed message.
+
+    Parameters:
+        reader (asyncio.StreamReader): The stream to read from.
+
+    Returns:
+        bytes: The message, or None if the stream ended.
+    """
+    try:
+        (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+
+
+class GameClient:
+    """
+    Watches, or plays, a game streamed by a GameServer.
+
+    Attributes:
+        state (SnapshotDecoder): The game state, updated as messages arrive.
+        reader (asyncio.StreamReader): The stream from the server, once connected.
+        writer (asyncio.StreamWriter): The stream to the server, once connected.
+        bytes_received (int): The number of bytes received.
+
+    Methods:
+        connect(host, port, role): Connects to a server.
+        receive(): Applies the server's messages to the state until the server disconnects.
+        send_input(direction): Steers the paddle, when playing.
+        close(): Disconnects from the server.
+    """
+
+    def __init__(self):
+        """
+        Initializes a GameClient that isn't connected yet.
+        """
+        self.state = SnapshotDecoder()
+        self.reader = None
+        self.writer = None
+        self.bytes_received = 0
+
+    async def connect(self, host=HOST, port=PORT, role=SPECTATOR):
+        """
+        Connects to a server and asks for a role.
+
+        Parameters:
+            host (str): The server's address.
+            port (int): The server's port.
+            role (int): SPECTATOR, or PLAYER to steer the paddle. A client that asks to
+                play while someone else does is made a spectator, see `state.role`.
+        """
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(frame_message(ROLE_MESSAGE.pack(HELLO, role)))
+        await self.writer.drain()
+
+    async def receive(self, on_update=None):
+        """
+        Applies the server's messages to the state until the server disconnects.
+
+        Parameters:
+            on_update (function, optional): Called with the client after every message applied.
+        """
+        while True:
+            message = await read_message(self.reader)
+            if message is None:
+                break
+            self.bytes_received += LENGTH.size + len(message)
+            self.state.apply(message)
+            if on_update is not None:
+                on_update(self)
+
+    def send_input(self, direction):
+        """
+        Steers the paddle in a direction until the next input. Ignored unless playing.
+
+        Parameters:
+            direction (int): MOVE_LEFT, MOVE_RIGHT or MOVE_NONE.
+        """
+        self.writer.write(frame_message(INPUT_MESSAGE.pack(INPUT, direction)))
+
+    async def close(self):
+        """
+        Disconnects from the server.
+        """
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(host, port, tick_rate, seed):
+    """
+    Runs a server until interrupted.
+    """
+    server = GameServer(Simulation(seed=seed), tick_rate)
+    port = await server.start(host, port)
+    print(f"Serving on {host}:{port} at {tick_rate} ticks/s")
+    await server.run()
+
+
+async def watch(host, port, spectators, seconds, play):
+    """
+    Connects spectators, and optionally a player steered by the autoplay agent, and
+    reports what they received.
+    """
+    clients = [GameClient() for _ in range(spectators)]
+    for client in clients:
+        await client.connect(host, port)
+    tasks = [asyncio.create_task(client.receive()) for client in clients]
+
+    if play:
+        player = GameClient()
+        await player.connect(host, port, PLAYER)
+        agent = AutoplayAgent(player.state)
+        last_direction = None
+
+        def steer(client):
+            nonlocal last_direction
+            if client.state.role == PLAYER and client.state.tick is not None:
+                direction = agent.act()
+                if direction != last_direction:
+                    client.send_input(direction)
+                    last_direction = direction
+
+        clients.append(player)
+        tasks.append(asyncio.create_task(player.receive(steer)))
+
+    await asyncio.sleep(seconds)
+    for client in clients:
+        await client.close()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    total = sum(client.bytes_received for client in clients)
+    state = clients[0].state
+    print(
+        f"{len(clients)} clients, {total / seconds / len(clients):.0f} bytes/s each, "
+        f"{state.keyframes} keyframes and {state.deltas} deltas each; "
+        f"tick {state.tick}, score {state.score}, lives {state.lives}, level {state.level}"
+    )
+
+
+async def view(host, port, frame_rate=60):
+    """
+    Connects a spectator and draws the game in a window until the window is closed or
+    the server disconnects.
+    """
+    import tkinter
+    import turtle
+
+    from spectator_view import SpectatorView
+
+    client = GameClient()
+    await client.connect(host, port)
+    window = SpectatorView(client.state)
+    receiving = asyncio.create_task(client.receive())
+    try:
+        while not receiving.done():
+            window.render()
+            await asyncio.sleep(1 / frame_rate)
+    except (turtle.Terminator, tkinter.TclError):
+        pass  # The window was closed
+    finally:
+        await client.close()
+        await asyncio.gather(receiving, return_exceptions=True)
+
+
+# Serve a game, or watch one, e.g. python game_server.py serve, then python game_server.py watch --spectators 100,
+# or python game_server.py view to see it in a window
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream Breakout games over TCP.")
+    parser.add_argument(
+        "command",
+        choices=("serve", "watch", "view"),
+        help="run a server, connect clients to one, or draw its game in a window",
+    )
+    parser.add_argument("--host", default=HOST, help="the server's address")
+    parser.add_argument("--port", type=int, default=PORT, help="the server's port")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="ticks per second (serve)")
+    parser.add_argument("--seed", type=int, help="the seed of the game (serve)")
+    parser.add_argument("--spectators", type=int, default=1, help="the number of spectators to connect (watch)")
+    parser.add_argument("--seconds", type=float, default=10, help="how long to watch (watch)")
+    parser.add_argument("--play", action="store_true", help="also join as the player, steered by the autoplay agent (watch)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "serve":
+            asyncio.run(serve(args.host, args.port, args.tick_rate, args.seed))
+        elif args.command == "view":
+            asyncio.run(view(args.host, args.port))
+        else:
+            asyncio.run(watch(args.host, args.port, args.spectators, args.seconds, args.play))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,155 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+CURRENT_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
+LEADERBOARD_PATH = os.path.join(CURRENT_DIRECTORY, "leaderboard.db")
+LEGACY_HIGH_SCORE_PATH = "highscore.txt"  # Written to the working directory by earlier versions
+TOP_SCORES = 10
+
+LeaderboardEntry = namedtuple("LeaderboardEntry", "score level seconds date")
+
+
+class Leaderboard:
+    """
+    Keeps the top scores in a SQLite file, with the level reached, the play time and the date.
+
+    The scores are read once, when the leaderboard is created, and kept in memory
+    afterwards, so reading the best score never touches the disk. New scores update
+    the in-memory list straight away and are written by a background thread; each
+    write is a single SQLite transaction, so a crash leaves either the old or the
+    new leaderboard on disk, never a corrupt one.
+
+    Attributes:
+        path (str): The path of the SQLite file.
+        size (int): The number of scores kept.
+        entries (list): The top scores as LeaderboardEntry tuples, best first.
+        writes (queue.Queue): The entries waiting to be written by the writer thread.
+        writer (threading.Thread): The background thread that writes new scores.
+
+    Methods:
+        best_score(): Returns the best score.
+        submit(score, level, seconds): Adds a score to the leaderboard.
+        flush(): Waits until every submitted score has been written.
+    """
+
+    def __init__(self, path=LEADERBOARD_PATH, size=TOP_SCORES):
+        """
+        Initializes a Leaderboard, creating the file if needed, and starts the writer thread.
+
+        A high score left in 'highscore.txt' by an earlier version is imported into a new leaderboard.
+
+        Parameters:
+        - path (str): The path of the SQLite file.
+        - size (int): The number of scores kept.
+        """
+        self.path = path
+        self.size = size
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS scores (score INTEGER NOT NULL, level INTEGER, seconds INTEGER, date TEXT)"
+            )
+            rows = connection.execute(
+                "SELECT score, level, seconds, date FROM scores ORDER BY score DESC, date LIMIT ?", (size,)
+            ).fetchall()
+        connection.close()
+        self.entries = [LeaderboardEntry(*row) for row in rows]
+        self.writes = queue.Queue()
+        self.writer = threading.Thread(target=self.write_in_background, name="leaderboard-writer", daemon=True)
+        self.writer.start()
+        if not self.entries:
+            self.import_legacy_high_score()
+
+    def import_legacy_high_score(self):
+        """
+        Adds the score in 'highscore.txt', if there is one, to the leaderboard.
+        """
+        try:
+            with open(LEGACY_HIGH_SCORE_PATH, "r") as file:
+                score = int(file.read())
+            date = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(os.path.getmtime(LEGACY_HIGH_SCORE_PATH)))
+        except (OSError, ValueError):
+            return
+        self.add(LeaderboardEntry(score, None, None, date))
+
+    def best_score(self):
+        """
+        Returns the best score, from memory.
+
+        Returns:
+            int: The best score, or 0 if the leaderboard is empty.
+        """
+        return self.entries[0].score if self.entries else 0
+
+    def submit(self, score, level, seconds):
+        """
+        Adds a score to the leaderboard if it is among the top scores.
+
+        The in-memory leaderboard is updated straight away; the file is written in the background.
+
+        Parameters:
+        - score (int): The score.
+        - level (int): The level reached.
+        - seconds (int): The play time, in seconds.
+
+        Returns:
+            int: The 1-based rank of the score, or None if it didn't make the leaderboard.
+        """
+        return self.add(LeaderboardEntry(score, level, seconds, time.strftime("%Y-%m-%d %H:%M:%S")))
+
+    def add(self, entry):
+        """
+        Inserts an entry into the in-memory leaderboard and queues it to be written.
+
+        Parameters:
+        - entry (LeaderboardEntry): The entry.
+
+        Returns:
+            int: The 1-based rank of the entry, or None if it didn't make the leaderboard.
+        """
+        rank = 0
+        while rank < len(self.entries) and self.entries[rank].score >= entry.score:
+            rank += 1
+        if rank >= self.size:
+            return None
+        self.entries.insert(rank, entry)
+        del self.entries[self.size :]
+        self.writes.put(entry)
+        return rank + 1
+
+    def write_in_background(self):
+        """
+        Writes queued entries to the file, then drops the scores that fell off the leaderboard. Runs on the writer thread.
+        """
+        connection = sqlite3.connect(self.path)
+        while True:
+            entry = self.writes.get()
+            try:
+                with connection:  # One transaction: committed as a whole or rolled back
+                    connection.execute("INSERT INTO scores VALUES (?, ?, ?, ?)", entry)
+                    connection.execute(
+                        "DELETE FROM scores WHERE rowid NOT IN "
+                        "(SELECT rowid FROM scores ORDER BY score DESC, date LIMIT ?)",
+                        (self.size,),
+                    )
+            except sqlite3.Error as error:
+                print(f"Could not save score {entry.score}: {error}")
+            finally:
+                self.writes.task_done()
+
+    def flush(self):
+        """
+        Waits until every submitted score has been written.
+        """
+        self.writes.join()
+
+
+# Print the leaderboard
+if __name__ == "__main__":
+    for rank, entry in enumerate(Leaderboard().entries, 1):
+        level = "-" if entry.level is None else entry.level
+        played = "--:--" if entry.seconds is None else "{:02d}:{:02d}".format(*divmod(entry.seconds, 60))
+        print(f"{rank:2}. {entry.score:6}  level {level:>2}  {played}  {entry.date}")
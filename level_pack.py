@@ -0,0 +1,293 @@
+import argparse
+import hashlib
+import mmap
+import os
+import re
+import struct
+from collections import namedtuple
+
+CURRENT_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
+LEVELS_DIRECTORY = os.path.join(CURRENT_DIRECTORY, "levels")
+CLASSIC_PACK = os.path.join(LEVELS_DIRECTORY, "classic.brkl")
+
+MAGIC = b"BRKL"
+VERSION = 1
+# magic, version, number of levels, number of brick types
+HEADER = struct.Struct("<4sBHB")
+# red, green, blue, points
+BRICK_TYPE = struct.Struct("<BBBH")
+# offset of the cells, offset of the name, rows, columns
+LEVEL_ENTRY = struct.Struct("<IIBB")
+
+# The largest wall that stays clear of the ball's starting point at the center of the screen
+MAX_ROWS = 8
+MAX_COLUMNS = 16
+MAX_POINTS = 0xFFFF  # Points are stored as an unsigned short
+EMPTY = "."
+COLOR_PATTERN = re.compile(r"#[0-9A-Fa-f]{6}")
+
+BrickType = namedtuple("BrickType", "color points")
+Level = namedtuple("Level", "name rows columns cells")
+
+
+def parse_source(text):
+    """
+    Parses a level pack source.
+
+    The source is plain text. `brick` lines define a brick type for a character,
+    `level` lines start a level, and the rows of a level follow its `level` line,
+    one character per column, with "." (or a space) for an empty cell. Blank lines
+    and lines starting with "#" are ignored, so an empty row is written as dots:
+
+        brick R color=#FF4136 points=10
+        brick G color=#2ECC40 points=20
+
+        level Checkers
+        R.R.R.R.R.R.R.R.
+        .G.G.G.G.G.G.G.G
+
+    Parameters:
+        text (str): The source.
+
+    Returns:
+        tuple: The brick types as a dict mapping characters to BrickType, and the levels
+            as a list of (name, rows, line) tuples, each row a string and `line` the
+            number of the level's `level` line.
+
+    Raises:
+        ValueError: If the source is malformed; the message gives the line number.
+    """
+    types = {}
+    levels = []
+    for number, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        keyword, _, rest = stripped.partition(" ")
+        if keyword == "brick":
+            symbol, *properties = rest.split()
+            if len(symbol) != 1 or symbol in (EMPTY, "#"):
+                raise ValueError(f"Line {number}: a brick type must be one character other than '{EMPTY}' and '#'.")
+            values = dict(prop.partition("=")[::2] for prop in properties)
+            color = values.get("color", "")
+            if not COLOR_PATTERN.fullmatch(color):
+                raise ValueError(f"Line {number}: brick '{symbol}' needs a color like #FF4136.")
+            try:
+                points = int(values.get("points", 10))
+            except ValueError:
+                raise ValueError(f"Line {number}: brick '{symbol}' has invalid points.") from None
+            if not 0 <= points <= MAX_POINTS:
+                raise ValueError(f"Line {number}: brick '{symbol}' must be worth 0 to {MAX_POINTS} points.")
+            types[symbol] = BrickType(color.upper(), points)
+        elif keyword == "level":
+            levels.append((rest.strip(), [], number))
+        elif levels:
+            row = line.rstrip().replace(" ", EMPTY)
+            unknown = set(row) - set(types) - {EMPTY}
+            if unknown:
+                raise ValueError(f"Line {number}: unknown brick type(s) {', '.join(sorted(unknown))}.")
+            levels[-1][1].append(row)
+        else:
+            raise ValueError(f"Line {number}: expected 'brick' or 'level'.")
+    return types, levels
+
+
+def compile_source(text):
+    """
+    Compiles a level pack source into the binary level pack format.
+
+    The pack starts with a header, then the table of brick types, then a fixed-size
+    entry per level, so that any level can be found without reading the others.
+    Each level is stored as one byte per cell, row by row: 0 for an empty cell, or
+    the 1-based index of its brick type.
+
+    Parameters:
+        text (str): The source, see `parse_source()`.
+
+    Returns:
+        bytes: The compiled level pack.
+
+    Raises:
+        ValueError: If the source is malformed, or a level has no bricks or doesn't fit
+            on the screen; the message gives the line number of the level.
+    """
+    types, levels = parse_source(text)
+    if not levels:
+        raise ValueError("The pack has no levels.")
+    if len(types) > 255:
+        raise ValueError("A pack can have at most 255 brick types.")
+    codes = {symbol: index for index, symbol in enumerate(types, 1)}
+    codes[EMPTY] = 0
+
+    data = bytearray(HEADER.pack(MAGIC, VERSION, len(levels), len(types)))
+    for color, points in types.values():
+        data += BRICK_TYPE.pack(int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16), points)
+    index_start = len(data)
+    data += bytes(LEVEL_ENTRY.size * len(levels))
+    for number, (name, rows, line) in enumerate(levels):
+        columns = max((len(row) for row in rows), default=0)
+        if not 0 < len(rows) <= MAX_ROWS or not 0 < columns <= MAX_COLUMNS:
+            raise ValueError(
+                f"Line {line}: level '{name}' must have 1 to {MAX_ROWS} rows and 1 to {MAX_COLUMNS} columns."
+            )
+        # A level without bricks would be cleared on every tick
+        if all(symbol == EMPTY for row in rows for symbol in row):
+            raise ValueError(f"Line {line}: level '{name}' has no bricks.")
+        name_offset = len(data)
+        encoded = name.encode("utf-8")[:255]
+        data += bytes([len(encoded)]) + encoded
+        cells_offset = len(data)
+        for row in rows:
+            data += bytes(codes[symbol] for symbol in row.ljust(columns, EMPTY))
+        entry_offset = index_start + number * LEVEL_ENTRY.size
+        LEVEL_ENTRY.pack_into(data, entry_offset, cells_offset, name_offset, len(rows), columns)
+    return bytes(data)
+
+
+def compile_file(source_path, pack_path):
+    """
+    Compiles a level pack source file into a level pack file.
+
+    Parameters:
+        source_path (str): The path of the source file.
+        pack_path (str): The path of the level pack to write.
+    """
+    with open(source_path, encoding="utf-8") as file:
+        data = compile_source(file.read())
+    with open(pack_path, "wb") as file:
+        file.write(data)
+
+
+class LevelPack:
+    """
+    A compiled level pack, read lazily.
+
+    Only the header and the brick types are decoded up front. A level is decoded
+    when it is asked for, and its cells are a view of the pack's data, not a copy;
+    when loaded from a file the data is memory-mapped, so only the pages of the
+    levels actually played are read from disk.
+
+    Attributes:
+        data: The pack's bytes, or a memory map of the pack file.
+        view (memoryview): A view of the data that levels' cells are sliced from.
+        index_start (int): The offset of the first level entry.
+        level_count (int): The number of levels.
+        types (list): The BrickType of each brick type; cell value n is types[n - 1].
+        path (str): The file the pack was loaded from, or None.
+        name (str): The file name of the pack, without its directory, or None.
+
+    Methods:
+        from_bytes(data, path=None): Reads a level pack from its bytes.
+        load(path): Memory-maps a level pack file.
+        level(index): Returns a level.
+        digest(): Returns the SHA-256 hash of the pack.
+    """
+
+    def __init__(self, data, path=None):
+        """
+        Initializes a LevelPack from the pack's data.
+
+        Parameters:
+        - data: The pack's bytes, or a memory map of the pack file.
+        - path (str, optional): The file the pack was loaded from.
+
+        Raises:
+            ValueError: If the data is not a level pack this version can read.
+        """
+        if len(data) < HEADER.size:
+            raise ValueError("Level pack is truncated.")
+        magic, version, level_count, type_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a Breakout level pack, or an unsupported version.")
+        self.index_start = HEADER.size + type_count * BRICK_TYPE.size
+        if len(data) < self.index_start + level_count * LEVEL_ENTRY.size:
+            raise ValueError("Level pack is truncated.")
+        self.data = data
+        self.view = memoryview(data)
+        self.path = path
+        self.name = os.path.basename(path) if path else None
+        self.level_count = level_count
+        self.types = []
+        for number in range(type_count):
+            red, green, blue, points = BRICK_TYPE.unpack_from(data, HEADER.size + number * BRICK_TYPE.size)
+            self.types.append(BrickType(f"#{red:02X}{green:02X}{blue:02X}", points))
+
+    @classmethod
+    def from_bytes(cls, data, path=None):
+        """
+        Reads a level pack from its bytes.
+
+        Parameters:
+        - data (bytes): The compiled level pack.
+        - path (str, optional): The file the pack was read from.
+
+        Returns:
+            LevelPack: The level pack.
+        """
+        return cls(data, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-maps a level pack file.
+
+        Parameters:
+        - path (str): The path of the file.
+
+        Returns:
+            LevelPack: The level pack.
+        """
+        with open(path, "rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, path)
+
+    def level(self, index):
+        """
+        Returns a level, decoding only its index entry and name.
+
+        Parameters:
+        - index (int): The 0-based number of the level.
+
+        Returns:
+            Level: The level, whose `cells` is a read-only view of rows x columns bytes.
+        """
+        if not 0 <= index < self.level_count:
+            raise IndexError("Level index out of range.")
+        cells_offset, name_offset, rows, columns = LEVEL_ENTRY.unpack_from(
+            self.data, self.index_start + index * LEVEL_ENTRY.size
+        )
+        length = self.data[name_offset]
+        name = bytes(self.view[name_offset + 1 : name_offset + 1 + length]).decode("utf-8")
+        cells = self.view[cells_offset : cells_offset + rows * columns].toreadonly()
+        return Level(name, rows, columns, cells)
+
+    def digest(self):
+        """
+        Returns the SHA-256 hash of the pack, which tells two versions of a pack apart.
+
+        This reads the whole pack, so it is only worth calling once per game, e.g. when recording it.
+
+        Returns:
+            bytes: The 32-byte hash.
+        """
+        return hashlib.sha256(self.data).digest()
+
+    def __len__(self):
+        """
+        Returns the number of levels in the pack.
+        """
+        return self.level_count
+
+
+# Compile a level pack source, e.g. python level_pack.py levels/classic.txt levels/classic.brkl
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile a Breakout level pack.")
+    parser.add_argument("source", help="level pack source file")
+    parser.add_argument("output", nargs="?", help="compiled level pack (defaults to the source with a .brkl extension)")
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.source)[0] + ".brkl"
+    compile_file(args.source, output)
+    pack = LevelPack.load(output)
+    size = os.path.getsize(output)
+    print(f"Compiled {len(pack)} levels and {len(pack.types)} brick types into {output}, {size} bytes")
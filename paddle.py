@@ -1,34 +1,43 @@
 import turtle
 
+from simulation import PaddleBody
+
 
 class Paddle:
     """
     Represents a paddle in the Breakout game.
 
+    The paddle's position lives on a `simulation.PaddleBody`; the turtle only
+    mirrors the body for display.
+
     Attributes:
         screen_height (int): The height of the game screen.
+        body (PaddleBody): The physics state of the paddle.
         paddle (turtle.Turtle): The turtle object representing the paddle.
 
     Methods:
-        __init__(self, screen_height): Initializes a new instance of the Paddle class.
+        __init__(self, screen_height, body=None): Initializes a new instance of the Paddle class.
         move_left(self): Moves the paddle to the left.
         move_right(self): Moves the paddle to the right.
         get_x(self): Returns the x-coordinate of the paddle.
         get_y(self): Returns the y-coordinate of the paddle.
         reset(self): Resets the paddle position to the bottom center of the screen.
+        sync(self): Moves the turtle to the body's position.
     """
 
-    def __init__(self, screen_height):
+    def __init__(self, screen_height, body=None):
         """
         Initializes a Paddle object.
 
         Parameters:
         screen_height (int): The height of the game screen.
+        body (PaddleBody, optional): The physics state to display. A new one is created if omitted.
 
         Returns:
         None
         """
         self.screen_height = screen_height
+        self.body = body if body is not None else PaddleBody(screen_height)
         self.paddle = turtle.Turtle()
         self.paddle.speed(0)  # Animation speed, 0 is the fastest
         self.paddle.shape("square")
@@ -37,14 +46,13 @@ class Paddle:
         self.paddle.shapesize(stretch_wid=1, stretch_len=5)
         self.paddle.penup()
         # Position the paddle at the bottom center of the screen
-        self.paddle.goto(0, -screen_height / 2 + 20)
+        self.sync()
 
     def move_left(self):
         """
         Move the paddle to the left by 20 units.
 
-        This method updates the x-coordinate of the paddle's position by subtracting 20 units.
-        If the new x-coordinate is less than -320, it is set to -320 to prevent the paddle from going off the screen.
+        The body stops the paddle at -320 to prevent it from going off the screen.
 
         Parameters:
         None
@@ -52,17 +60,14 @@ class Paddle:
         Returns:
         None
         """
-        x = self.paddle.xcor() - 20
-        if x < -320:
-            x = -320
-        self.paddle.setx(x)
+        self.body.move_left()
+        self.sync()
 
     def move_right(self):
         """
         Move the paddle to the right by 20 units.
 
-        This method updates the x-coordinate of the paddle's position by adding 20 units.
-        If the new x-coordinate exceeds the maximum x-coordinate of 320, it is capped at 320.
+        The body stops the paddle at 320 to prevent it from going off the screen.
 
         Parameters:
         None
@@ -70,10 +75,8 @@ class Paddle:
         Returns:
         None
         """
-        x = self.paddle.xcor() + 20
-        if x > 320:
-            x = 320
-        self.paddle.setx(x)
+        self.body.move_right()
+        self.sync()
 
     def get_x(self):
         """
@@ -82,7 +85,7 @@ class Paddle:
         Returns:
             float: The x-coordinate of the paddle.
         """
-        return self.paddle.xcor()
+        return self.body.x
 
     def get_y(self):
         """
@@ -91,10 +94,17 @@ class Paddle:
         Returns:
             float: The y-coordinate of the paddle.
         """
-        return self.paddle.ycor()
+        return self.body.y
 
     def reset(self):
         """
         Resets the position of the paddle to the starting position.
         """
-        self.paddle.goto(0, -self.screen_height / 2 + 20)
+        self.body.reset()
+        self.sync()
+
+    def sync(self):
+        """
+        Moves the turtle to the position of the paddle's body.
+        """
+        self.paddle.goto(self.body.x, self.body.y)
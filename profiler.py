@@ -0,0 +1,251 @@
+import json
+import time
+import turtle
+from collections import deque
+
+FRAME_BUDGET_MS = 1000 / 60
+WINDOW = 600  # Frames kept for the rolling percentiles
+PERCENTILES = (50, 95, 99)
+OVERLAY_REFRESH = 30  # Frames between overlay redraws
+
+
+def percentile(samples, percent):
+    """
+    Returns a percentile of sorted samples, using the nearest-rank method.
+
+    Parameters:
+        samples (list): The samples, sorted in ascending order.
+        percent (float): The percentile, from 0 to 100.
+
+    Returns:
+        int: The sample at that percentile, or 0 if there are no samples.
+    """
+    if not samples:
+        return 0
+    rank = max(int(len(samples) * percent / 100 + 0.5) - 1, 0)
+    return samples[min(rank, len(samples) - 1)]
+
+
+class FrameProfiler:
+    """
+    Times the phases of every frame of the game loop.
+
+    Phases are timed by wrapping methods of the game objects with `instrument()`;
+    the wrappers add their time, measured with `time.perf_counter_ns`, to the
+    phase's total for the current frame. A phase called several times in a frame,
+    like the simulation step when several ticks run, is summed. The time spent in
+    a wrapped method includes any wrapped method it calls.
+
+    Until `instrument()` is called nothing is wrapped, and `begin_frame()` and
+    `end_frame()` return straight away, so a disabled profiler costs two method
+    calls per frame.
+
+    Attributes:
+        enabled (bool): Whether frames are being timed.
+        budget_ns (int): The frame time above which a frame counts as a spike.
+        samples (dict): The per-frame totals of each phase over the last `window` frames, in ns.
+        spikes (int): The number of frames that went over budget.
+        frames (int): The number of frames timed.
+        current (dict): The totals of each phase for the frame being timed, in ns.
+        frame_start (int): When the frame being timed started, in ns.
+        wrapped (list): The (object, name, original) of every method replaced by a wrapper.
+
+    Methods:
+        instrument(phases): Wraps methods so that their time is added to a phase, and enables the profiler.
+        uninstrument(): Removes every wrapper and disables the profiler.
+        begin_frame(): Marks the start of a frame.
+        end_frame(): Marks the end of a frame and stores its phase totals.
+        summary(): Returns the rolling percentiles of each phase.
+        dump(path): Writes the summary and the samples to a JSON file.
+    """
+
+    def __init__(self, budget_ms=FRAME_BUDGET_MS, window=WINDOW):
+        """
+        Initializes a disabled FrameProfiler.
+
+        Parameters:
+        - budget_ms (float): The frame time above which a frame counts as a spike, in milliseconds.
+        - window (int): The number of frames kept for the rolling percentiles.
+        """
+        self.enabled = False
+        self.budget_ns = int(budget_ms * 1_000_000)
+        self.window = window
+        self.samples = {"frame": deque(maxlen=window)}
+        self.spikes = 0
+        self.frames = 0
+        self.current = {}
+        self.frame_start = 0
+        self.wrapped = []
+
+    def instrument(self, phases):
+        """
+        Wraps methods so that the time spent in them is added to a phase, and enables the profiler.
+
+        Parameters:
+        - phases (list): (phase, object, method name) triples. The method is replaced
+          on the object itself, so other instances of its class are not affected.
+        """
+        for phase, owner, name in phases:
+            self.samples.setdefault(phase, deque(maxlen=self.window))
+            # Remember a function set on the object itself, so it can be put back
+            self.wrapped.append((owner, name, vars(owner).get(name)))
+            setattr(owner, name, self.timed(phase, getattr(owner, name)))
+        self.enabled = True
+
+    def timed(self, phase, function):
+        """
+        Returns a wrapper that adds the time spent in a function to a phase.
+
+        Parameters:
+        - phase (str): The name of the phase.
+        - function (callable): The function to time.
+
+        Returns:
+            callable: The wrapper.
+        """
+        current = self.current
+        clock = time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                current[phase] = current.get(phase, 0) + clock() - start
+
+        return wrapper
+
+    def uninstrument(self):
+        """
+        Removes every wrapper and disables the profiler. The collected samples are kept.
+        """
+        for owner, name, original in reversed(self.wrapped):
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self.wrapped.clear()
+        self.current.clear()
+        self.enabled = False
+
+    def begin_frame(self):
+        """
+        Marks the start of a frame.
+        """
+        if self.enabled:
+            self.current.clear()
+            self.frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        """
+        Marks the end of a frame, stores the totals of its phases and counts it as a spike if it went over budget.
+        """
+        if not self.enabled or not self.frame_start:
+            return
+        total = time.perf_counter_ns() - self.frame_start
+        self.frame_start = 0
+        self.frames += 1
+        if total > self.budget_ns:
+            self.spikes += 1
+        current = self.current
+        for phase, samples in self.samples.items():
+            samples.append(total if phase == "frame" else current.get(phase, 0))
+
+    def summary(self):
+        """
+        Returns the rolling percentiles of every phase.
+
+        Returns:
+            dict: For each phase, a dict mapping "p50", "p95" and "p99" to milliseconds.
+        """
+        summary = {}
+        for phase, samples in self.samples.items():
+            ordered = sorted(samples)
+            summary[phase] = {f"p{p}": percentile(ordered, p) / 1_000_000 for p in PERCENTILES}
+        return summary
+
+    def dump(self, path):
+        """
+        Writes the summary, the spike count and the raw samples to a JSON file.
+
+        Parameters:
+        - path (str): The path of the file.
+        """
+        with open(path, "w") as file:
+            json.dump(
+                {
+                    "frames": self.frames,
+                    "spikes": self.spikes,
+                    "budget_ms": self.budget_ns / 1_000_000,
+                    "summary": self.summary(),
+                    "samples_ns": {phase: list(samples) for phase, samples in self.samples.items()},
+                },
+                file,
+                indent=2,
+            )
+
+
+class ProfilerOverlay:
+    """
+    Shows the rolling percentiles of a FrameProfiler on the game screen.
+
+    Attributes:
+        profiler (FrameProfiler): The profiler to show.
+        clock (FrameClock): The game clock, whose smoothed frame rate is shown, or None.
+        visible (bool): Whether the overlay is shown.
+        display (turtle.Turtle): The turtle object used to write the overlay.
+        countdown (int): The number of frames until the next redraw.
+
+    Methods:
+        toggle(): Shows or hides the overlay.
+        update(): Redraws the overlay every OVERLAY_REFRESH frames while it is shown.
+    """
+
+    def __init__(self, profiler, clock=None):
+        """
+        Initializes a hidden ProfilerOverlay.
+
+        Parameters:
+        - profiler (FrameProfiler): The profiler to show.
+        - clock (FrameClock, optional): The game clock, whose smoothed frame rate is shown.
+        """
+        self.profiler = profiler
+        self.clock = clock
+        self.visible = False
+        self.display = turtle.Turtle()
+        self.display.speed(0)
+        self.display.color("yellow")
+        self.display.penup()
+        self.display.hideturtle()
+        self.display.goto(380, -150)
+        self.countdown = 0
+
+    def toggle(self):
+        """
+        Shows or hides the overlay.
+        """
+        self.visible = not self.visible
+        self.countdown = 0
+        if not self.visible:
+            self.display.clear()
+
+    def update(self):
+        """
+        Redraws the overlay every OVERLAY_REFRESH frames while it is shown.
+        """
+        if not self.visible:
+            return
+        self.countdown -= 1
+        if self.countdown > 0:
+            return
+        self.countdown = OVERLAY_REFRESH
+        lines = [f"{'ms':12}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for phase, values in self.profiler.summary().items():
+            lines.append(f"{phase:12}" + "".join(f"{value:7.2f}" for value in values.values()))
+        lines.append(f"spikes: {self.profiler.spikes}/{self.profiler.frames}")
+        if self.clock is not None:
+            lines.append(f"fps: {self.clock.fps:.1f}")
+        if not self.profiler.enabled:
+            lines.append("profiling off")
+        self.display.clear()
+        self.display.write("\n".join(lines), align="right", font=("Courier", 10, "normal"))
@@ -0,0 +1,365 @@
+import argparse
+import os
+import struct
+import time
+
+from simulation import (
+    BALL_SPEED,
+    PADDLE_ACCELERATION,
+    PADDLE_SPEED,
+    SCREEN_HEIGHT,
+    SPEED_INCREASE,
+    START_COLUMNS,
+    START_FLOORS,
+    Simulation,
+)
+from level_pack import LEVELS_DIRECTORY, LevelPack
+
+MAGIC = b"BRKR"
+VERSION = 1
+# magic, version, continuous, seed, floors, columns, ball speed, speed increase, paddle speed, paddle acceleration,
+# screen height, the SHA-256 hash of the level pack, then the length of the pack's file name, followed by the name
+HEADER = struct.Struct("<4sBBqHHddddH32sH")
+NO_DIGEST = bytes(32)  # The hash stored for generated levels
+
+
+class ReplayRecorder:
+    """
+    Records a game as its seed and settings plus the paddle input of every tick.
+
+    The inputs are stored run-length encoded, so a minute of play takes a few
+    hundred bytes to a few KB depending on how busy the player is.
+
+    A level pack is stored as its file name and the hash of its contents, not its
+    path, so a replay plays back on any machine with the same pack.
+
+    Attributes:
+        seed (int): The seed the simulation was created with.
+        settings (dict): The other Simulation arguments the game was created with.
+        levels_name (str): The file name of the level pack played, or None for generated levels.
+        levels_digest (bytes): The SHA-256 hash of the level pack played, or None.
+        runs (list): The recorded inputs as [input, count] runs.
+        frames (int): The number of ticks recorded.
+
+    Methods:
+        for_simulation(seed, simulation): Creates a recorder for a simulation's settings.
+        record(inputs): Records the input of one tick.
+        truncate(frames): Forgets the inputs after a tick.
+        to_bytes(): Encodes the replay.
+        save(path): Writes the replay to a file.
+    """
+
+    def __init__(
+        self,
+        seed,
+        continuous=True,
+        floors=START_FLOORS,
+        columns=START_COLUMNS,
+        ball_speed=BALL_SPEED,
+        speed_increase=SPEED_INCREASE,
+        paddle_speed=PADDLE_SPEED,
+        paddle_acceleration=PADDLE_ACCELERATION,
+        screen_height=SCREEN_HEIGHT,
+        levels=None,
+    ):
+        """
+        Initializes an empty ReplayRecorder.
+
+        Parameters:
+        - seed (int): The seed the simulation was created with.
+        - continuous, floors, columns, ball_speed, speed_increase, paddle_speed, paddle_acceleration, screen_height:
+          The Simulation arguments the game was created with.
+        - levels (LevelPack, optional): The level pack played.
+        """
+        self.seed = seed
+        self.settings = {
+            "continuous": continuous,
+            "floors": floors,
+            "columns": columns,
+            "ball_speed": ball_speed,
+            "speed_increase": speed_increase,
+            "paddle_speed": paddle_speed,
+            "paddle_acceleration": paddle_acceleration,
+            "screen_height": screen_height,
+        }
+        self.levels_name = levels.name if levels is not None else None
+        self.levels_digest = levels.digest() if levels is not None else None
+        self.runs = []
+        self.frames = 0
+
+    @classmethod
+    def for_simulation(cls, seed, simulation):
+        """
+        Creates a recorder for a freshly created or reset simulation.
+
+        Parameters:
+        - seed (int): The seed the simulation was created or reset with.
+        - simulation (Simulation): The simulation to record.
+
+        Returns:
+            ReplayRecorder: The recorder.
+        """
+        return cls(
+            seed,
+            continuous=simulation.continuous,
+            floors=simulation.start_floors,
+            columns=simulation.columns,
+            ball_speed=simulation.ball_speed,
+            speed_increase=simulation.speed_increase,
+            paddle_speed=simulation.paddle.speed,
+            paddle_acceleration=simulation.paddle.acceleration,
+            screen_height=simulation.paddle.screen_height,
+            levels=simulation.levels,
+        )
+
+    def record(self, inputs):
+        """
+        Records the paddle input of one tick.
+
+        Parameters:
+        - inputs (int): The input passed to `Simulation.step()`.
+        """
+        if self.runs and self.runs[-1][0] == inputs:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([inputs, 1])
+        self.frames += 1
+
+    def truncate(self, frames):
+        """
+        Forgets the inputs recorded after the first `frames` ticks, e.g. when the game is rewound.
+
+        Parameters:
+        - frames (int): The number of ticks to keep.
+        """
+        extra = self.frames - frames
+        while extra > 0 and self.runs:
+            run = self.runs[-1]
+            if run[1] > extra:
+                run[1] -= extra
+                extra = 0
+            else:
+                extra -= run[1]
+                self.runs.pop()
+        self.frames = min(self.frames, max(frames, 0))
+
+    def to_bytes(self):
+        """
+        Encodes the replay: a fixed header and the level pack's file name, then every
+        run as a signed input byte followed by the run length as a varint.
+
+        Returns:
+            bytes: The encoded replay.
+        """
+        settings = self.settings
+        levels_name = (self.levels_name or "").encode("utf-8")
+        data = bytearray(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                settings["continuous"],
+                self.seed,
+                settings["floors"],
+                settings["columns"],
+                settings["ball_speed"],
+                settings["speed_increase"],
+                settings["paddle_speed"],
+                settings["paddle_acceleration"],
+                settings["screen_height"],
+                self.levels_digest or NO_DIGEST,
+                len(levels_name),
+            )
+        )
+        data += levels_name
+        for inputs, count in self.runs:
+            data += struct.pack("<b", inputs)
+            while count >= 0x80:
+                data.append(count & 0x7F | 0x80)
+                count >>= 7
+            data.append(count)
+        return bytes(data)
+
+    def save(self, path):
+        """
+        Writes the replay to a file.
+
+        Parameters:
+        - path (str): The path of the file.
+        """
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+
+class ReplayPlayer:
+    """
+    Plays back a replay recorded by ReplayRecorder.
+
+    Attributes:
+        seed (int): The seed the simulation was created with.
+        settings (dict): The other Simulation arguments the game was created with.
+        levels_name (str): The file name of the level pack played, or None for generated levels.
+        levels_digest (bytes): The SHA-256 hash of the level pack played, or None.
+        levels_directory (str): The directory the level pack is looked up in, by its file name.
+        runs (list): The recorded inputs as (input, count) runs.
+        frames (int): The number of ticks recorded.
+
+    Methods:
+        from_bytes(data): Decodes a replay.
+        load(path): Reads a replay from a file.
+        create_simulation(): Creates a simulation in the recorded starting state.
+        inputs(): Yields the input of every recorded tick.
+        run(): Replays the whole game headlessly as fast as possible.
+    """
+
+    def __init__(self, seed, settings, runs, levels_name=None, levels_digest=None):
+        """
+        Initializes a ReplayPlayer.
+
+        Parameters:
+        - seed (int): The seed the simulation was created with.
+        - settings (dict): The other Simulation arguments the game was created with.
+        - runs (list): The recorded inputs as (input, count) runs.
+        - levels_name (str, optional): The file name of the level pack played.
+        - levels_digest (bytes, optional): The SHA-256 hash of the level pack played.
+        """
+        self.seed = seed
+        self.settings = settings
+        self.levels_name = levels_name
+        self.levels_digest = levels_digest
+        self.levels_directory = LEVELS_DIRECTORY
+        self.runs = runs
+        self.frames = sum(count for _, count in runs)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Decodes a replay produced by `ReplayRecorder.to_bytes()`.
+
+        Parameters:
+        - data (bytes): The encoded replay.
+
+        Returns:
+            ReplayPlayer: The decoded replay.
+
+        Raises:
+            ValueError: If the data is not a replay this version can read.
+        """
+        if len(data) < 5:
+            raise ValueError("Replay is truncated.")
+        magic, version = struct.unpack_from("<4sB", data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a Breakout replay, or an unsupported version.")
+        if len(data) < HEADER.size:
+            raise ValueError("Replay is truncated.")
+        fields = HEADER.unpack_from(data)
+        continuous, seed, floors, columns, ball_speed, speed_increase = fields[2:8]
+        paddle_speed, paddle_acceleration, screen_height, levels_digest, name_length = fields[8:]
+        position = HEADER.size + name_length
+        if len(data) < position:
+            raise ValueError("Replay is truncated.")
+        levels_name = bytes(data[HEADER.size : position]).decode("utf-8") or None
+        settings = {
+            "continuous": bool(continuous),
+            "floors": floors,
+            "columns": columns,
+            "ball_speed": ball_speed,
+            "speed_increase": speed_increase,
+            "paddle_speed": paddle_speed,
+            "paddle_acceleration": paddle_acceleration,
+            "screen_height": screen_height,
+        }
+        runs = []
+        try:
+            while position < len(data):
+                (inputs,) = struct.unpack_from("<b", data, position)
+                position += 1
+                count = 0
+                shift = 0
+                while True:
+                    byte = data[position]
+                    position += 1
+                    count |= (byte & 0x7F) << shift
+                    shift += 7
+                    if byte < 0x80:
+                        break
+                runs.append((inputs, count))
+        except (IndexError, struct.error):
+            raise ValueError("Replay is truncated.") from None
+        return cls(seed, settings, runs, levels_name, levels_digest if levels_name else None)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a replay from a file.
+
+        Parameters:
+        - path (str): The path of the file.
+
+        Returns:
+            ReplayPlayer: The replay.
+        """
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+    def create_simulation(self):
+        """
+        Creates a simulation in the state the recorded game started from.
+
+        Returns:
+            Simulation: The simulation.
+
+        Raises:
+            ValueError: If the level pack found is not the one the game was recorded with.
+        """
+        levels = None
+        if self.levels_name:
+            levels = LevelPack.load(os.path.join(self.levels_directory, self.levels_name))
+            if levels.digest() != self.levels_digest:
+                raise ValueError(f"Level pack {self.levels_name} differs from the one the replay was recorded with.")
+        return Simulation(seed=self.seed, levels=levels, **self.settings)
+
+    def inputs(self):
+        """
+        Yields the paddle input of every recorded tick, in order.
+        """
+        for inputs, count in self.runs:
+            for _ in range(count):
+                yield inputs
+
+    def run(self):
+        """
+        Replays the whole game headlessly, as fast as possible.
+
+        Returns:
+            Simulation: The simulation in its final state.
+        """
+        simulation = self.create_simulation()
+        for inputs in self.inputs():
+            simulation.step(inputs)
+        return simulation
+
+
+# Play back a replay file, headless by default or in the game window with --render
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play back a Breakout replay.")
+    parser.add_argument("path", help="replay file")
+    parser.add_argument("--render", action="store_true", help="play back in the game window at normal speed")
+    parser.add_argument(
+        "--levels-directory", default=LEVELS_DIRECTORY, help="where to find the level pack the game was played with"
+    )
+    args = parser.parse_args()
+
+    player = ReplayPlayer.load(args.path)
+    player.levels_directory = args.levels_directory
+    if args.render:
+        from game import Game
+
+        Game(replay=player).play()
+    else:
+        start = time.perf_counter()
+        simulation = player.run()
+        elapsed = time.perf_counter() - start
+        print(
+            f"Replayed {player.frames} frames in {elapsed:.2f}s: level {simulation.level}, "
+            f"score {simulation.score}, lives {simulation.lives}, game over {simulation.game_over}"
+        )
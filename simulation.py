@@ -0,0 +1,615 @@
+import random
+
+from brick_grid import BrickGrid
+from collision import sweep_box, sweep_walls
+
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+
+BALL_SPEED = 2.0
+BALL_LIMIT_X = 390
+BALL_LIMIT_Y = 290
+BALL_LOST_Y = -290
+
+PADDLE_STEP = 20
+PADDLE_LIMIT_X = 320
+# Top speed of a steered paddle in units per tick, and the speed it gains per tick while steered
+PADDLE_SPEED = 8.0
+PADDLE_ACCELERATION = 2.0
+
+# Half-size of the area around a brick or the paddle in which the ball's center hits it
+BRICK_REACH_X = 50
+BRICK_REACH_Y = 20
+PADDLE_REACH_X = 50
+PADDLE_REACH_Y = 20
+# The most bounces resolved within one continuous step
+MAX_BOUNCES = 4
+
+BRICK_SCORE = 10
+SPEED_INCREASE = 0.5
+START_LIVES = 3
+START_FLOORS = 5
+START_COLUMNS = 16
+
+# Input values accepted by Simulation.step()
+MOVE_NONE = 0
+MOVE_LEFT = -1
+MOVE_RIGHT = 1
+
+
+class BallBody:
+    """
+    The physics state of the ball, with no display attached.
+
+    Attributes:
+        speed (float): The speed of the ball along each axis when it is reset, raised on every level up.
+        x (float): The x-coordinate of the ball.
+        y (float): The y-coordinate of the ball.
+        dx (float): The horizontal movement speed of the ball.
+        dy (float): The vertical movement speed of the ball.
+
+    Methods:
+        move(): Moves the ball based on its current speed and bounces it off the walls.
+        invert_dx(): Inverts the horizontal movement direction of the ball.
+        invert_dy(): Inverts the vertical movement direction of the ball.
+        reset(): Moves the ball back to the center at its current speed.
+        increase_speed(speed): Increases the speed of the ball by the given amount.
+        adjust_dx(difference): Adjusts the horizontal speed of the ball based on the paddle collision.
+    """
+
+    __slots__ = ("speed", "x", "y", "dx", "dy")
+
+    def __init__(self, speed=BALL_SPEED):
+        """
+        Initializes a BallBody at the center of the screen moving down and to the right.
+
+        Args:
+            speed (float): The starting speed of the ball along each axis.
+        """
+        self.speed = speed
+        self.x = 0.0
+        self.y = 0.0
+        self.dx = speed
+        self.dy = -speed
+
+    def move(self):
+        """
+        Move the ball based on its current velocity.
+
+        The ball bounces off the top, left and right borders of the game window.
+        """
+        self.x += self.dx
+        self.y += self.dy
+
+        # Border checking
+        if self.y > BALL_LIMIT_Y:
+            self.y = BALL_LIMIT_Y
+            self.dy *= -1
+
+        if self.x > BALL_LIMIT_X:
+            self.x = BALL_LIMIT_X
+            self.dx *= -1
+
+        if self.x < -BALL_LIMIT_X:
+            self.x = -BALL_LIMIT_X
+            self.dx *= -1
+
+    def invert_dx(self):
+        """
+        Inverts the horizontal velocity of the ball.
+        """
+        self.dx *= -1
+
+    def invert_dy(self):
+        """
+        Inverts the vertical velocity of the ball.
+        """
+        self.dy *= -1
+
+    def reset(self):
+        """
+        Moves the ball back to the center of the screen, moving down and to the right at `speed`.
+        """
+        self.x = 0.0
+        self.y = 0.0
+        self.dx = self.speed
+        self.dy = -self.speed
+
+    def increase_speed(self, speed):
+        """
+        Increases the speed of the ball in both the x and y directions.
+
+        `speed` is raised too, so the ball keeps its new speed after a reset.
+
+        Args:
+            speed (float): The amount by which to increase the speed.
+        """
+        self.speed += speed
+        if self.dx > 0:
+            self.dx += speed
+        else:
+            self.dx -= speed
+
+        if self.dy > 0:
+            self.dy += speed
+        else:
+            self.dy -= speed
+
+    def adjust_dx(self, difference):
+        """
+        Adjusts the horizontal velocity of the ball based on where it hit the paddle.
+
+        Args:
+            difference (float): The difference between the ball's x-coordinate and the paddle's x-coordinate.
+        """
+        # This adjustment factor controls how much the ball's direction changes
+        adjustment_factor = 0.1
+        self.dx += difference * adjustment_factor
+        # Limit the dx to prevent the ball from moving too horizontally
+        max_dx = self.speed * 2
+        if self.dx > max_dx:
+            self.dx = max_dx
+        elif self.dx < -max_dx:
+            self.dx = -max_dx
+
+
+class PaddleBody:
+    """
+    The physics state of the paddle, with no display attached.
+
+    Attributes:
+        screen_height (int): The height of the game screen.
+        x (float): The x-coordinate of the paddle.
+        y (float): The y-coordinate of the paddle.
+        speed (float): The top speed of the paddle while steered, in units per tick.
+        acceleration (float): The speed the paddle gains every tick it is steered.
+        vx (float): The current velocity of the paddle, in units per tick.
+
+    Methods:
+        move_left(): Moves the paddle to the left.
+        move_right(): Moves the paddle to the right.
+        steer(direction): Accelerates the paddle in a direction, or stops it, and moves it by one tick.
+        reset(): Resets the paddle position to the bottom center of the screen.
+    """
+
+    __slots__ = ("screen_height", "speed", "acceleration", "x", "y", "vx")
+
+    def __init__(self, screen_height=SCREEN_HEIGHT, speed=PADDLE_SPEED, acceleration=PADDLE_ACCELERATION):
+        """
+        Initializes a PaddleBody at the bottom center of the screen.
+
+        Parameters:
+        screen_height (int): The height of the game screen.
+        speed (float): The top speed of the paddle while steered, in units per tick.
+        acceleration (float): The speed the paddle gains every tick it is steered.
+        """
+        self.screen_height = screen_height
+        self.speed = speed
+        self.acceleration = acceleration
+        self.x = 0.0
+        self.y = -screen_height / 2 + 20
+        self.vx = 0.0
+
+    def move_left(self):
+        """
+        Move the paddle to the left by PADDLE_STEP units, stopping at the left border.
+        """
+        x = self.x - PADDLE_STEP
+        if x < -PADDLE_LIMIT_X:
+            x = -PADDLE_LIMIT_X
+        self.x = x
+
+    def move_right(self):
+        """
+        Move the paddle to the right by PADDLE_STEP units, stopping at the right border.
+        """
+        x = self.x + PADDLE_STEP
+        if x > PADDLE_LIMIT_X:
+            x = PADDLE_LIMIT_X
+        self.x = x
+
+    def steer(self, direction):
+        """
+        Moves the paddle by one tick of steering.
+
+        While steered the paddle speeds up by `acceleration` per tick up to `speed`;
+        it stops as soon as it is no longer steered, and turning around starts from rest.
+        With `acceleration` equal to `speed` the paddle moves at full speed straight away.
+
+        Parameters:
+        direction (int): MOVE_LEFT, MOVE_RIGHT or MOVE_NONE.
+        """
+        if direction == MOVE_NONE:
+            self.vx = 0.0
+            return
+        vx = self.vx if self.vx * direction > 0 else 0.0
+        vx += direction * self.acceleration
+        if vx > self.speed:
+            vx = self.speed
+        elif vx < -self.speed:
+            vx = -self.speed
+        x = self.x + vx
+        if x < -PADDLE_LIMIT_X:
+            x = -PADDLE_LIMIT_X
+            vx = 0.0
+        elif x > PADDLE_LIMIT_X:
+            x = PADDLE_LIMIT_X
+            vx = 0.0
+        self.x = x
+        self.vx = vx
+
+    def reset(self):
+        """
+        Resets the position of the paddle to the starting position.
+        """
+        self.x = 0.0
+        self.y = -self.screen_height / 2 + 20
+        self.vx = 0.0
+
+
+class Simulation:
+    """
+    The Breakout game rules in pure Python, runnable without turtle or Tk.
+
+    The simulation owns the ball, paddle and bricks and advances them one frame
+    per call to `step()`. Every gameplay change is reported as an event so that
+    a view (the turtle window, a recorder, a test) can react to it.
+
+    Events are `(name, payload)` tuples:
+    - ("paddle", None): The ball bounced off the paddle.
+    - ("brick", index): The ball destroyed the brick in the given cell of `bricks`.
+    - ("ball_lost", None): The ball fell below the paddle and a life was lost.
+    - ("game_over", None): No lives are left.
+    - ("level_up", None): The wall was cleared and a new level started.
+
+    Attributes:
+    - rng: The random number generator used for brick colors.
+    - levels: The LevelPack the walls come from, or None to generate them.
+    - ball: The BallBody.
+    - paddle: The PaddleBody.
+    - bricks: The BrickGrid that stores the wall as arrays.
+    - floors: The number of rows of bricks.
+    - columns: The number of columns of bricks.
+    - score: The current score.
+    - lives: The number of lives remaining.
+    - level: The current level.
+    - start_floors: The number of rows of bricks at level 1.
+    - ball_speed: The speed of the ball at level 1.
+    - speed_increase: The ball speed added on every level up.
+    - frame: The number of frames simulated since the last reset.
+    - game_over: True once the player has run out of lives.
+    - continuous: True to sweep the ball along its movement each step, False to only test where it ends up.
+    """
+
+    def __init__(
+        self,
+        seed=None,
+        screen_height=SCREEN_HEIGHT,
+        continuous=True,
+        floors=START_FLOORS,
+        columns=START_COLUMNS,
+        ball_speed=BALL_SPEED,
+        speed_increase=SPEED_INCREASE,
+        paddle_speed=PADDLE_SPEED,
+        paddle_acceleration=PADDLE_ACCELERATION,
+        levels=None,
+    ):
+        """
+        Initializes the simulation and builds the first wall of bricks.
+
+        Parameters:
+            seed (int, optional): The seed for the brick color generator.
+            screen_height (int): The height of the game screen.
+            continuous (bool): Whether to use swept collision detection, see `move_ball()`.
+            floors (int): The number of rows of bricks at level 1.
+            columns (int): The number of columns of bricks.
+            ball_speed (float): The starting speed of the ball along each axis.
+            speed_increase (float): The ball speed added on every level up.
+            paddle_speed (float): The top speed of the paddle while steered, in units per tick.
+            paddle_acceleration (float): The speed the paddle gains every tick it is steered.
+            levels (LevelPack, optional): The designed levels to play, in order, starting over
+                after the last one. Without it, every wall is generated with random row colors.
+        """
+        self.continuous = continuous
+        self.rng = random.Random(seed)
+        self.levels = levels
+        self.ball = BallBody(ball_speed)
+        self.paddle = PaddleBody(screen_height, paddle_speed, paddle_acceleration)
+        self.bricks = BrickGrid()
+        self.start_floors = floors
+        self.ball_speed = ball_speed
+        self.speed_increase = speed_increase
+        self.floors = floors
+        self.columns = columns
+        self.score = 0
+        self.lives = START_LIVES
+        self.level = 1
+        self.frame = 0
+        self.game_over = False
+        self.setup_bricks()
+
+    def setup_bricks(self):
+        """
+        Builds the wall of the current level: the level's layout when playing a level
+        pack, otherwise `floors` x `columns` bricks with one random color per row.
+        """
+        if self.levels is not None:
+            self.load_level()
+            return
+        colors = [
+            "#" + "".join([self.rng.choice("0123456789ABCDEF") for j in range(6)])
+            for _ in range(self.floors)
+        ]
+        # One brick type per row
+        kinds = b"".join(bytes([row + 1]) * self.columns for row in range(self.floors))
+        self.bricks.load(self.floors, self.columns, kinds, [(color, BRICK_SCORE) for color in colors])
+
+    def load_level(self):
+        """
+        Builds the wall of the current level from the level pack.
+
+        The level's cells, one byte per cell holding 0 or the 1-based brick type, are
+        copied straight from the pack into the grid.
+        """
+        level = self.levels.level((self.level - 1) % len(self.levels))
+        self.floors = level.rows
+        self.columns = level.columns
+        self.bricks.load(level.rows, level.columns, level.cells, self.levels.types)
+
+    def reset_bricks(self):
+        """
+        Removes every brick and builds a new wall.
+        """
+        self.setup_bricks()
+
+    def reset(self, seed=None):
+        """
+        Starts a new game from level 1.
+
+        Parameters:
+            seed (int, optional): Reseeds the brick color generator when given.
+        """
+        if seed is not None:
+            self.rng.seed(seed)
+        self.floors = self.start_floors
+        self.score = 0
+        self.lives = START_LIVES
+        self.level = 1
+        self.frame = 0
+        self.game_over = False
+        self.ball.speed = self.ball_speed
+        self.ball.reset()
+        self.paddle.reset()
+        self.reset_bricks()
+
+    def step(self, inputs=MOVE_NONE):
+        """
+        Advances the game by one frame.
+
+        Parameters:
+            inputs (int): The paddle input for this frame, one of MOVE_NONE, MOVE_LEFT or MOVE_RIGHT,
+                which steers the paddle, see `PaddleBody.steer()`.
+
+        Returns:
+            list: The events produced during the frame.
+        """
+        if self.game_over:
+            return []
+        self.frame += 1
+        self.paddle.steer(inputs)
+        events = self.move_ball()
+        events += self.check_ball_lost()
+        if not self.game_over:
+            events += self.check_level_cleared()
+        return events
+
+    def move_ball(self):
+        """
+        Moves the ball by one step and resolves its collisions.
+
+        In continuous mode the ball is swept along its movement and bounces off the
+        first wall, paddle or brick it reaches, then carries on with the rest of the
+        movement, so it can't pass through anything however fast it goes. Otherwise
+        the ball jumps to its new position, which is then tested for overlaps.
+
+        Returns:
+            list: The events produced by the collisions.
+        """
+        if not self.continuous:
+            self.ball.move()
+            return self.check_collisions()
+
+        events = []
+        ball = self.ball
+        paddle = self.paddle
+        brick_xs = self.bricks.x
+        brick_ys = self.bricks.y
+        remaining = 1.0
+        for _ in range(MAX_BOUNCES):
+            dx = ball.dx * remaining
+            dy = ball.dy * remaining
+            hit = sweep_walls(ball.x, ball.y, dx, dy, BALL_LIMIT_X, BALL_LIMIT_Y)
+            target = None
+            if dy < 0:
+                paddle_hit = sweep_box(
+                    ball.x, ball.y, dx, dy,
+                    paddle.x - PADDLE_REACH_X, paddle.y - PADDLE_REACH_Y,
+                    paddle.x + PADDLE_REACH_X, paddle.y + PADDLE_REACH_Y,
+                )
+                if paddle_hit is not None and (hit is None or paddle_hit[0] < hit[0]):
+                    hit, target = paddle_hit, paddle
+            for brick in self.bricks.candidates_along(ball.x, ball.y, dx, dy, BRICK_REACH_X, BRICK_REACH_Y):
+                brick_x = brick_xs[brick]
+                brick_y = brick_ys[brick]
+                brick_hit = sweep_box(
+                    ball.x, ball.y, dx, dy,
+                    brick_x - BRICK_REACH_X, brick_y - BRICK_REACH_Y,
+                    brick_x + BRICK_REACH_X, brick_y + BRICK_REACH_Y,
+                )
+                if brick_hit is not None and (hit is None or brick_hit[0] < hit[0]):
+                    hit, target = brick_hit, brick
+
+            if hit is None:
+                ball.x += dx
+                ball.y += dy
+                break
+
+            t, axis = hit
+            ball.x += dx * t
+            ball.y += dy * t
+            remaining *= 1 - t
+            if target is paddle:
+                ball.invert_dy()
+                ball.adjust_dx(ball.x - paddle.x)
+                events.append(("paddle", None))
+                continue
+            if axis == "x":
+                ball.invert_dx()
+            else:
+                ball.invert_dy()
+            if target is not None:
+                events.append(self.destroy_brick(target))
+        return events
+
+    def check_collisions(self):
+        """
+        Checks for collisions between the ball and the paddle and bricks.
+
+        Returns:
+            list: The events produced by the collisions.
+        """
+        return self.check_paddle_collision() + self.check_brick_collision()
+
+    def check_paddle_collision(self):
+        """
+        Bounces the ball off the paddle if they overlap.
+
+        The ball's horizontal speed is adjusted based on how far from the paddle's
+        center it hit.
+
+        Returns:
+            list: A "paddle" event if the ball hit the paddle, otherwise an empty list.
+        """
+        ball = self.ball
+        diff = ball.x - self.paddle.x
+        if abs(ball.y - self.paddle.y) <= PADDLE_REACH_Y and abs(diff) < PADDLE_REACH_X:
+            ball.invert_dy()
+            ball.adjust_dx(diff)
+            return [("paddle", None)]
+        return []
+
+    def check_brick_collision(self):
+        """
+        Bounces the ball off any brick it overlaps and destroys that brick.
+
+        If the ball's center is within the brick's horizontal bounds the collision
+        is treated as vertical, otherwise as horizontal. Only the grid cells around
+        the ball are checked.
+
+        Returns:
+            list: A "brick" event for every destroyed brick.
+        """
+        events = []
+        ball = self.ball
+        brick_xs = self.bricks.x
+        for brick in self.bricks.candidates(ball.x, ball.y, BRICK_REACH_X, BRICK_REACH_Y):
+            if abs(ball.x - brick_xs[brick]) < 25:
+                ball.invert_dy()  # Vertical collision
+            else:
+                ball.invert_dx()  # Horizontal collision
+            events.append(self.destroy_brick(brick))
+        return events
+
+    def destroy_brick(self, brick):
+        """
+        Removes a brick from the wall and scores it.
+
+        Parameters:
+            brick (int): The cell index of the brick that was hit.
+
+        Returns:
+            tuple: The "brick" event for the destroyed brick.
+        """
+        self.bricks.remove(brick)
+        self.score += self.bricks.points(brick)
+        return ("brick", brick)
+
+    def check_ball_lost(self):
+        """
+        Takes a life if the ball fell below the paddle, and ends the game when no lives are left.
+
+        Returns:
+            list: A "ball_lost" or "game_over" event, or an empty list.
+        """
+        if self.ball.y < BALL_LOST_Y and self.lives > 0:
+            self.lives -= 1
+            self.ball.reset()
+            self.paddle.reset()
+            return [("ball_lost", None)]
+        elif self.lives == 0:
+            self.game_over = True
+            return [("game_over", None)]
+        return []
+
+    def check_level_cleared(self):
+        """
+        Starts the next level once every brick has been destroyed.
+
+        Returns:
+            list: A "level_up" event if the level was cleared, otherwise an empty list.
+        """
+        if len(self.bricks) == 0:
+            self.level_up()
+            self.ball.reset()
+            self.reset_bricks()
+            return [("level_up", None)]
+        return []
+
+    def level_up(self):
+        """
+        Increases the level, ball speed, and number of floors (every 2 levels).
+        A level pack sets the number of floors of its own levels.
+        """
+        self.level += 1
+        self.ball.increase_speed(self.speed_increase)
+        # every 2 levels, increase the number of floors by 1
+        if self.level % 2 == 0:
+            self.floors += 1
+
+
+def track_ball(simulation, offset=0.0):
+    """
+    A simple scripted paddle policy that keeps the paddle under the ball.
+
+    Parameters:
+        simulation (Simulation): The simulation to read the ball and paddle from.
+        offset (float): Where to catch the ball, relative to the paddle's center.
+            Catching it off center changes the angle it bounces back at.
+
+    Returns:
+        int: MOVE_LEFT, MOVE_RIGHT or MOVE_NONE.
+    """
+    offset = simulation.ball.x - offset - simulation.paddle.x
+    if offset < -PADDLE_STEP / 2:
+        return MOVE_LEFT
+    if offset > PADDLE_STEP / 2:
+        return MOVE_RIGHT
+    return MOVE_NONE
+
+
+# Run a headless game with the scripted paddle and report the frame rate
+if __name__ == "__main__":
+    import time
+
+    simulation = Simulation(seed=0)
+    frames = 100000
+    start = time.perf_counter()
+    for _ in range(frames):
+        if simulation.game_over:
+            simulation.reset()
+        simulation.step(track_ball(simulation))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{frames} frames in {elapsed:.2f}s ({frames / elapsed:.0f} frames/s), "
+        f"level {simulation.level}, score {simulation.score}"
+    )
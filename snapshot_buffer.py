@@ -0,0 +1,280 @@
+import struct
+
+# ball x, y, dx, dy, speed, paddle x, vx, clock time, score, frame, lives, level, floors, columns, bricks alive, game over
+STATE = struct.Struct("<8dqqiiiii?")
+REWIND_SECONDS = 5
+
+
+class SnapshotBuffer:
+    """
+    The last states of a Simulation, kept in a preallocated ring buffer for rewinding.
+
+    Every snapshot is the whole game state: the ball, the paddle, the alive flag of
+    every brick, the score, lives, level, floors and frame, and the time of a game
+    clock if one is given. The fixed-size part is packed into one bytearray and the
+    alive flags into another, slot by slot, so saving a snapshot allocates nothing
+    and saving or restoring one costs a copy of the state and no more.
+
+    The wall itself (its size, brick types and the color generator's state) only
+    changes when a new wall is built. It is kept by reference with the snapshots
+    taken from it, and only copied when a new wall is first seen.
+
+    Seeking moves a read cursor and leaves the snapshots alone: after going back,
+    the game can go forward again to any newer snapshot. The snapshots newer than
+    the cursor are only dropped when a new one is saved, i.e. once the game carries
+    on from the point it was taken back to.
+
+    Attributes:
+        simulation (Simulation): The simulation whose states are kept.
+        clock (FrameClock): The game clock whose time is kept, or None.
+        capacity (int): The number of snapshots kept; older ones are overwritten.
+        cells (int): The number of alive flags each slot has room for.
+        states (bytearray): The fixed-size part of every slot.
+        alive (bytearray): The alive flags of every slot.
+        walls (list): The wall of every slot, as (rows, columns, kinds, types, rng state).
+        start (int): The slot of the oldest snapshot.
+        count (int): The number of snapshots kept.
+        position (int): The age of the snapshot the simulation was last put back to:
+            0 for the newest, or the number of newer snapshots after seeking back.
+        wall (tuple): The wall of the simulation as last seen.
+        wall_kinds (bytearray): The simulation's brick types array the wall was copied from.
+
+    Methods:
+        save(): Takes a snapshot of the current state, dropping any newer than the cursor.
+        restore(age): Puts the simulation back in a kept state.
+        rewind(ticks): Goes back a number of ticks from the cursor.
+        forward(ticks): Goes forward a number of ticks from the cursor, toward the newest snapshot.
+        seek(age): Moves the cursor to a kept snapshot.
+        clear(): Forgets every snapshot.
+    """
+
+    def __init__(self, simulation, capacity, clock=None):
+        """
+        Initializes an empty SnapshotBuffer.
+
+        Parameters:
+            simulation (Simulation): The simulation whose states are kept.
+            capacity (int): The number of snapshots to keep, e.g. REWIND_SECONDS times the tick rate.
+            clock (FrameClock, optional): A game clock whose time is saved and restored with the game.
+        """
+        self.simulation = simulation
+        self.clock = clock
+        self.capacity = capacity
+        self.cells = max(len(simulation.bricks.alive), 1)
+        self.states = bytearray(STATE.size * capacity)
+        self.alive = bytearray(self.cells * capacity)
+        self.walls = [None] * capacity
+        self.start = 0
+        self.count = 0
+        self.position = 0
+        self.wall = None
+        self.wall_kinds = None
+
+    def save(self):
+        """
+        Takes a snapshot of the current state, overwriting the oldest one when the buffer is full.
+
+        After seeking back, the snapshots newer than the cursor are dropped first: the
+        game carries on from there, so they no longer follow from it.
+        """
+        if self.position:
+            self.count -= self.position
+            self.position = 0
+        simulation = self.simulation
+        bricks = simulation.bricks
+        if bricks.kinds is not self.wall_kinds:
+            # A new wall was built: the grid gets a new kinds array every time
+            self.wall = (bricks.rows, bricks.columns, bytes(bricks.kinds), bricks.types, simulation.rng.getstate())
+            self.wall_kinds = bricks.kinds
+            if len(bricks.alive) > self.cells:
+                self.grow(len(bricks.alive))
+
+        if self.count < self.capacity:
+            slot = (self.start + self.count) % self.capacity
+            self.count += 1
+        else:
+            slot = self.start
+            self.start = (self.start + 1) % self.capacity
+
+        ball = simulation.ball
+        paddle = simulation.paddle
+        STATE.pack_into(
+            self.states,
+            slot * STATE.size,
+            ball.x,
+            ball.y,
+            ball.dx,
+            ball.dy,
+            ball.speed,
+            paddle.x,
+            paddle.vx,
+            self.clock.time if self.clock is not None else 0.0,
+            simulation.score,
+            simulation.frame,
+            simulation.lives,
+            simulation.level,
+            simulation.floors,
+            simulation.columns,
+            bricks.count,
+            simulation.game_over,
+        )
+        offset = slot * self.cells
+        self.alive[offset : offset + len(bricks.alive)] = bricks.alive
+        self.walls[slot] = self.wall
+
+    def restore(self, age=0):
+        """
+        Puts the simulation, and the clock if any, back in a kept state.
+
+        The snapshots are kept, so the same state can be restored again.
+
+        Parameters:
+            age (int): Which snapshot to restore: 0 for the newest, 1 for the one before, and so on.
+
+        Returns:
+            bool: False if there is no snapshot that old, True otherwise.
+        """
+        if not 0 <= age < self.count:
+            return False
+        slot = (self.start + self.count - 1 - age) % self.capacity
+        simulation = self.simulation
+        ball = simulation.ball
+        paddle = simulation.paddle
+        bricks = simulation.bricks
+        (
+            ball.x,
+            ball.y,
+            ball.dx,
+            ball.dy,
+            ball.speed,
+            paddle.x,
+            paddle.vx,
+            time,
+            simulation.score,
+            simulation.frame,
+            simulation.lives,
+            simulation.level,
+            simulation.floors,
+            simulation.columns,
+            count,
+            simulation.game_over,
+        ) = STATE.unpack_from(self.states, slot * STATE.size)
+
+        wall = self.walls[slot]
+        if wall is not self.wall or bricks.kinds is not self.wall_kinds:
+            rows, columns, kinds, types, rng_state = wall
+            bricks.load(rows, columns, kinds, types)
+            simulation.rng.setstate(rng_state)
+            self.wall = wall
+            self.wall_kinds = bricks.kinds
+        offset = slot * self.cells
+        bricks.alive[:] = self.alive[offset : offset + len(bricks.alive)]
+        bricks.count = count
+        bricks.version += 1
+        if self.clock is not None:
+            self.clock.time = time
+        return True
+
+    def rewind(self, ticks):
+        """
+        Goes back `ticks` ticks from the cursor, or as far as the buffer goes.
+
+        The newer snapshots are kept until the next `save()`, so `forward()` can undo this.
+
+        Parameters:
+            ticks (int): The number of ticks to go back.
+
+        Returns:
+            int: The number of ticks actually gone back.
+        """
+        return self.seek(min(self.position + ticks, self.count - 1))
+
+    def forward(self, ticks):
+        """
+        Goes forward `ticks` ticks from the cursor, or up to the newest snapshot.
+
+        Parameters:
+            ticks (int): The number of ticks to go forward.
+
+        Returns:
+            int: The number of ticks actually gone forward.
+        """
+        return -self.seek(max(self.position - ticks, 0))
+
+    def seek(self, age):
+        """
+        Moves the cursor to a kept snapshot and restores it.
+
+        Parameters:
+            age (int): The snapshot to go to: 0 for the newest, 1 for the one before, and so on.
+
+        Returns:
+            int: How many ticks back from the cursor the snapshot is, negative if it is newer.
+        """
+        moved = age - self.position
+        if moved == 0 or not self.restore(age):
+            return 0
+        self.position = age
+        return moved
+
+    def clear(self):
+        """
+        Forgets every snapshot.
+        """
+        self.start = 0
+        self.count = 0
+        self.position = 0
+        self.wall = None
+        self.wall_kinds = None
+
+    def grow(self, cells):
+        """
+        Makes room for more alive flags in every slot, keeping the snapshots.
+
+        Parameters:
+            cells (int): The number of flags each slot must hold.
+        """
+        alive = bytearray(cells * self.capacity)
+        for slot in range(self.capacity):
+            alive[slot * cells : slot * cells + self.cells] = self.alive[slot * self.cells : (slot + 1) * self.cells]
+        self.alive = alive
+        self.cells = cells
+
+    def __len__(self):
+        """
+        Returns the number of snapshots kept.
+        """
+        return self.count
+
+
+# Play a headless game, rewinding now and then, and report the cost of a snapshot
+if __name__ == "__main__":
+    import time
+
+    from simulation import Simulation, track_ball
+
+    simulation = Simulation(seed=0)
+    snapshots = SnapshotBuffer(simulation, REWIND_SECONDS * 120)
+    frames = 50000
+    start = time.perf_counter()
+    for _ in range(frames):
+        if simulation.game_over:
+            simulation.reset()
+            snapshots.clear()
+        simulation.step(track_ball(simulation))
+        snapshots.save()
+    elapsed = time.perf_counter() - start
+
+    count = 100000
+    start = time.perf_counter()
+    for _ in range(count):
+        snapshots.save()
+    saved = time.perf_counter() - start
+    start = time.perf_counter()
+    for age in range(count):
+        snapshots.restore(age % len(snapshots))
+    restored = time.perf_counter() - start
+    print(
+        f"{frames} frames with snapshots in {elapsed:.2f}s; "
+        f"save {saved / count * 1e6:.2f} us, restore {restored / count * 1e6:.2f} us"
+    )
@@ -1,5 +1,7 @@
 import os
-import pygame
+import queue
+import threading
+import time
 
 CURRENT_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
 BALL_LOST_SOUND = os.path.join(CURRENT_DIRECTORY, "assets", "sounds", "ball_lost.wav")
@@ -8,41 +10,237 @@ GAME_OVER_SOUND = os.path.join(CURRENT_DIRECTORY, "assets", "sounds", "game_over
 LEVEL_UP_SOUND = os.path.join(CURRENT_DIRECTORY, "assets", "sounds", "levelup.wav")
 PADDLE_SOUND = os.path.join(CURRENT_DIRECTORY, "assets", "sounds", "paddle.wav")
 
+MAX_VOICES = 2  # Copies of one sound allowed to play at the same time
+MIN_INTERVAL = 0.05  # Seconds before the same sound may start again
+
+
+class PygameBackend:
+    """
+    Plays sounds through the pygame mixer.
+
+    pygame is imported by `init()` rather than when this module is loaded, as
+    importing it takes longer than the rest of the game's startup put together.
+
+    Attributes:
+    - mixer: The pygame.mixer module, once initialized.
+
+    Methods:
+    - init(): Initializes the mixer.
+    - load(sound_path): Decodes a sound file.
+    """
+
+    def __init__(self):
+        """
+        Initializes the PygameBackend without importing pygame.
+        """
+        self.mixer = None
+
+    def init(self):
+        """
+        Imports pygame and initializes the mixer with the specified frequency, size, channels, and buffer.
+
+        Raises:
+        ImportError: If pygame is not installed.
+        pygame.error: If there is no usable audio device.
+        """
+        import pygame
+
+        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+        self.mixer = pygame.mixer
+
+    def load(self, sound_path):
+        """
+        Decodes a sound file.
+
+        Parameters:
+        - sound_path (str): The path to the sound file.
+
+        Returns:
+        pygame.mixer.Sound: The decoded sound.
+        """
+        return self.mixer.Sound(sound_path)
+
+
+class NullSound:
+    """
+    A sound that plays nothing.
+    """
+
+    def set_volume(self, volume):
+        """
+        Ignores the volume.
+        """
+
+    def get_num_channels(self):
+        """
+        Returns 0, as a silent sound never occupies a channel.
+        """
+        return 0
+
+    def play(self):
+        """
+        Plays nothing.
+        """
+
+
+class NullBackend:
+    """
+    An audio backend for hosts with no audio device: every sound is silent.
+
+    Methods:
+    - init(): Does nothing.
+    - load(sound_path): Returns a NullSound.
+    """
+
+    def init(self):
+        """
+        Does nothing.
+        """
+
+    def load(self, sound_path):
+        """
+        Returns a silent sound without reading the file.
+
+        Parameters:
+        - sound_path (str): The path to the sound file.
+
+        Returns:
+        NullSound: The silent sound.
+        """
+        return NullSound()
+
 
 class SoundManager:
     """
     A class that manages sound effects for a game.
 
+    Audio setup and sound decoding can be slow, so by default they happen on a
+    background thread: sounds are registered straight away and become playable
+    once they are decoded. Playing a sound that isn't ready yet is skipped rather
+    than waited for. If pygame is missing or the audio device can't be opened, the
+    manager falls back to the silent NullBackend.
+
+    Every sound has a voice limit, the number of copies that may play at the same
+    time, and a minimum interval before it may start again; requests beyond those
+    are dropped so that bursts of collisions don't use up the mixer channels. The
+    game queues sounds with `queue_sound()` while it runs a frame and plays them
+    with `flush()` afterwards, so each sound starts at most once per frame.
+
     Attributes:
+    - backend: The audio backend, PygameBackend or NullBackend.
     - sounds (dict): A dictionary that stores the loaded sound effects.
+    - pending (set): The names of the sounds registered but not loaded yet.
+    - ready (threading.Event): Set once the audio backend is initialized.
+    - requests (queue.Queue): The sounds waiting to be loaded by the background thread.
+    - loader (threading.Thread): The background thread, or None when loading in the foreground.
+    - limits (dict): The (max voices, min interval) of the sounds with their own limits.
+    - last_played (dict): When each sound was last started, from time.monotonic().
+    - queued (dict): The sounds queued since the last flush, in the order they were first queued.
 
     Methods:
-    - __init__(): Initializes the SoundManager object.
+    - __init__(backend=None, background=True, start=True): Initializes the SoundManager object.
+    - start(): Starts the background thread.
+    - register_sound(name, sound_path, volume=0.5): Registers a sound to be loaded.
     - load_sound(name, sound_path, volume=0.5): Loads a sound file and stores it in the sound manager.
+    - wait_until_loaded(): Waits for every registered sound to be loaded.
+    - set_limits(name, max_voices, min_interval): Sets the voice limit and retrigger interval of a sound.
     - play_sound(name): Plays the sound with the given name.
+    - queue_sound(name): Queues a sound to be played by the next flush.
+    - flush(): Plays the queued sounds.
     """
 
-    def __init__(self):
+    def __init__(self, backend=None, background=True, start=True):
         """
         Initializes the SoundManager object.
 
-        This method initializes the SoundManager object by initializing the mixer module
-        with the specified frequency, size, channels, and buffer. It also initializes
-        an empty dictionary to store the sounds.
+        This method initializes the audio backend, on a background thread unless
+        `background` is False, and initializes an empty dictionary to store the sounds.
 
         Parameters:
-            None
+            backend (optional): The audio backend. Defaults to PygameBackend.
+            background (bool): Whether to initialize the backend and load sounds on a background thread.
+            start (bool): Whether to start the background thread now. If False, sounds
+                registered before `start()` is called wait for it.
 
         Returns:
             None
         """
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+        self.backend = backend if backend is not None else PygameBackend()
         self.sounds = {}
+        self.pending = set()
+        self.ready = threading.Event()
+        self.requests = queue.Queue()
+        self.loader = None
+        self.limits = {}
+        self.last_played = {}
+        self.queued = {}
+        if background:
+            self.loader = threading.Thread(target=self.load_in_background, name="sound-loader", daemon=True)
+            if start:
+                self.start()
+        else:
+            self.init_backend()
+
+    def start(self):
+        """
+        Starts the background thread, if it isn't running yet.
+        """
+        if self.loader is not None and self.loader.ident is None:
+            self.loader.start()
+
+    def init_backend(self):
+        """
+        Initializes the audio backend, falling back to the NullBackend if there is no audio device.
+        """
+        try:
+            self.backend.init()
+        except (ImportError, RuntimeError) as error:  # pygame.error is a RuntimeError
+            print(f"Audio unavailable ({error}), playing without sound.")
+            self.backend = NullBackend()
+        self.ready.set()
+
+    def load_in_background(self):
+        """
+        Initializes the audio backend, then loads registered sounds as they arrive. Runs on the loader thread.
+        """
+        self.init_backend()
+        while True:
+            name, sound_path, volume = self.requests.get()
+            try:
+                self.load_sound(name, sound_path, volume)
+            except Exception as error:  # A bad file must not stop the other sounds from loading
+                self.pending.discard(name)
+                print(f"Could not load sound '{name}': {error}")
+            finally:
+                self.requests.task_done()
+
+    def register_sound(self, name, sound_path, volume=0.5):
+        """
+        Registers a sound to be loaded without waiting for it.
+
+        The sound is loaded on the background thread, or straight away when the
+        manager was created with `background=False`.
+
+        Parameters:
+        - name (str): The name to associate with the sound.
+        - sound_path (str): The path to the sound file.
+        - volume (float, optional): The volume level of the sound (default is 0.5).
+
+        Returns:
+        None
+        """
+        if self.loader is None:
+            self.load_sound(name, sound_path, volume)
+            return
+        self.pending.add(name)
+        self.requests.put((name, sound_path, volume))
 
     def load_sound(self, name, sound_path, volume=0.5):
         """
         Load a sound file and store it in the sound manager.
 
+        This blocks until the audio backend is initialized and the file is decoded.
+
         Parameters:
         - name (str): The name to associate with the loaded sound.
         - sound_path (str): The path to the sound file.
@@ -50,22 +248,87 @@ class SoundManager:
 
         Returns:
         None
+
+        Raises:
+        RuntimeError: If the backend is initialized on the background thread and `start()` wasn't called yet,
+            since waiting for it would block forever.
         """
-        sound = pygame.mixer.Sound(sound_path)
+        if not self.ready.is_set() and self.loader is not None and self.loader.ident is None:
+            raise RuntimeError("The sound manager's background thread isn't started; call start() first.")
+        self.ready.wait()
+        sound = self.backend.load(sound_path)
         sound.set_volume(volume)
         self.sounds[name] = sound
+        self.pending.discard(name)
+
+    def wait_until_loaded(self):
+        """
+        Waits until every registered sound has been loaded.
+        """
+        if self.loader is not None:
+            self.requests.join()
+
+    def set_limits(self, name, max_voices=MAX_VOICES, min_interval=MIN_INTERVAL):
+        """
+        Sets how many copies of a sound may play at once and how soon it may start again.
+
+        Parameters:
+        - name (str): The name of the sound.
+        - max_voices (int): The number of copies that may play at the same time.
+        - min_interval (float): The seconds before the sound may start again.
+
+        Returns:
+        None
+        """
+        self.limits[name] = (max_voices, min_interval)
 
     def play_sound(self, name):
         """
         Plays the sound with the given name.
 
+        A sound that is registered but still loading is skipped, and so is a sound
+        that is already playing on all its voices or was started too recently.
+
         Parameters:
         - name (str): The name of the sound to be played.
 
         Returns:
         None
         """
-        if name in self.sounds:
-            self.sounds[name].play()
-        else:
-            print(f"Sound '{name}' not loaded.")
+        sound = self.sounds.get(name)
+        if sound is None:
+            if name not in self.pending:
+                print(f"Sound '{name}' not loaded.")
+            return
+        max_voices, min_interval = self.limits.get(name, (MAX_VOICES, MIN_INTERVAL))
+        now = time.monotonic()
+        if now - self.last_played.get(name, -min_interval) < min_interval:
+            return
+        if sound.get_num_channels() >= max_voices:
+            return
+        self.last_played[name] = now
+        sound.play()
+
+    def queue_sound(self, name):
+        """
+        Queues a sound to be played by the next `flush()`. Queuing a sound again before then has no effect.
+
+        Parameters:
+        - name (str): The name of the sound to be played.
+
+        Returns:
+        None
+        """
+        self.queued[name] = True
+
+    def flush(self):
+        """
+        Plays the sounds queued since the last flush, each at most once.
+
+        Returns:
+        None
+        """
+        if self.queued:
+            for name in self.queued:
+                self.play_sound(name)
+            self.queued.clear()
@@ -0,0 +1,102 @@
+import turtle
+
+from ball import Ball
+from brick import Brick
+from dashboard import FONT
+from paddle import Paddle
+from simulation import SCREEN_HEIGHT
+
+# Brick colors are not streamed, so every row gets one of these instead
+ROW_COLORS = ("red", "orange", "yellow", "green", "blue", "purple")
+
+
+class SpectatorView:
+    """
+    Draws a streamed game, as rebuilt by a SnapshotDecoder, in a turtle window.
+
+    The ball and paddle are the game's own views of the decoder's bodies. The bricks
+    are stamps of a single hidden Brick, as in BrickWall, colored by row since the
+    server only sends which bricks are alive. They are redrawn from scratch after a
+    keyframe, and otherwise only the cells whose flag flipped are stamped or erased.
+
+    Attributes:
+        state (SnapshotDecoder): The game state to draw.
+        screen: The turtle screen object.
+        ball (Ball): The ball.
+        paddle (Paddle): The paddle.
+        stamper (Brick): The hidden brick used to stamp the wall.
+        stamps (dict): A dict mapping the cell index of each drawn brick to its stamp id.
+        alive (bytes): The alive flags of the bricks drawn.
+        keyframes (int): The number of keyframes the drawn wall is up to date with.
+        version (int): The version of the decoder's wall that was drawn.
+        status (turtle.Turtle): The turtle that writes the score, lives and level.
+        status_text (str): The text written by `status`.
+
+    Methods:
+        render(): Draws the current state and updates the screen.
+    """
+
+    def __init__(self, state, title="Breakout Spectator"):
+        """
+        Opens the window and draws the state.
+
+        Parameters:
+            state (SnapshotDecoder): The game state to draw.
+            title (str): The title of the window.
+        """
+        self.state = state
+        self.screen = turtle.Screen()
+        self.screen.title(title)
+        self.screen.bgcolor("black")
+        self.screen.setup(width=800, height=SCREEN_HEIGHT)
+        self.screen.tracer(0)  # Only draw on render()
+        self.ball = Ball(state.ball)
+        self.paddle = Paddle(SCREEN_HEIGHT, state.paddle)
+        self.stamper = Brick("black", 0, 0)
+        self.stamper.destroy()
+        self.stamps = {}
+        self.alive = b""
+        self.keyframes = 0
+        self.version = None
+        self.status = turtle.Turtle()
+        self.status.speed(0)
+        self.status.color("white")
+        self.status.penup()
+        self.status.hideturtle()
+        self.status.goto(-380, 260)
+        self.status_text = None
+        self.render()
+
+    def render(self):
+        """
+        Draws the current state of the game and updates the screen.
+        """
+        state = self.state
+        self.ball.sync()
+        self.paddle.sync()
+        bricks = state.bricks
+        if state.keyframes != self.keyframes:
+            self.stamper.brick.clearstamps()
+            self.stamps.clear()
+            self.alive = bytes(len(bricks.alive))
+            self.keyframes = state.keyframes
+            self.version = None
+        if bricks.version != self.version:
+            alive = bytes(bricks.alive)
+            for index, (old, new) in enumerate(zip(self.alive, alive)):
+                if old == new:
+                    continue
+                if new:
+                    color = ROW_COLORS[index // bricks.columns % len(ROW_COLORS)]
+                    self.stamps[index] = self.stamper.stamp(color, bricks.x[index], bricks.y[index])
+                else:
+                    self.stamper.brick.clearstamp(self.stamps.pop(index))
+            self.alive = alive
+            self.version = bricks.version
+
+        text = f"Score: {state.score}    Lives: {state.lives}    Level: {state.level}"
+        if text != self.status_text:
+            self.status.clear()
+            self.status.write(text, align="left", font=FONT)
+            self.status_text = text
+        self.screen.update()
@@ -0,0 +1,8 @@
+from batch_runner import GameSettings, play_game
+
+
+def test_speed_increase_changes_the_outcome():
+    results = [play_game(GameSettings(3, 2, 10, 2.0, increase, 0.97, 10, 200000)) for increase in (0.0, 3.0)]
+    slow, fast = results
+    assert slow.level > fast.level
+    assert slow.frames != fast.frames
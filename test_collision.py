@@ -0,0 +1,75 @@
+import pytest
+
+from collision import sweep_box, sweep_walls
+
+# A 20 x 10 box centered on (0, 50)
+BOX = (-10, 45, 10, 55)
+
+
+@pytest.mark.parametrize(
+    "x, y, dx, dy, expected",
+    [
+        (0, 30, 0, 20, (0.75, "y")),  # straight up into the bottom face
+        (0, 70, 0, -20, (0.75, "y")),  # straight down into the top face
+        (-30, 50, 40, 0, (0.5, "x")),  # from the left into the left face
+        (30, 50, -40, 0, (0.5, "x")),  # from the right into the right face
+        (-20, 40, 20, 20, (0.5, "x")),  # diagonally, reaching the side last
+        (-15, 35, 20, 20, (0.5, "y")),  # diagonally, reaching the bottom last
+        (0, 50, 5, 5, (0.0, "y")),  # starting inside, nearer the bottom than the side
+    ],
+)
+def test_sweep_box_hits(x, y, dx, dy, expected):
+    t, axis = sweep_box(x, y, dx, dy, *BOX)
+    assert t == pytest.approx(expected[0])
+    assert axis == expected[1]
+
+
+@pytest.mark.parametrize(
+    "x, y, dx, dy",
+    [
+        (0, 30, 0, 10),  # stops short of the box
+        (0, 30, 0, -20),  # moving away
+        (30, 30, 0, 40),  # passes beside the box
+        (-30, 60, 60, 0),  # passes above the box
+        (-30, 55, 60, 0),  # slides along the top edge
+        (10, 50, 0, 20),  # slides along the right edge
+        (0, 55, 0, 10),  # starts on the top edge, moving away
+        (0, 30, 0, 0),  # not moving
+    ],
+)
+def test_sweep_box_misses(x, y, dx, dy):
+    assert sweep_box(x, y, dx, dy, *BOX) is None
+
+
+def test_sweep_box_end_on_edge_hits():
+    assert sweep_box(0, 30, 0, 15, *BOX) == (1.0, "y")
+
+
+@pytest.mark.parametrize(
+    "x, y, dx, dy, expected",
+    [
+        (90, 0, 20, 0, (0.5, "x")),  # right wall
+        (-90, 0, -20, 0, (0.5, "x")),  # left wall
+        (0, 90, 0, 20, (0.5, "y")),  # top wall
+        (95, 90, 10, 40, (0.25, "y")),  # top wall before the side wall
+        (95, 95, 10, 10, (0.5, "x")),  # side wall before the top wall
+        (105, 0, 5, 0, (0.0, "x")),  # already past the wall
+    ],
+)
+def test_sweep_walls_hits(x, y, dx, dy, expected):
+    t, axis = sweep_walls(x, y, dx, dy, 100, 100)
+    assert t == pytest.approx(expected[0])
+    assert axis == expected[1]
+
+
+@pytest.mark.parametrize(
+    "x, y, dx, dy",
+    [
+        (0, 0, 10, 10),  # stays inside
+        (90, 0, -20, 0),  # moving away from the wall
+        (0, -90, 0, -50),  # there is no bottom wall
+        (90, 0, 10, 0),  # ends exactly on the wall
+    ],
+)
+def test_sweep_walls_misses(x, y, dx, dy):
+    assert sweep_walls(x, y, dx, dy, 100, 100) is None
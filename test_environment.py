@@ -0,0 +1,37 @@
+import numpy as np
+
+from autoplay import AutoplayAgent
+from environment import ACTIONS, BreakoutEnv, VectorBreakoutEnv
+
+GAMES = 4
+SETTINGS = {"floors": 1, "columns": 4, "ball_speed": 8, "max_steps": 2000, "life_penalty": 5}
+
+
+def test_vector_games_match_single_games():
+    # Small walls, a fast ball and a jittery agent, so games level up, lose balls and end within the run
+    rng = np.random.default_rng(1)
+    envs = [BreakoutEnv(**SETTINGS) for _ in range(GAMES)]
+    observations = np.stack([env.reset(seed=game) for game, env in enumerate(envs)])
+    agents = [AutoplayAgent(env.simulation, jitter=25, seed=game) for game, env in enumerate(envs)]
+    vector = VectorBreakoutEnv(GAMES, **SETTINGS)
+    assert np.array_equal(vector.reset(), observations)
+
+    finished = 0
+    level = 1
+    for _ in range(3000):
+        actions = np.array(
+            [ACTIONS.index(agent.act()) if rng.random() < 0.97 else rng.integers(3) for agent in agents]
+        )
+        results = [env.step(action) for env, action in zip(envs, actions)]
+        vector_observations, rewards, dones, info = vector.step(actions)
+        assert np.array_equal(dones, [result[2] for result in results])
+        assert np.allclose(rewards, [result[1] for result in results])
+        assert np.array_equal(info["score"], [result[3]["score"] for result in results])
+        level = max(level, *(result[3]["level"] for result in results))
+        observations = np.stack([result[0] for result in results])
+        for game in np.flatnonzero(dones):
+            observations[game] = envs[game].reset()
+            finished += 1
+        assert np.array_equal(vector_observations, observations)
+    assert finished >= GAMES
+    assert level > 2
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from game_server import (
+    LENGTH,
+    MAX_DELTA_CELLS,
+    PLAYER,
+    SPECTATOR,
+    GameClient,
+    GameServer,
+    SnapshotDecoder,
+    encode_delta,
+    encode_keyframe,
+    pack_mask,
+    take_snapshot,
+    unpack_mask,
+)
+from simulation import MOVE_RIGHT, Simulation, track_ball
+
+
+def unframe(message):
+    """
+    Strips the length off a framed message, checking that it matches.
+    """
+    (length,) = LENGTH.unpack_from(message)
+    assert length == len(message) - LENGTH.size
+    return message[LENGTH.size :]
+
+
+def assert_decoded(decoder, snapshot):
+    """
+    Checks that a decoder holds the state of a snapshot.
+    """
+    assert decoder.tick == snapshot.tick
+    assert (decoder.ball.x, decoder.ball.y) == (snapshot.ball_x, snapshot.ball_y)
+    assert (decoder.ball.dx, decoder.ball.dy) == (snapshot.ball_dx, snapshot.ball_dy)
+    assert decoder.paddle.x == snapshot.paddle_x
+    assert (decoder.score, decoder.lives, decoder.level) == (snapshot.score, snapshot.lives, snapshot.level)
+    assert (decoder.bricks.rows, decoder.bricks.columns) == (snapshot.rows, snapshot.columns)
+    assert bytes(decoder.bricks.alive) == snapshot.alive
+    assert decoder.bricks.count == snapshot.alive.count(1)
+
+
+@pytest.mark.parametrize("cells", [0, 1, 7, 8, 9, 100])
+def test_mask_round_trip(cells):
+    alive = bytes((index * 7 + 3) % 5 % 2 for index in range(cells))
+    packed = pack_mask(alive)
+    assert len(packed) == (cells + 7) // 8
+    assert unpack_mask(packed, cells) == alive
+
+
+def test_keyframe_round_trip():
+    simulation = Simulation(seed=1)
+    for _ in range(500):
+        simulation.step(track_ball(simulation))
+    snapshot = take_snapshot(simulation, 42)
+    decoder = SnapshotDecoder()
+    decoder.apply(unframe(encode_keyframe(snapshot)))
+    assert_decoded(decoder, snapshot)
+    assert decoder.keyframes == 1
+
+
+def test_deltas_follow_a_whole_game():
+    # A small wall is cleared many times, so level ups, lost balls and the game over are all streamed
+    simulation = Simulation(seed=2, floors=1, columns=3)
+    previous = take_snapshot(simulation, 0)
+    decoder = SnapshotDecoder()
+    decoder.apply(unframe(encode_keyframe(previous)))
+    tick = 0
+    keyframes = 0
+    while not simulation.game_over:
+        simulation.step(track_ball(simulation, offset=tick % 40 - 20) if tick % 500 < 450 else MOVE_RIGHT)
+        tick += 1
+        snapshot = take_snapshot(simulation, tick)
+        delta = encode_delta(previous, snapshot)
+        if delta is None:
+            keyframes += 1
+            decoder.apply(unframe(encode_keyframe(snapshot)))
+        else:
+            decoder.apply(unframe(delta))
+        assert_decoded(decoder, snapshot)
+        previous = snapshot
+    assert simulation.level > 2
+    assert decoder.deltas == tick - keyframes
+
+
+def test_unchanged_state_is_an_empty_delta():
+    snapshot = take_snapshot(Simulation(seed=3), 1)
+    delta = unframe(encode_delta(snapshot, snapshot._replace(tick=2)))
+    decoder = SnapshotDecoder()
+    decoder.apply(unframe(encode_keyframe(snapshot)))
+    decoder.apply(delta)
+    assert len(delta) == 6
+    assert_decoded(decoder, snapshot._replace(tick=2))
+
+
+def test_large_wall_changes_need_a_keyframe():
+    simulation = Simulation(seed=4)
+    previous = take_snapshot(simulation, 0)
+    for index in list(simulation.bricks)[: MAX_DELTA_CELLS + 1]:
+        simulation.bricks.remove(index)
+    assert encode_delta(previous, take_snapshot(simulation, 1)) is None
+
+
+def test_delta_before_keyframe_is_rejected():
+    simulation = Simulation(seed=5)
+    previous = take_snapshot(simulation, 0)
+    simulation.step()
+    delta = encode_delta(previous, take_snapshot(simulation, 1))
+    with pytest.raises(ValueError):
+        SnapshotDecoder().apply(unframe(delta))
+
+
+def test_clients_follow_the_server_game():
+    async def main():
+        server = GameServer(Simulation(seed=6), autoplay=False)
+        port = await server.start(port=0)
+        spectator = GameClient()
+        player = GameClient()
+        second = GameClient()
+        await spectator.connect(port=port)
+        await player.connect(port=port, role=PLAYER)
+        await second.connect(port=port, role=PLAYER)
+        tasks = [asyncio.create_task(client.receive()) for client in (spectator, player, second)]
+        while len(server.clients) < 3:
+            await asyncio.sleep(0.01)
+        player.send_input(MOVE_RIGHT)
+        await player.writer.drain()
+        while server.direction != MOVE_RIGHT:
+            await asyncio.sleep(0.01)
+        for _ in range(60):
+            server.step()
+        await server.close()
+        await asyncio.gather(*tasks)
+        return server, spectator, player, second
+
+    server, spectator, player, second = asyncio.run(main())
+    assert (player.state.role, second.state.role, spectator.state.role) == (PLAYER, SPECTATOR, SPECTATOR)
+    assert server.simulation.paddle.x > 0
+    assert not server.tasks and not server.clients
+    for client in (spectator, player, second):
+        assert client.state.keyframes == 1
+        assert_decoded(client.state, server.snapshot)
@@ -0,0 +1,44 @@
+import pytest
+
+from level_pack import LevelPack, compile_source
+
+SOURCE = """
+# Two brick types and two levels
+brick R color=#ff4136 points=10
+brick G color=#2ECC40 points=20
+
+level Checkers
+R.R.
+.G.G
+
+level Single
+G
+"""
+
+
+def test_compiled_pack_round_trip():
+    pack = LevelPack.from_bytes(compile_source(SOURCE))
+    assert len(pack) == 2
+    assert pack.types == [("#FF4136", 10), ("#2ECC40", 20)]
+    level = pack.level(0)
+    assert (level.name, level.rows, level.columns) == ("Checkers", 2, 4)
+    assert bytes(level.cells) == bytes([1, 0, 1, 0, 0, 2, 0, 2])
+    assert bytes(pack.level(1).cells) == b"\x02"
+
+
+@pytest.mark.parametrize(
+    "source, message",
+    [
+        ("brick R color=#FF4136\nlevel Empty\n....\n....\n", "Line 2: level 'Empty' has no bricks"),
+        ("brick R color=#FF4136 points=70000\nlevel A\nR\n", "Line 1: brick 'R' must be worth 0 to 65535 points"),
+        ("brick R color=#FF4136 points=-1\nlevel A\nR\n", "Line 1: brick 'R' must be worth 0 to 65535 points"),
+        ("brick R color=red\nlevel A\nR\n", "Line 1: brick 'R' needs a color"),
+        ("brick R color=#FF4136\nlevel A\nRX\n", "Line 3: unknown brick type(s) X"),
+        ("brick R color=#FF4136\n\nlevel Wide\n" + "R" * 17 + "\n", "Line 3: level 'Wide' must have"),
+        ("brick R color=#FF4136\n", "The pack has no levels"),
+    ],
+)
+def test_invalid_source_is_rejected(source, message):
+    with pytest.raises(ValueError) as error:
+        compile_source(source)
+    assert message in str(error.value)
@@ -0,0 +1,65 @@
+import shutil
+
+import pytest
+
+from autoplay import AutoplayAgent
+from level_pack import CLASSIC_PACK, LevelPack, compile_source
+from replay import ReplayPlayer, ReplayRecorder
+from simulation import Simulation
+
+
+def play(simulation, recorder, frames):
+    """
+    Plays a game with the autoplay agent, recording every input.
+    """
+    agent = AutoplayAgent(simulation, jitter=25, seed=0)
+    for _ in range(frames):
+        if simulation.game_over:
+            break
+        inputs = agent.act()
+        recorder.record(inputs)
+        simulation.step(inputs)
+
+
+def test_round_trip_with_a_non_default_screen_height():
+    simulation = Simulation(seed=7, screen_height=560)
+    recorder = ReplayRecorder.for_simulation(7, simulation)
+    play(simulation, recorder, 20000)
+    assert simulation.score > 0
+
+    player = ReplayPlayer.from_bytes(recorder.to_bytes())
+    assert player.settings["screen_height"] == 560
+    replayed = player.run()
+    assert replayed.paddle.y == simulation.paddle.y
+    assert replayed.frame == simulation.frame
+    assert replayed.score == simulation.score
+    assert replayed.lives == simulation.lives
+
+
+def test_level_pack_is_stored_by_name_and_hash(tmp_path):
+    shutil.copy(CLASSIC_PACK, tmp_path / "classic.brkl")
+    simulation = Simulation(seed=3, levels=LevelPack.load(str(tmp_path / "classic.brkl")))
+    recorder = ReplayRecorder.for_simulation(3, simulation)
+    play(simulation, recorder, 5000)
+    data = recorder.to_bytes()
+    assert str(tmp_path).encode("utf-8") not in data
+
+    # The pack is found by its name in the levels directory, wherever it was played from
+    player = ReplayPlayer.from_bytes(data)
+    assert player.levels_name == "classic.brkl"
+    replayed = player.run()
+    assert (replayed.frame, replayed.score, replayed.lives) == (simulation.frame, simulation.score, simulation.lives)
+
+    # A pack that changed since is refused
+    (tmp_path / "classic.brkl").write_bytes(compile_source("brick R color=#FF4136\nlevel Other\nR\n"))
+    player.levels_directory = str(tmp_path)
+    with pytest.raises(ValueError):
+        player.create_simulation()
+
+
+def test_truncated_replays_are_rejected():
+    data = ReplayRecorder(1).to_bytes()
+    with pytest.raises(ValueError):
+        ReplayPlayer.from_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        ReplayPlayer.from_bytes(b"XXXX" + data[4:])
@@ -0,0 +1,32 @@
+from simulation import Simulation
+
+
+def clear_wall(simulation):
+    """
+    Removes every brick of the simulation's wall.
+    """
+    for index in list(simulation.bricks):
+        simulation.bricks.remove(index)
+
+
+def test_level_up_keeps_the_speed_increase():
+    simulation = Simulation(seed=0, ball_speed=2.0, speed_increase=0.5)
+    clear_wall(simulation)
+    events = simulation.step()
+    assert ("level_up", None) in events
+    assert simulation.ball.speed == 2.5
+    assert (simulation.ball.dx, simulation.ball.dy) == (2.5, -2.5)
+
+    # A lost ball comes back at the new speed too
+    simulation.ball.y = -1000
+    simulation.step()
+    assert (simulation.ball.dx, simulation.ball.dy) == (2.5, -2.5)
+
+
+def test_reset_restores_the_starting_speed():
+    simulation = Simulation(seed=0, ball_speed=2.0, speed_increase=0.5)
+    clear_wall(simulation)
+    simulation.step()
+    simulation.reset()
+    assert simulation.ball.speed == 2.0
+    assert (simulation.ball.dx, simulation.ball.dy) == (2.0, -2.0)
@@ -0,0 +1,95 @@
+from simulation import Simulation, track_ball
+from snapshot_buffer import SnapshotBuffer
+
+
+def state(simulation):
+    """
+    Returns everything a snapshot should bring back, for comparing two games.
+    """
+    ball = simulation.ball
+    paddle = simulation.paddle
+    bricks = simulation.bricks
+    return (
+        (ball.x, ball.y, ball.dx, ball.dy, ball.speed),
+        (paddle.x, paddle.vx),
+        (simulation.score, simulation.lives, simulation.level, simulation.floors, simulation.frame),
+        (bricks.rows, bricks.columns, bytes(bricks.kinds), bytes(bricks.alive), bricks.count),
+    )
+
+
+def play(simulation, snapshots, ticks):
+    """
+    Steps the game with the scripted paddle, saving a snapshot after every tick, and
+    returns the state after each tick.
+    """
+    states = []
+    for _ in range(ticks):
+        simulation.step(track_ball(simulation))
+        snapshots.save()
+        states.append(state(simulation))
+    return states
+
+
+def test_restore_brings_back_every_kept_state():
+    simulation = Simulation(seed=1)
+    snapshots = SnapshotBuffer(simulation, 100)
+    states = play(simulation, snapshots, 250)
+    assert len(snapshots) == 100
+    for age in (0, 1, 50, 99):
+        assert snapshots.restore(age)
+        assert state(simulation) == states[-1 - age]
+    assert not snapshots.restore(100)
+
+
+def test_restore_across_a_level_up_brings_back_the_old_wall():
+    simulation = Simulation(seed=2, floors=1, columns=2, speed_increase=0.5)
+    snapshots = SnapshotBuffer(simulation, 20000)
+    states = []
+    while simulation.level == 1:
+        states += play(simulation, snapshots, 1)
+    assert snapshots.restore(1)
+    assert state(simulation) == states[-2]
+    assert simulation.level == 1 and simulation.ball.speed == 2.0
+    assert snapshots.restore(0)
+    assert state(simulation) == states[-1]
+
+
+def test_rewound_game_plays_on_as_the_original():
+    simulation = Simulation(seed=3)
+    snapshots = SnapshotBuffer(simulation, 600)
+    states = play(simulation, snapshots, 500)
+    assert snapshots.rewind(120) == 120
+    assert state(simulation) == states[-121]
+    assert play(simulation, snapshots, 120) == states[-120:]
+
+
+def test_forward_undoes_a_rewind_until_the_game_carries_on():
+    simulation = Simulation(seed=4)
+    snapshots = SnapshotBuffer(simulation, 600)
+    states = play(simulation, snapshots, 500)
+
+    assert snapshots.rewind(200) == 200
+    assert snapshots.rewind(100) == 100
+    assert state(simulation) == states[-301]
+    assert snapshots.forward(250) == 250
+    assert state(simulation) == states[-51]
+    assert snapshots.forward(100) == 50
+    assert state(simulation) == states[-1]
+    assert snapshots.forward(1) == 0
+
+    # Carrying on after a rewind drops the snapshots after it
+    snapshots.rewind(100)
+    play(simulation, snapshots, 1)
+    assert len(snapshots) == 401
+    assert snapshots.forward(1) == 0
+    assert snapshots.rewind(1) == 1
+    assert state(simulation) == states[-101]
+
+
+def test_rewind_stops_at_the_oldest_snapshot():
+    simulation = Simulation(seed=5)
+    snapshots = SnapshotBuffer(simulation, 50)
+    states = play(simulation, snapshots, 80)
+    assert snapshots.rewind(1000) == 49
+    assert state(simulation) == states[-50]
+    assert snapshots.rewind(1) == 0
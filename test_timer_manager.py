@@ -0,0 +1,88 @@
+from timer_manager import TimerWheel
+
+RESOLUTION = 0.01
+
+
+def test_events_fire_in_order_when_due():
+    wheel = TimerWheel(RESOLUTION, slots=8)
+    fired = []
+    wheel.schedule(0, 0.05, fired.append, "b")
+    wheel.schedule(0, 0.02, fired.append, "a")
+    wheel.schedule(0, 0.05, fired.append, "c")
+    wheel.advance(0.01)
+    assert fired == []
+    wheel.advance(0.04)
+    assert fired == ["a"]
+    wheel.advance(0.05)
+    assert fired == ["a", "b", "c"]
+    assert wheel.count == 0
+
+
+def test_events_beyond_one_turn_of_the_wheel():
+    wheel = TimerWheel(RESOLUTION, slots=8)
+    fired = []
+    wheel.schedule(0, 0.03, fired.append, "near")
+    wheel.schedule(0, 0.11, fired.append, "far")  # shares a slot with "near"
+    wheel.advance(0.05)
+    assert fired == ["near"]
+    wheel.advance(0.10)
+    assert fired == ["near"]
+    wheel.advance(0.11)
+    assert fired == ["near", "far"]
+
+
+def test_delay_rounds_up_to_the_next_tick():
+    wheel = TimerWheel(RESOLUTION)
+    assert wheel.schedule(0, 0.025, print).due == 3
+    assert wheel.schedule(0, 0.03, print).due == 3
+    assert wheel.schedule(0, 0, print).due == 1
+
+
+def test_cancelled_events_do_not_fire():
+    wheel = TimerWheel(RESOLUTION)
+    fired = []
+    event = wheel.schedule(0, 0.02, fired.append, "cancelled")
+    wheel.schedule(0, 0.02, fired.append, "kept")
+    wheel.cancel(event)
+    wheel.cancel(event)
+    assert wheel.count == 1
+    wheel.advance(1)
+    assert fired == ["kept"]
+    assert wheel.count == 0
+
+
+def test_cancelling_a_fired_event_has_no_effect():
+    wheel = TimerWheel(RESOLUTION)
+    fired = []
+    event = wheel.schedule(0, 0.01, fired.append, 1)
+    wheel.advance(0.01)
+    wheel.schedule(0, 0.05, fired.append, 2)
+    wheel.cancel(event)
+    assert wheel.count == 1
+    wheel.advance(1)
+    assert fired == [1, 2]
+
+
+def test_clear_cancels_everything():
+    wheel = TimerWheel(RESOLUTION)
+    fired = []
+    events = [wheel.schedule(0, delay, fired.append, delay) for delay in (0.01, 0.5, 5)]
+    wheel.clear()
+    wheel.advance(10)
+    assert fired == []
+    assert wheel.count == 0
+    assert all(event.cancelled for event in events)
+
+
+def test_cancelled_events_leave_their_slot():
+    # A timer pushed back every frame, like a banner that is shown again, must not pile up
+    wheel = TimerWheel(RESOLUTION, slots=8)
+    fired = []
+    event = wheel.schedule(0, 0.05, fired.append, 0)
+    for frame in range(1, 1000):
+        wheel.cancel(event)
+        event = wheel.schedule(0, 0.05, fired.append, frame)
+    assert sum(len(bucket) for bucket in wheel.slots) == 1
+    assert wheel.count == 1
+    wheel.advance(1)
+    assert fired == [999]
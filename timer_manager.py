@@ -1,79 +1,257 @@
+import math
 import time
 
+FPS_SMOOTHING = 0.1  # Weight of the newest frame in the smoothed frame rate
+WHEEL_RESOLUTION = 1 / 120  # Seconds per slot of the timer wheel
+WHEEL_SLOTS = 256
 
-class Timer:
+
+class ScheduledEvent:
     """
-    A class representing a timer.
+    An event scheduled on a TimerWheel.
 
     Attributes:
-        start_time (float): The start time of the timer.
-        elapsed_time (float): The elapsed time since the timer started.
-        running (bool): Indicates whether the timer is currently running or paused.
-        display_update_callback (function): A callback function to update the display with the elapsed time.
+        due (int): The wheel tick at which the event fires.
+        callback (function): The function called when the event fires.
+        args (tuple): The arguments passed to the callback.
+        cancelled (bool): Whether the event was cancelled.
+    """
+
+    __slots__ = ("due", "callback", "args", "cancelled")
+
+    def __init__(self, due, callback, args):
+        """
+        Initializes a ScheduledEvent.
+
+        Parameters:
+        due (int): The wheel tick at which the event fires.
+        callback (function): The function called when the event fires.
+        args (tuple): The arguments passed to the callback.
+        """
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+class TimerWheel:
+    """
+    A hashed timer wheel for scheduled game events.
+
+    Time is cut into ticks of `resolution` seconds, and an event due at tick `t`
+    is kept in slot `t % len(slots)`. Scheduling an event is O(1), cancelling one
+    takes it out of its slot, and advancing the wheel by one tick only looks at the
+    events in one slot, so the cost doesn't grow with the number of events scheduled
+    further ahead, and slots don't fill up with events that were cancelled.
+
+    Attributes:
+        resolution (float): The duration of a wheel tick in seconds.
+        slots (list): The events of every slot.
+        tick (int): The last wheel tick processed.
+        count (int): The number of events waiting to fire.
 
     Methods:
-        start(): Starts the timer.
-        pause(): Pauses the timer.
-        reset(): Resets the timer.
-        update_display(): Updates the display with the elapsed time.
-        get_time(): Returns the elapsed time.
+        schedule(now, delay, callback, *args): Schedules a function to be called after a delay.
+        cancel(event): Cancels a scheduled event.
+        advance(now): Fires every event that is due.
+        clear(): Cancels every event.
     """
 
-    def __init__(self, display_update_callback):
+    def __init__(self, resolution=WHEEL_RESOLUTION, slots=WHEEL_SLOTS):
+        """
+        Initializes an empty TimerWheel.
+
+        Parameters:
+        resolution (float): The duration of a wheel tick in seconds.
+        slots (int): The number of slots in the wheel.
+        """
+        self.resolution = resolution
+        self.slots = [[] for _ in range(slots)]
+        self.tick = 0
+        self.count = 0
+
+    def schedule(self, now, delay, callback, *args):
         """
-        Initializes a Timer object.
+        Schedules a function to be called once `delay` seconds after `now`.
 
         Parameters:
-        display_update_callback (function): A callback function that will be called to update the display.
+        now (float): The current time of the clock that advances the wheel.
+        delay (float): The delay in seconds. The event fires on the first tick at or after it.
+        callback (function): The function to call.
+        *args: The arguments to pass to the function.
 
-        Attributes:
-        start_time (float): The time when the timer was started.
-        elapsed_time (float): The elapsed time since the timer was started.
-        running (bool): Indicates whether the timer is currently running.
-        display_update_callback (function): The callback function used to update the display.
+        Returns:
+        ScheduledEvent: The event, which can be passed to `cancel()`.
         """
-        self.start_time = time.time()
-        self.elapsed_time = 0
+        due = max(math.ceil((now + delay) / self.resolution - 1e-9), self.tick + 1)
+        event = ScheduledEvent(due, callback, args)
+        self.slots[due % len(self.slots)].append(event)
+        self.count += 1
+        return event
+
+    def cancel(self, event):
+        """
+        Cancels a scheduled event and removes it from its slot. Cancelling an event
+        that already fired has no effect.
+
+        Parameters:
+        event (ScheduledEvent): The event returned by `schedule()`.
+        """
+        if not event.cancelled and event.due > self.tick:
+            event.cancelled = True
+            self.slots[event.due % len(self.slots)].remove(event)
+            self.count -= 1
+
+    def advance(self, now):
+        """
+        Fires, in order, every event due up to `now`.
+
+        Parameters:
+        now (float): The current time of the clock that advances the wheel.
+        """
+        target = int(now / self.resolution + 1e-9)
+        if not self.count:
+            self.tick = max(self.tick, target)
+            return
+        slots = self.slots
+        while self.tick < target and self.count:
+            self.tick += 1
+            bucket = slots[self.tick % len(slots)]
+            if not bucket:
+                continue
+            due = [event for event in bucket if event.due <= self.tick]
+            if not due:
+                continue
+            bucket[:] = [event for event in bucket if event.due > self.tick]
+            for event in due:
+                if not event.cancelled:
+                    self.count -= 1
+                    event.callback(*event.args)
+        self.tick = max(self.tick, target)
+
+    def clear(self):
+        """
+        Cancels every scheduled event.
+        """
+        for bucket in self.slots:
+            for event in bucket:
+                event.cancelled = True
+            bucket.clear()
+        self.count = 0
+
+
+class FrameClock:
+    """
+    The game's clock, read once per frame.
+
+    The clock measures game time with the monotonic `time.perf_counter`, so it
+    never jumps when the system clock is corrected, and it only runs while the
+    game does: time spent paused is not counted. Every frame it reports how long
+    the last frame took, keeps a smoothed frame rate and fires the scheduled events
+    that are due, so scheduled events pause together with the clock.
+
+    Attributes:
+        time (float): The game time in seconds, not counting pauses.
+        delta (float): The duration of the last frame in seconds.
+        fps (float): The frame rate, smoothed over the last frames.
+        running (bool): Indicates whether the clock is running or paused.
+        last_time (float): When the clock last ticked or started, from time.perf_counter().
+        wheel (TimerWheel): The events scheduled in game time.
+
+    Methods:
+        start(): Starts or resumes the clock.
+        pause(): Pauses the clock.
+        reset(): Resets the clock to 0 and cancels every scheduled event.
+        tick(): Advances the clock by the time since the last frame.
+        schedule(delay, callback, *args): Schedules a function to be called after a delay of game time.
+        cancel(event): Cancels a scheduled event.
+        get_time(): Returns the game time.
+    """
+
+    def __init__(self):
+        """
+        Initializes a paused FrameClock at time 0.
+        """
+        self.time = 0.0
+        self.delta = 0.0
+        self.fps = 0.0
         self.running = False
-        self.display_update_callback = display_update_callback
+        self.last_time = time.perf_counter()
+        self.wheel = TimerWheel()
 
     def start(self):
         """
-        Starts the timer if it is not already running.
+        Starts the clock if it is not already running.
         """
         if not self.running:
-            self.start_time = time.time() - self.elapsed_time
+            self.last_time = time.perf_counter()
             self.running = True
 
     def pause(self):
         """
-        Pauses the timer if it is currently running.
+        Pauses the clock if it is currently running. The time since the last frame is counted.
         """
         if self.running:
-            self.elapsed_time = time.time() - self.start_time
+            self.time += time.perf_counter() - self.last_time
             self.running = False
 
     def reset(self):
-        """Resets the timer to its initial state.
+        """
+        Resets the clock to a paused state at time 0 and cancels every scheduled event.
+        """
+        self.time = 0.0
+        self.delta = 0.0
+        self.fps = 0.0
+        self.running = False
+        self.wheel.clear()
+        self.wheel.tick = 0
 
-        This method sets the start time to the current time,
-        sets the elapsed time to 0, and sets the running flag to False.
+    def tick(self):
         """
+        Advances the clock by the time since the last frame, updates the smoothed frame
+        rate and fires the scheduled events that are due. A paused clock doesn't move.
 
-        self.start_time = time.time()
-        self.elapsed_time = 0
-        self.running = False
+        Returns:
+        float: The duration of the frame in seconds, 0 while paused.
+        """
+        if not self.running:
+            self.delta = 0.0
+            return 0.0
+        now = time.perf_counter()
+        delta = now - self.last_time
+        self.last_time = now
+        self.delta = delta
+        self.time += delta
+        if delta > 0:
+            self.fps = 1 / delta if not self.fps else self.fps + FPS_SMOOTHING * (1 / delta - self.fps)
+        self.wheel.advance(self.time)
+        return delta
+
+    def schedule(self, delay, callback, *args):
+        """
+        Schedules a function to be called once after `delay` seconds of game time.
 
-    def update_display(self):
+        Parameters:
+        delay (float): The delay in seconds.
+        callback (function): The function to call.
+        *args: The arguments to pass to the function.
+
+        Returns:
+        ScheduledEvent: The event, which can be passed to `cancel()`.
         """
-        Updates the display with the elapsed time if the timer is running.
+        return self.wheel.schedule(self.time, delay, callback, *args)
+
+    def cancel(self, event):
         """
-        if self.running:
-            self.elapsed_time = time.time() - self.start_time
-        self.display_update_callback(self.elapsed_time)
+        Cancels a scheduled event.
+
+        Parameters:
+        event (ScheduledEvent): The event returned by `schedule()`.
+        """
+        self.wheel.cancel(event)
 
     def get_time(self):
         """
-        Returns the elapsed time.
+        Returns the game time in seconds.
         """
-        return self.elapsed_time
+        return self.time